@@ -0,0 +1,156 @@
+# accounts/avatars.py
+# Avatar rendition pipeline: square, fixed-size WebP/JPEG copies of Profile.avatar.
+#
+# Uploads are stored as-is by the form; after the transaction commits, the
+# profile id is handed to a small in-process thread pool which generates the
+# renditions with Pillow, off the request path. Renditions are named after the
+# SHA-256 of the original's bytes and live next to it under avatars/, e.g.
+#   avatars/<hash16>_128.webp
+#   avatars/<hash16>_128.jpg
+# so an unchanged upload (same hash) is never re-encoded.
+
+import hashlib
+import logging
+import posixpath
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import connections, transaction
+from PIL import Image, ImageOps
+
+logger = logging.getLogger(__name__)
+
+# Output formats: (Pillow format name, file extension, save options)
+FORMATS = {
+    "webp": ("WEBP", "webp", {"quality": 80, "method": 4}),
+    "jpeg": ("JPEG", "jpg", {"quality": 85, "optimize": True, "progressive": True}),
+}
+
+_executor = None
+
+
+def get_sizes():
+    """
+    Square edge lengths (pixels) to generate, e.g. (64, 128, 256).
+    """
+    return tuple(getattr(settings, "ACCOUNTS_AVATAR_SIZES", (64, 128, 256)))
+
+
+def get_executor():
+    """
+    Lazily create the process-wide worker pool.
+    """
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=getattr(settings, "ACCOUNTS_AVATAR_WORKERS", 2),
+            thread_name_prefix="avatar-renditions",
+        )
+    return _executor
+
+
+def hash_file(field_file):
+    """
+    SHA-256 hex digest of an uploaded file's bytes.
+    """
+    digest = hashlib.sha256()
+    field_file.open("rb")
+    try:
+        for chunk in field_file.chunks():
+            digest.update(chunk)
+    finally:
+        field_file.close()
+    return digest.hexdigest()
+
+
+def rendition_name(original_name, content_hash, size, fmt="webp"):
+    """
+    Storage path of one rendition, in the same directory as the original.
+    """
+    extension = FORMATS[fmt][1]
+    directory = posixpath.dirname(original_name)
+    return posixpath.join(directory, f"{content_hash[:16]}_{size}.{extension}")
+
+
+def render(image, size, fmt):
+    """
+    Crop/scale an already-loaded image to size x size and encode it.
+    """
+    pillow_format, _, options = FORMATS[fmt]
+    thumbnail = ImageOps.fit(image, (size, size), Image.LANCZOS)
+    buffer = BytesIO()
+    thumbnail.save(buffer, pillow_format, **options)
+    return buffer.getvalue()
+
+
+def generate_renditions(profile):
+    """
+    Create any missing renditions for profile.avatar and record its hash.
+    Returns the number of files written (0 when everything was up to date).
+    """
+    from .models import Profile
+
+    if not profile.avatar:
+        return 0
+
+    content_hash = hash_file(profile.avatar)
+    wanted = [
+        (size, fmt, rendition_name(profile.avatar.name, content_hash, size, fmt))
+        for size in get_sizes()
+        for fmt in FORMATS
+    ]
+    missing = [item for item in wanted if not default_storage.exists(item[2])]
+
+    if missing:
+        profile.avatar.open("rb")
+        try:
+            with Image.open(profile.avatar) as source:
+                image = ImageOps.exif_transpose(source).convert("RGB")
+        finally:
+            profile.avatar.close()
+        for size, fmt, name in missing:
+            default_storage.save(name, ContentFile(render(image, size, fmt)))
+
+    if profile.avatar_hash != content_hash:
+        # Guard on the file name: a newer upload may have replaced this one meanwhile
+        Profile.objects.filter(pk=profile.pk, avatar=profile.avatar.name).update(
+            avatar_hash=content_hash
+        )
+        profile.avatar_hash = content_hash
+    return len(missing)
+
+
+def process_profile(profile_id):
+    """
+    Worker entry point: load the profile and generate its renditions.
+    Runs in a pool thread, so it closes the thread's own database connection.
+    """
+    from .models import Profile
+
+    try:
+        profile = Profile.objects.filter(pk=profile_id).first()
+        if profile is not None:
+            generate_renditions(profile)
+    except Exception:
+        logger.exception("Avatar renditions failed for profile %s", profile_id)
+    finally:
+        connections.close_all()
+
+
+def schedule(profile_id):
+    """
+    Queue rendition generation once the current transaction commits.
+    With settings.ACCOUNTS_AVATAR_ASYNC = False the work runs inline instead
+    (useful for tests and management commands).
+    """
+    def submit():
+        if getattr(settings, "ACCOUNTS_AVATAR_ASYNC", True):
+            get_executor().submit(process_profile, profile_id)
+        else:
+            from .models import Profile
+            generate_renditions(Profile.objects.get(pk=profile_id))
+
+    transaction.on_commit(submit)
@@ -0,0 +1,21 @@
+# accounts/management/commands/generate_avatar_renditions.py
+# Backfill avatar renditions (accounts/avatars.py) for existing profiles.
+
+from django.core.management.base import BaseCommand
+
+from accounts import avatars
+from accounts.models import Profile
+
+
+class Command(BaseCommand):
+    help = "Generate missing avatar renditions for every profile with an avatar."
+
+    def handle(self, *args, **options):
+        written = 0
+        profiles = Profile.objects.exclude(avatar="").exclude(avatar__isnull=True)
+        for profile in profiles.iterator():
+            try:
+                written += avatars.generate_renditions(profile)
+            except (OSError, ValueError) as exc:
+                self.stderr.write(f"Skipping profile {profile.pk}: {exc}")
+        self.stdout.write(self.style.SUCCESS(f"Wrote {written} avatar rendition(s)."))
@@ -4,6 +4,7 @@
 from django.db import models                         # Django models
 from django.conf import settings                     # to reference AUTH_USER_MODEL
 from django.urls import reverse                       # optional helper for get_absolute_url
+from django.core.files.storage import default_storage  # where avatar renditions are stored
 
 
 class Profile(models.Model):
@@ -24,6 +25,8 @@ class Profile(models.Model):
         null=True,                                     # allow no avatar
         blank=True,                                    # optional in forms
     )
+    # SHA-256 of the avatar file whose renditions exist (set by accounts/avatars.py)
+    avatar_hash = models.CharField(max_length=64, blank=True, default="", editable=False)
     bio = models.TextField(
         blank=True,                                    # optional bio
         default="",                                    # default empty string
@@ -38,10 +41,18 @@ class Profile(models.Model):
         """
         return f"Profile for {self.user.username}"
 
-    def get_avatar_url(self):
+    def get_avatar_url(self, size=None, fmt="webp"):
         """
         Helper: return avatar URL if set, else return placeholder or empty string.
+        - size: one of settings.ACCOUNTS_AVATAR_SIZES to get a square rendition
+        - fmt: "webp" or "jpeg"
+        Falls back to the original upload until the renditions have been generated.
         """
-        if self.avatar:
-            return self.avatar.url
-        return ""
+        if not self.avatar:
+            return ""
+        from . import avatars
+        if size is not None and self.avatar_hash and size in avatars.get_sizes():
+            return default_storage.url(
+                avatars.rendition_name(self.avatar.name, self.avatar_hash, size, fmt)
+            )
+        return self.avatar.url
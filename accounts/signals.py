@@ -1,10 +1,12 @@
 # accounts/signals.py
-# Signal handlers for the accounts app: auto-create Profile on User creation.
+# Signal handlers for the accounts app: auto-create Profile on User creation,
+# and queue avatar renditions when a new avatar is uploaded.
 
-from django.db.models.signals import post_save     # signal that fires after model.save()
+from django.db.models.signals import pre_save, post_save  # signals around model.save()
 from django.dispatch import receiver                # decorator to connect signal handlers
 from django.conf import settings                    # to get the user model
 from .models import Profile                         # the Profile model
+from . import avatars                               # avatar rendition pipeline
 
 User = settings.AUTH_USER_MODEL                     # string reference or actual model depending on settings
 
@@ -17,4 +19,30 @@ def create_profile_for_new_user(sender, instance, created, **kwargs):
     """
     if created:
         # create Profile if it doesn't exist already
-        Profile.objects.create(user=instance)
\ No newline at end of file
+        Profile.objects.create(user=instance)
+
+
+@receiver(pre_save, sender=Profile)
+def detect_new_avatar(sender, instance, **kwargs):
+    """
+    A new avatar (not yet committed to storage, or a different file name than the
+    stored row) is a fresh upload: forget the old hash so get_avatar_url() serves
+    the original until the new renditions exist.
+    """
+    previous = None
+    if instance.pk:
+        previous = Profile.objects.filter(pk=instance.pk).values_list("avatar", flat=True).first()
+    instance._avatar_uploaded = bool(instance.avatar) and (
+        not instance.avatar._committed or instance.avatar.name != previous
+    )
+    if instance._avatar_uploaded or not instance.avatar:
+        instance.avatar_hash = ""
+
+
+@receiver(post_save, sender=Profile)
+def queue_avatar_renditions(sender, instance, **kwargs):
+    """
+    After a new upload is saved, generate its renditions off the request path.
+    """
+    if getattr(instance, "_avatar_uploaded", False):
+        avatars.schedule(instance.pk)
@@ -0,0 +1,99 @@
+# accounts/tests/test_avatar_renditions.py
+# Tests for the avatar rendition pipeline (accounts/avatars.py).
+#
+# Renditions are generated inline here (ACCOUNTS_AVATAR_ASYNC=False) so the
+# results can be asserted right after the on_commit callbacks run.
+
+import os
+import shutil
+import tempfile
+from io import BytesIO, StringIO
+
+from PIL import Image
+from django.conf import settings
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.contrib.auth import get_user_model
+
+from accounts import avatars
+from accounts.models import Profile
+
+
+def make_image_bytes(width=400, height=300, color=(200, 30, 30)):
+    """
+    Build a JPEG in memory, larger than every rendition size.
+    """
+    buffer = BytesIO()
+    Image.new("RGB", (width, height), color).save(buffer, "JPEG")
+    return buffer.getvalue()
+
+
+@override_settings(
+    MEDIA_ROOT=tempfile.mkdtemp(prefix="test_avatars_"),
+    ACCOUNTS_AVATAR_ASYNC=False,
+    ACCOUNTS_AVATAR_SIZES=(64, 128),
+)
+class AvatarRenditionTests(TestCase):
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(settings.MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        User = get_user_model()
+        self.user = User.objects.create_user(username="avataruser", password="pass12345")
+        self.profile = Profile.objects.get(user=self.user)
+
+    def upload(self, name="me.jpg", data=None):
+        """
+        Save a new avatar and run the post-commit rendition job.
+        """
+        data = data or make_image_bytes()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.profile.avatar.save(name, SimpleUploadedFile(name, data), save=True)
+        self.profile.refresh_from_db()
+
+    def test_upload_generates_square_renditions_next_to_original(self):
+        self.upload()
+        self.assertEqual(len(self.profile.avatar_hash), 64)
+        avatar_dir = os.path.dirname(self.profile.avatar.path)
+        for size in (64, 128):
+            for fmt in ("webp", "jpeg"):
+                name = avatars.rendition_name(self.profile.avatar.name, self.profile.avatar_hash, size, fmt)
+                path = os.path.join(settings.MEDIA_ROOT, name)
+                self.assertEqual(os.path.dirname(path), avatar_dir)
+                with Image.open(path) as image:
+                    self.assertEqual(image.size, (size, size))
+
+    def test_get_avatar_url_by_size(self):
+        self.assertEqual(self.profile.get_avatar_url(size=64), "")
+        self.upload()
+        self.assertTrue(self.profile.get_avatar_url(size=128).endswith("_128.webp"))
+        self.assertTrue(self.profile.get_avatar_url(size=64, fmt="jpeg").endswith("_64.jpg"))
+        # Unknown size or no size falls back to the original upload
+        self.assertEqual(self.profile.get_avatar_url(size=999), self.profile.avatar.url)
+        self.assertEqual(self.profile.get_avatar_url(), self.profile.avatar.url)
+
+    def test_unchanged_content_is_not_reencoded(self):
+        data = make_image_bytes()
+        self.upload("first.jpg", data)
+        first_hash = self.profile.avatar_hash
+        self.assertEqual(avatars.generate_renditions(self.profile), 0)
+        self.upload("again.jpg", data)                 # same bytes, new file name
+        self.assertEqual(self.profile.avatar_hash, first_hash)
+        self.assertEqual(avatars.generate_renditions(self.profile), 0)
+
+    def test_new_upload_resets_hash_until_renditions_exist(self):
+        self.upload()
+        self.profile.avatar.save("new.jpg", SimpleUploadedFile("new.jpg", make_image_bytes(color=(0, 0, 255))), save=True)
+        self.assertEqual(self.profile.avatar_hash, "")
+        self.assertEqual(self.profile.get_avatar_url(size=64), self.profile.avatar.url)
+
+    def test_backfill_command(self):
+        self.profile.avatar.save("old.jpg", SimpleUploadedFile("old.jpg", make_image_bytes()), save=True)
+        out = StringIO()
+        call_command("generate_avatar_renditions", stdout=out)
+        self.assertIn("Wrote 4", out.getvalue())
+        self.profile.refresh_from_db()
+        self.assertTrue(self.profile.avatar_hash)
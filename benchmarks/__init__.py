@@ -0,0 +1,2 @@
+# benchmarks/__init__.py
+# Request-path benchmarks for the posts and accounts apps (see benchmarks/run.py).
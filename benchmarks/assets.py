@@ -0,0 +1,205 @@
+# benchmarks/assets.py
+# Size report for the static asset pipeline: what moving the CSS out of the
+# pages and into one hashed, pre-compressed stylesheet saves per response.
+#
+# Usage (from the project root):
+#   SECRET_KEY=... python -m benchmarks.assets --posts 200
+#   SECRET_KEY=... python -m benchmarks.assets --output assets.json
+#
+# collectstatic runs into a temporary directory with the production storage
+# (WhiteNoise's CompressedManifestStaticFilesStorage), and the report lists
+# each collected file with its raw, gzip and brotli sizes. The public pages
+# are then rendered through Django's test client against a throwaway database
+# filled by benchmarks/data.py, and each response is measured twice: as
+# served (linking the stylesheet) and with the stylesheet inlined in a
+# <style> block, the way the pages used to carry their CSS. The difference is
+# what every page view saves once the stylesheet is in the browser cache; the
+# stylesheet itself costs one compressed download, then nothing for a year
+# (immutable caching of the hashed name).
+#
+# Brotli sizes need the Brotli package (also what makes WhiteNoise write .br
+# files); without it they are reported as null.
+
+import argparse
+import gzip
+import json
+import re
+import sys
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+
+from benchmarks.run import git_commit, setup_django
+
+try:
+    import brotli
+except ImportError:  # optional, see requirements.txt
+    brotli = None
+
+PRODUCTION_STORAGE = "whitenoise.storage.CompressedManifestStaticFilesStorage"
+STYLESHEET_LINK = re.compile(rb'<link rel="stylesheet" href="([^"]+)">')
+
+
+def compressed_sizes(content):
+    """
+    {"raw", "gzip", "brotli"} byte counts, at the levels a server would use
+    when compressing on the fly (gzip 6, brotli 4).
+    """
+    return {
+        "raw": len(content),
+        "gzip": len(gzip.compress(content, compresslevel=6)),
+        "brotli": len(brotli.compress(content, quality=4)) if brotli else None,
+    }
+
+
+def collect(static_root):
+    """
+    Run collectstatic with the production storage into static_root and return
+    {original name: {"hashed", "raw", "gzip", "brotli"}} for the project's own
+    files (STATICFILES_DIRS, not the admin's), read from the files WhiteNoise
+    wrote (.gz / .br next to the hashed copy).
+    """
+    from django.contrib.staticfiles.finders import FileSystemFinder
+    from django.core.management import call_command
+
+    call_command("collectstatic", interactive=False, verbosity=0)
+    manifest = json.loads((static_root / "staticfiles.json").read_text())
+    own = {name for name, storage in FileSystemFinder().list([])}
+    files = {}
+    for name, hashed in sorted(manifest["paths"].items()):
+        if name not in own:
+            continue
+        path = static_root / hashed
+        gz, br = Path(f"{path}.gz"), Path(f"{path}.br")
+        files[name] = {
+            "hashed": hashed,
+            "raw": path.stat().st_size,
+            # WhiteNoise skips compressing files that would not shrink
+            "gzip": gz.stat().st_size if gz.exists() else None,
+            "brotli": br.stat().st_size if br.exists() else None,
+        }
+    return files
+
+
+def build_pages():
+    from django.urls import reverse
+
+    return {
+        "post list": reverse("posts:post-list"),
+        "post detail": reverse("posts:post-detail", kwargs={"slug": "bench-post-0"}),
+        "category list": reverse("posts:category-list"),
+        "category detail": reverse("posts:category-detail", kwargs={"slug": "category-0"}),
+    }
+
+
+def measure_page(client, url, static_root):
+    """
+    Sizes of one page as served (stylesheet linked) and with the stylesheet
+    inlined, plus the bytes saved per response.
+    """
+    from django.conf import settings
+
+    html = client.get(url).content
+    linked = compressed_sizes(html)
+    stylesheets = STYLESHEET_LINK.findall(html)
+
+    def inline(match):
+        css = (static_root / match.group(1).decode()[len(settings.STATIC_URL):]).read_bytes()
+        return b"<style>" + css + b"</style>"
+
+    inlined = compressed_sizes(STYLESHEET_LINK.sub(inline, html))
+    return {
+        "url": url,
+        "stylesheets": [href.decode() for href in stylesheets],
+        "linked": linked,
+        "inlined": inlined,
+        "saved": {
+            encoding: None if linked[encoding] is None else inlined[encoding] - linked[encoding]
+            for encoding in linked
+        },
+    }
+
+
+def print_report(results):
+    def size(value):
+        return "-" if value is None else f"{value:,}"
+
+    header = f"{'file':28} {'raw':>8} {'gzip':>8} {'brotli':>8}  hashed name"
+    print(header)
+    print("-" * len(header))
+    for name, stats in results["files"].items():
+        print(
+            f"{name:28} {size(stats['raw']):>8} {size(stats['gzip']):>8} "
+            f"{size(stats['brotli']):>8}  {stats['hashed']}"
+        )
+
+    header = (
+        f"\n{'page':16} {'inlined':>9} {'linked':>9} {'saved':>7} "
+        f"{'gz inl.':>9} {'gz link.':>9} {'gz saved':>9} {'br saved':>9}"
+    )
+    print(header)
+    print("-" * (len(header) - 1))
+    for name, stats in results["pages"].items():
+        print(
+            f"{name:16} {size(stats['inlined']['raw']):>9} {size(stats['linked']['raw']):>9} "
+            f"{size(stats['saved']['raw']):>7} {size(stats['inlined']['gzip']):>9} "
+            f"{size(stats['linked']['gzip']):>9} {size(stats['saved']['gzip']):>9} "
+            f"{size(stats['saved']['brotli']):>9}"
+        )
+    print("\nSaved bytes are per HTML response once the stylesheet is cached by the browser.")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Report static asset and per-response sizes.")
+    parser.add_argument("--users", type=int, default=5)
+    parser.add_argument("--posts", type=int, default=100)
+    parser.add_argument("--categories", type=int, default=5)
+    parser.add_argument("--tags", type=int, default=15)
+    parser.add_argument("--output", type=Path, help="Write results as JSON to this file.")
+    args = parser.parse_args(argv)
+
+    setup_django()
+    from django.conf import settings
+    from django.db import connection
+    from django.test import Client, override_settings
+    from django.test.utils import setup_test_environment, teardown_test_environment
+    from benchmarks import data
+
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        with tempfile.TemporaryDirectory() as scratch:
+            static_root = Path(scratch)
+            storages = {**settings.STORAGES, "staticfiles": {"BACKEND": PRODUCTION_STORAGE}}
+            with override_settings(STATIC_ROOT=static_root, STORAGES=storages):
+                files = collect(static_root)
+                dataset = data.generate(args.users, args.posts, args.categories, args.tags)
+                client = Client()
+                pages = {
+                    name: measure_page(client, url, static_root)
+                    for name, url in build_pages().items()
+                }
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+    results = {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "storage": PRODUCTION_STORAGE,
+            "brotli": brotli is not None,
+            "dataset": dataset,
+        },
+        "files": files,
+        "pages": pages,
+    }
+    print_report(results)
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2) + "\n")
+        print(f"\nResults written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
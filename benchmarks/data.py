@@ -0,0 +1,83 @@
+# benchmarks/data.py
+# Synthetic dataset for the benchmarks: users, categories, tags and posts,
+# written with bulk_create so large datasets load in seconds.
+
+import random
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.utils import timezone
+
+from accounts.models import Profile
+from posts import archive, counters, related, search
+from posts import cache as post_cache
+from posts.models import Post, Category, Tag
+
+WORDS = (
+    "django python query index cache template view model form signal queryset "
+    "paginate render deploy static media session router replica feed sitemap "
+    "latency throughput profile avatar search category tag author archive"
+).split()
+
+PASSWORD = "bench-pass-123"
+
+
+def sentence(rng, words):
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+def generate(users=20, posts=1000, categories=10, tags=30, seed=42, batch_size=1000):
+    """
+    Populate the current database and return a summary dict.
+    Every user gets PASSWORD (hashed once) and a Profile.
+    Each post gets 1-2 categories and 0-4 tags.
+    """
+    rng = random.Random(seed)
+    User = get_user_model()
+    password = make_password(PASSWORD)
+
+    user_objs = User.objects.bulk_create(
+        [User(username=f"bench{i}", email=f"bench{i}@example.com", password=password) for i in range(users)],
+        batch_size=batch_size,
+    )
+    Profile.objects.bulk_create([Profile(user=user) for user in user_objs], batch_size=batch_size)
+    category_objs = Category.objects.bulk_create(
+        [Category(name=f"Category {i}", slug=f"category-{i}") for i in range(categories)]
+    )
+    tag_objs = Tag.objects.bulk_create([Tag(name=f"tag{i}", slug=f"tag-{i}") for i in range(tags)])
+
+    now = timezone.now()
+    category_links, tag_links = [], []
+    CategoryLink, TagLink = Post.categories.through, Post.tags.through
+    for start in range(0, posts, batch_size):
+        batch = [
+            Post(
+                title=sentence(rng, 6).capitalize(),
+                slug=f"bench-post-{i}",
+                content="\n\n".join(sentence(rng, 80) for _ in range(rng.randint(3, 8))),
+                author=rng.choice(user_objs),
+            )
+            for i in range(start, min(start + batch_size, posts))
+        ]
+        for post in batch:
+            post.render_content()                       # bulk_create skips Post.save()
+        Post.objects.bulk_create(batch)
+        for offset, post in enumerate(batch):
+            # Spread creation times so ordering and archives look realistic
+            post.created_at = now - timedelta(hours=start + offset)
+            for category in rng.sample(category_objs, rng.randint(1, 2)):
+                category_links.append(CategoryLink(post_id=post.pk, category_id=category.pk))
+            for tag in rng.sample(tag_objs, rng.randint(0, 4)):
+                tag_links.append(TagLink(post_id=post.pk, tag_id=tag.pk))
+        Post.objects.bulk_update(batch, ["created_at"])
+        CategoryLink.objects.bulk_create(category_links)
+        TagLink.objects.bulk_create(tag_links)
+        category_links, tag_links = [], []
+
+    counters.rebuild_counts()
+    related.rebuild_all()
+    archive.rebuild_histogram()
+    post_cache.invalidate_archive_months()
+    search.get_backend().rebuild()
+    return {"users": users, "posts": posts, "categories": categories, "tags": tags, "seed": seed}
@@ -0,0 +1,304 @@
+# benchmarks/load.py
+# Throughput of the public pages under concurrent load, per server setup.
+#
+# Usage (from the project root):
+#   SECRET_KEY=... python -m benchmarks.load --posts 2000 --concurrency 32 --duration 20
+#   SECRET_KEY=... python -m benchmarks.load --mode wsgi --mode asgi-async --output load.json
+#   SECRET_KEY=... python -m benchmarks.load --mode gunicorn-defaults --mode conf-gthread --mode conf-uvicorn
+#
+# A temporary SQLite database is filled by benchmarks/data.py (or pass
+# --database-url to load an existing, already populated database), then each
+# mode starts a real server against that same database and is hammered by
+# --concurrency keep-alive clients cycling over list, detail and category
+# pages for --duration seconds. Modes:
+#   wsgi        gunicorn gthread workers, sync views (blog_project.wsgi)
+#   asgi-sync   uvicorn workers, sync views (each request hops to a thread)
+#   asgi-async  uvicorn workers, async views (POSTS_ASYNC_VIEWS=True)
+#   gunicorn-defaults  gunicorn with none of its settings tuned (one sync
+#               worker, no keep-alive): the baseline for gunicorn.conf.py
+#   conf-gthread       gunicorn.conf.py with gthread workers (sync views)
+#   conf-uvicorn       gunicorn.conf.py with uvicorn workers (async views)
+# --workers/--threads size the first three modes; the conf-* modes size
+# themselves from the CPU count like a deployment would (set WEB_CONCURRENCY
+# or GUNICORN_THREADS in the environment to override).
+# Reported per mode: requests/second, latency percentiles and errors.
+#
+# The clients run in this process, so on a small machine they compete with
+# the server for CPU: compare modes against each other, not against numbers
+# from another machine.
+
+import argparse
+import http.client
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+
+from benchmarks.run import git_commit, percentile
+
+ROOT = Path(__file__).resolve().parent.parent
+HOST = "127.0.0.1"
+
+
+def mode_commands(workers, threads):
+    """
+    {mode name: (server command with {port} placeholder, extra environment)}.
+    """
+    # gunicorn reads ./gunicorn.conf.py unless given another config file
+    no_config = ["--config", os.devnull]
+    gunicorn = [
+        sys.executable, "-m", "gunicorn", "blog_project.wsgi:application", *no_config,
+        "--bind", f"{HOST}:{{port}}", "--workers", str(workers),
+        "--worker-class", "gthread", "--threads", str(threads), "--log-level", "warning",
+    ]
+    uvicorn = [
+        sys.executable, "-m", "uvicorn", "blog_project.asgi:application",
+        "--host", HOST, "--port", "{port}", "--workers", str(workers),
+        "--log-level", "warning", "--no-access-log",
+    ]
+    gunicorn_defaults = [
+        sys.executable, "-m", "gunicorn", "blog_project.wsgi:application", *no_config,
+        "--bind", f"{HOST}:{{port}}", "--log-level", "warning",
+    ]
+    # Sized by gunicorn.conf.py itself (WEB_CONCURRENCY / GUNICORN_THREADS override)
+    gunicorn_conf = [sys.executable, "-m", "gunicorn", "--bind", f"{HOST}:{{port}}", "--log-level", "warning"]
+    return {
+        "wsgi": (gunicorn, {"POSTS_ASYNC_VIEWS": "False"}),
+        "asgi-sync": (uvicorn, {"POSTS_ASYNC_VIEWS": "False"}),
+        "asgi-async": (uvicorn, {"POSTS_ASYNC_VIEWS": "True"}),
+        "gunicorn-defaults": (gunicorn_defaults, {"POSTS_ASYNC_VIEWS": "False"}),
+        "conf-gthread": (gunicorn_conf, {"POSTS_ASYNC_VIEWS": "False", "GUNICORN_WORKER_CLASS": "gthread"}),
+        "conf-uvicorn": (gunicorn_conf, {"POSTS_ASYNC_VIEWS": "True", "GUNICORN_WORKER_CLASS": "uvicorn"}),
+    }
+
+
+def server_environment(database_url, static_root, extra):
+    """
+    Production settings, minus what needs a real deployment (HTTPS, hosts).
+    """
+    return {
+        **os.environ,
+        "DJANGO_SETTINGS_MODULE": "blog_project.settings.prod",
+        "SECRET_KEY": os.environ.get("SECRET_KEY", "load-benchmark"),
+        "DATABASE_URL": database_url,
+        "STATIC_ROOT": str(static_root),
+        # Production refuses an in-process cache; a file cache next to the
+        # static files is shared by every worker, like Redis would be
+        "CACHE_URL": os.environ.get("CACHE_URL", f"filecache://{Path(static_root).parent / 'cache'}"),
+        "ALLOWED_HOSTS": HOST,
+        "SECURE_SSL_REDIRECT": "False",
+        "PERF_SAMPLE_RATE": "0",
+        # Measure the application, not the page cache (set PAGE_CACHE_ENABLED=True to include it)
+        "PAGE_CACHE_ENABLED": os.environ.get("PAGE_CACHE_ENABLED", "False"),
+        **extra,
+    }
+
+
+def collect_static(env):
+    """
+    Run collectstatic with the production settings in env: their hashed
+    storage renders {% static %} from the manifest it writes.
+    """
+    subprocess.run(
+        [sys.executable, "manage.py", "collectstatic", "--noinput", "--verbosity", "0"],
+        cwd=ROOT, env=env, check=True,
+    )
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind((HOST, 0))
+        return sock.getsockname()[1]
+
+
+@contextmanager
+def serve(command, env, ready_path="/", timeout=30):
+    """
+    Start a server (command may contain {port}), wait until ready_path
+    answers, yield the port and stop the server afterwards.
+    """
+    port = free_port()
+    process = subprocess.Popen([part.format(port=port) for part in command], cwd=ROOT, env=env)
+    try:
+        deadline = time.monotonic() + timeout
+        while True:
+            if process.poll() is not None:
+                raise RuntimeError(f"server exited with status {process.returncode}: {' '.join(command)}")
+            try:
+                connection = http.client.HTTPConnection(HOST, port, timeout=5)
+                connection.request("GET", ready_path)
+                connection.getresponse().read()
+                connection.close()
+                break
+            except OSError:
+                if time.monotonic() > deadline:
+                    raise RuntimeError(f"server did not start within {timeout}s")
+                time.sleep(0.2)
+        yield port
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+
+
+def build_paths(dataset):
+    """
+    Request mix: list pages, post details and category pages.
+    """
+    step = max(1, dataset["posts"] // 20)
+    paths = [f"/?page={page}" for page in range(1, 6)]
+    paths += [f"/bench-post-{i}/" for i in range(0, dataset["posts"], step)]
+    paths += [f"/category/category-{i}/" for i in range(dataset["categories"])]
+    return paths
+
+
+def run_load(port, paths, concurrency, duration, warmup=2.0):
+    """
+    concurrency keep-alive clients request paths round-robin for warmup +
+    duration seconds; only requests finished after the warm-up are counted.
+    """
+    start = time.perf_counter()
+    measure_from = start + warmup
+    stop_at = measure_from + duration
+    latencies, statuses, errors = [], {}, []
+    lock = threading.Lock()
+
+    def client(offset):
+        connection = http.client.HTTPConnection(HOST, port, timeout=30)
+        mine, codes, failures = [], {}, 0
+        i = offset
+        while True:
+            began = time.perf_counter()
+            if began >= stop_at:
+                break
+            try:
+                connection.request("GET", paths[i % len(paths)])
+                response = connection.getresponse()
+                response.read()
+                status = response.status
+            except (OSError, http.client.HTTPException):
+                connection.close()
+                connection = http.client.HTTPConnection(HOST, port, timeout=30)
+                status = None
+            finished = time.perf_counter()
+            if began >= measure_from:
+                if status is None:
+                    failures += 1
+                else:
+                    mine.append((finished - began) * 1000)
+                    codes[status] = codes.get(status, 0) + 1
+            i += 1
+        connection.close()
+        with lock:
+            latencies.extend(mine)
+            for status, count in codes.items():
+                statuses[status] = statuses.get(status, 0) + count
+            errors.append(failures)
+
+    threads = [threading.Thread(target=client, args=(n,)) for n in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    completed = len(latencies)
+    return {
+        "requests": completed,
+        "requests_per_second": round(completed / duration, 1),
+        "p50_ms": round(percentile(latencies, 50), 2) if latencies else None,
+        "p99_ms": round(percentile(latencies, 99), 2) if latencies else None,
+        "status_codes": {str(status): count for status, count in sorted(statuses.items())},
+        "errors": sum(errors),
+    }
+
+
+def seed(database_url, args):
+    """
+    Migrate and fill the benchmark database (in this process).
+    """
+    os.environ["DATABASE_URL"] = database_url
+    from benchmarks.run import setup_django
+
+    setup_django()
+    from django.core.management import call_command
+    from benchmarks import data
+
+    call_command("migrate", verbosity=0)
+    return data.generate(args.users, args.posts, args.categories, args.tags)
+
+
+def main(argv=None):
+    modes = list(mode_commands(1, 1))
+    parser = argparse.ArgumentParser(description="Compare server setups under concurrent load.")
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--posts", type=int, default=1000)
+    parser.add_argument("--categories", type=int, default=10)
+    parser.add_argument("--tags", type=int, default=30)
+    parser.add_argument(
+        "--database-url",
+        help="Use this already populated database instead of a temporary SQLite one "
+        "(give --posts/--categories matching its contents).",
+    )
+    parser.add_argument("--mode", action="append", choices=modes, help="Modes to run (default: all).")
+    parser.add_argument("--workers", type=int, default=2, help="Server worker processes.")
+    parser.add_argument("--threads", type=int, default=4, help="Threads per gunicorn gthread worker.")
+    parser.add_argument("--concurrency", type=int, default=16, help="Concurrent clients.")
+    parser.add_argument("--duration", type=float, default=10.0, help="Measured seconds per mode.")
+    parser.add_argument("--output", type=Path, help="Write results as JSON to this file.")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as scratch:
+        if args.database_url:
+            database_url = args.database_url
+            dataset = {"posts": args.posts, "categories": args.categories}
+        else:
+            database_url = f"sqlite:///{Path(scratch) / 'load.sqlite3'}"
+            dataset = seed(database_url, args)
+        paths = build_paths(dataset)
+        static_root = Path(scratch) / "static"
+        collect_static(server_environment(database_url, static_root, {}))
+
+        results = {
+            "meta": {
+                "commit": git_commit(),
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "dataset": dataset,
+                "workers": args.workers,
+                "threads": args.threads,
+                "concurrency": args.concurrency,
+                "duration": args.duration,
+            },
+            "modes": {},
+        }
+        for name, (command, extra) in mode_commands(args.workers, args.threads).items():
+            if args.mode and name not in args.mode:
+                continue
+            with serve(command, server_environment(database_url, static_root, extra)) as port:
+                results["modes"][name] = run_load(port, paths, args.concurrency, args.duration)
+
+    header = f"{'mode':17} {'req/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'errors':>7}  status codes"
+    print(header)
+    print("-" * len(header))
+    for name, stats in results["modes"].items():
+        print(
+            f"{name:17} {stats['requests_per_second']:9.1f} {stats['p50_ms'] or 0:8.2f} "
+            f"{stats['p99_ms'] or 0:8.2f} {stats['errors']:7d}  {stats['status_codes']}"
+        )
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2) + "\n")
+        print(f"\nResults written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
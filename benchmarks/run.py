@@ -0,0 +1,254 @@
+# benchmarks/run.py
+# Time the main request paths through Django's test client.
+#
+# Usage (from the project root):
+#   SECRET_KEY=... python -m benchmarks.run --posts 2000 --output bench.json
+#   SECRET_KEY=... python -m benchmarks.run --compare old.json --output new.json
+#
+# A throwaway test database is created, filled by benchmarks/data.py, and
+# destroyed afterwards. For every scenario the runner reports latency
+# percentiles (p50/p99), the number of SQL queries per request and the peak
+# memory allocated while handling one request (tracemalloc). Results are
+# written as JSON tagged with the current git commit so runs can be compared.
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+
+
+def setup_django():
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "blog_project.settings.dev")
+    # Keep the request instrumentation out of the measurements unless asked for
+    os.environ.setdefault("PERF_SAMPLE_RATE", "0")
+    import django
+    django.setup()
+
+
+def percentile(samples, pct):
+    """
+    Nearest-rank percentile of a list of numbers.
+    """
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+class Scenario:
+    """
+    One request path to measure.
+    - make_request(client, i) issues the i-th request and returns the response
+    - login: username to log the client in as (None = anonymous)
+    """
+
+    def __init__(self, name, make_request, login=None, iterations=None):
+        self.name = name
+        self.make_request = make_request
+        self.login = login
+        self.iterations = iterations
+
+
+def build_scenarios(dataset):
+    """
+    Scenarios for the posts and accounts views, cycling over sample objects.
+    """
+    from django.urls import reverse
+    from benchmarks.data import PASSWORD
+
+    post_slugs = [f"bench-post-{i}" for i in range(0, dataset["posts"], max(1, dataset["posts"] // 20))]
+    category_slugs = [f"category-{i}" for i in range(dataset["categories"])]
+    run_id = int(time.time())
+
+    def post_list(client, i):
+        return client.get(reverse("posts:post-list"), {"page": i % 5 + 1})
+
+    def post_detail(client, i):
+        return client.get(reverse("posts:post-detail", kwargs={"slug": post_slugs[i % len(post_slugs)]}))
+
+    def category_detail(client, i):
+        slug = category_slugs[i % len(category_slugs)]
+        return client.get(reverse("posts:category-detail", kwargs={"slug": slug}))
+
+    def register_get(client, i):
+        return client.get(reverse("accounts:register"))
+
+    def register_post(client, i):
+        client.logout()
+        return client.post(reverse("accounts:register"), {
+            "username": f"new{run_id}x{i}",
+            "email": f"new{run_id}x{i}@example.com",
+            "password1": PASSWORD,
+            "password2": PASSWORD,
+        })
+
+    def profile_get(client, i):
+        return client.get(reverse("accounts:profile-update"))
+
+    def profile_post(client, i):
+        return client.post(reverse("accounts:profile-update"), {"bio": f"Bio revision {i}"})
+
+    return [
+        Scenario("posts:post-list", post_list),
+        Scenario("posts:post-detail", post_detail),
+        Scenario("posts:category-detail", category_detail),
+        Scenario("accounts:register [GET]", register_get),
+        # Password hashing dominates; fewer iterations keep the run short
+        Scenario("accounts:register [POST]", register_post, iterations=20),
+        Scenario("accounts:profile-update [GET]", profile_get, login="bench0"),
+        Scenario("accounts:profile-update [POST]", profile_post, login="bench0"),
+    ]
+
+
+def measure(scenario, iterations, warmup, memory_samples):
+    """
+    Run one scenario and return its statistics.
+    Timing and memory are measured in separate passes, because tracemalloc
+    slows the interpreter down considerably.
+    """
+    from django.contrib.auth import get_user_model
+    from django.db import connection
+    from django.test import Client
+    from django.test.utils import CaptureQueriesContext
+
+    client = Client()
+    if scenario.login:
+        client.force_login(get_user_model().objects.get(username=scenario.login))
+    iterations = scenario.iterations or iterations
+
+    for i in range(warmup):
+        scenario.make_request(client, i)
+
+    timings, queries, statuses = [], [], set()
+    for i in range(iterations):
+        with CaptureQueriesContext(connection) as ctx:
+            start = time.perf_counter()
+            response = scenario.make_request(client, warmup + i)
+            timings.append((time.perf_counter() - start) * 1000)
+        queries.append(len(ctx.captured_queries))
+        statuses.add(response.status_code)
+
+    peaks = []
+    for i in range(memory_samples):
+        tracemalloc.start()
+        scenario.make_request(client, warmup + iterations + i)
+        peaks.append(tracemalloc.get_traced_memory()[1] / 1024)
+        tracemalloc.stop()
+
+    return {
+        "iterations": iterations,
+        "status_codes": sorted(statuses),
+        "p50_ms": round(percentile(timings, 50), 3),
+        "p99_ms": round(percentile(timings, 99), 3),
+        "mean_ms": round(statistics.fmean(timings), 3),
+        "queries_median": statistics.median(queries),
+        "queries_max": max(queries),
+        "peak_alloc_kib": round(statistics.median(peaks), 1) if peaks else None,
+    }
+
+
+def compare(previous, current):
+    """
+    Print a per-scenario comparison of two result files.
+    """
+    print(f"\nComparison: {previous['meta']['commit']} -> {current['meta']['commit']}")
+    header = f"{'scenario':34} {'p50 ms':>18} {'p99 ms':>18} {'queries':>10}"
+    print(header)
+    print("-" * len(header))
+    for name, now in current["scenarios"].items():
+        before = previous["scenarios"].get(name)
+        if before is None:
+            print(f"{name:34} (new)")
+            continue
+
+        def delta(key):
+            old, new = before[key], now[key]
+            change = f"{(new - old) / old * 100:+.0f}%" if old else "n/a"
+            return f"{old:.2f}->{new:.2f} {change}"
+
+        q = f"{before['queries_median']:g}->{now['queries_median']:g}"
+        print(f"{name:34} {delta('p50_ms'):>18} {delta('p99_ms'):>18} {q:>10}")
+
+
+def print_table(results):
+    header = f"{'scenario':34} {'p50 ms':>8} {'p99 ms':>8} {'queries':>8} {'peak KiB':>9}"
+    print(header)
+    print("-" * len(header))
+    for name, stats in results["scenarios"].items():
+        print(
+            f"{name:34} {stats['p50_ms']:8.2f} {stats['p99_ms']:8.2f} "
+            f"{stats['queries_median']:8g} {stats['peak_alloc_kib'] or 0:9.1f}"
+        )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the blog's request paths.")
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--posts", type=int, default=1000)
+    parser.add_argument("--categories", type=int, default=10)
+    parser.add_argument("--tags", type=int, default=30)
+    parser.add_argument("--iterations", type=int, default=200, help="Timed requests per scenario.")
+    parser.add_argument("--warmup", type=int, default=20, help="Untimed requests per scenario.")
+    parser.add_argument("--memory-samples", type=int, default=5, help="Requests traced with tracemalloc.")
+    parser.add_argument("--only", action="append", help="Run only scenarios whose name contains this text.")
+    parser.add_argument("--output", type=Path, help="Write results as JSON to this file.")
+    parser.add_argument("--compare", type=Path, help="Previous results file to compare against.")
+    args = parser.parse_args(argv)
+
+    setup_django()
+    import django
+    from django.db import connection
+    from django.test.utils import setup_test_environment, teardown_test_environment
+    from benchmarks import data
+
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        dataset = data.generate(args.users, args.posts, args.categories, args.tags)
+        results = {
+            "meta": {
+                "commit": git_commit(),
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "python": platform.python_version(),
+                "django": django.get_version(),
+                "database": connection.vendor,
+                "dataset": dataset,
+            },
+            "scenarios": {},
+        }
+        for scenario in build_scenarios(dataset):
+            if args.only and not any(text in scenario.name for text in args.only):
+                continue
+            results["scenarios"][scenario.name] = measure(
+                scenario, args.iterations, args.warmup, args.memory_samples
+            )
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+    print_table(results)
+    if args.compare:
+        compare(json.loads(args.compare.read_text()), results)
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2) + "\n")
+        print(f"\nResults written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,164 @@
+# benchmarks/startup.py
+# Worker start-up time and first-request latency, with and without the
+# template warm-up (TEMPLATE_WARMUP, blog_project/warmup.py).
+#
+# Usage (from the project root):
+#   SECRET_KEY=... python -m benchmarks.startup --runs 5
+#   SECRET_KEY=... python -m benchmarks.startup --output startup.json
+#
+# A temporary SQLite database is filled by benchmarks/data.py and the static
+# files are collected next to it. Each run then starts a fresh Python process
+# with the production settings (as benchmarks/load.py does for its servers),
+# which:
+#   - times `import blog_project.wsgi`: settings, app registry, middleware
+#     and, when enabled, the template warm-up; what a gunicorn worker (or the
+#     master, with preload_app) spends before it can answer;
+#   - sends the first request for each page straight to the WSGI callable,
+#     then the same request again, and times both.
+# The first request of a cold worker also opens the database connection and
+# resolves the URLconf, in both modes; the difference between the modes is
+# the template discovery and compilation moved from the first requests into
+# start-up. Reported values are medians over --runs processes.
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from benchmarks.load import HOST, ROOT, collect_static, seed, server_environment
+from benchmarks.run import git_commit
+
+MODES = {
+    "no warm-up": {"TEMPLATE_WARMUP": "False"},
+    "warm-up": {"TEMPLATE_WARMUP": "True"},
+}
+PATHS = ["/", "/bench-post-0/", "/category/category-0/", "/categories/"]
+
+
+def call_application(application, path):
+    """
+    Send one GET for path to a WSGI callable; returns (status, milliseconds).
+    """
+    from wsgiref.util import setup_testing_defaults
+
+    environ = {"PATH_INFO": path, "HTTP_HOST": HOST, "SERVER_NAME": HOST}
+    setup_testing_defaults(environ)
+    status = []
+    began = time.perf_counter()
+    body = application(environ, lambda code, headers, exc_info=None: status.append(code))
+    try:
+        b"".join(body)
+    finally:
+        getattr(body, "close", lambda: None)()
+    return int(status[0].split()[0]), (time.perf_counter() - began) * 1000
+
+
+def child():
+    """
+    One measured process: prints {"startup_ms", "pages": {path: {...}}} as JSON.
+    """
+    began = time.perf_counter()
+    from blog_project.wsgi import application
+
+    startup_ms = (time.perf_counter() - began) * 1000
+    pages = {}
+    for path in PATHS:
+        status, first_ms = call_application(application, path)
+        _, second_ms = call_application(application, path)
+        pages[path] = {"status": status, "first_ms": first_ms, "second_ms": second_ms}
+    print(json.dumps({"startup_ms": startup_ms, "pages": pages}))
+
+
+def measure(env, runs):
+    """
+    Medians over `runs` fresh processes.
+    """
+    samples = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-m", "benchmarks.startup", "--child"],
+            cwd=ROOT, env=env, capture_output=True, text=True, check=True,
+        ).stdout
+        samples.append(json.loads(output.strip().splitlines()[-1]))
+
+    def median(values):
+        return round(statistics.median(values), 2)
+
+    return {
+        "startup_ms": median([sample["startup_ms"] for sample in samples]),
+        "first_request_ms": median([sum(p["first_ms"] for p in sample["pages"].values()) for sample in samples]),
+        "pages": {
+            path: {
+                "status": samples[0]["pages"][path]["status"],
+                "first_ms": median([sample["pages"][path]["first_ms"] for sample in samples]),
+                "second_ms": median([sample["pages"][path]["second_ms"] for sample in samples]),
+            }
+            for path in PATHS
+        },
+    }
+
+
+def print_report(results):
+    header = f"{'mode':12} {'startup ms':>11} {'1st requests ms':>16}"
+    print(header)
+    print("-" * len(header))
+    for name, stats in results["modes"].items():
+        print(f"{name:12} {stats['startup_ms']:11.1f} {stats['first_request_ms']:16.1f}")
+
+    header = f"\n{'page':24} " + " ".join(f"{name + ' 1st/2nd ms':>24}" for name in results["modes"])
+    print(header)
+    print("-" * (len(header) - 1))
+    for path in PATHS:
+        cells = []
+        for stats in results["modes"].values():
+            page = stats["pages"][path]
+            cells.append(f"{page['first_ms']:11.1f} / {page['second_ms']:9.1f}")
+        print(f"{path:24} " + " ".join(f"{cell:>24}" for cell in cells))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure start-up and first-request latency.")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--users", type=int, default=5)
+    parser.add_argument("--posts", type=int, default=200)
+    parser.add_argument("--categories", type=int, default=5)
+    parser.add_argument("--tags", type=int, default=15)
+    parser.add_argument("--runs", type=int, default=5, help="Fresh processes per mode.")
+    parser.add_argument("--output", type=Path, help="Write results as JSON to this file.")
+    args = parser.parse_args(argv)
+    if args.child:
+        child()
+        return 0
+
+    with tempfile.TemporaryDirectory() as scratch:
+        database_url = f"sqlite:///{Path(scratch) / 'startup.sqlite3'}"
+        dataset = seed(database_url, args)
+        static_root = Path(scratch) / "static"
+        collect_static(server_environment(database_url, static_root, {}))
+        results = {
+            "meta": {
+                "commit": git_commit(),
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "dataset": dataset,
+                "runs": args.runs,
+            },
+            "modes": {
+                name: measure(server_environment(database_url, static_root, extra), args.runs)
+                for name, extra in MODES.items()
+            },
+        }
+
+    print_report(results)
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2) + "\n")
+        print(f"\nResults written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
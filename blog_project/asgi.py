@@ -11,6 +11,20 @@ import os
 
 from django.core.asgi import get_asgi_application
 
-os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'blog_project.settings')
+# Use production settings for the ASGI app, like wsgi.py
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'blog_project.settings.prod')
+
+# No persistent connections under ASGI: sync ORM calls run in executor
+# threads, and request_finished closes only the connection of its own thread,
+# so connections kept for DB_CONN_MAX_AGE pile up unchecked. Each request
+# gets a fresh connection; reuse them with the pool (DB_POOL=True, which sets
+# CONN_MAX_AGE=0 itself) instead. Set before the settings are read (they take
+# the environment over .env).
+os.environ["DB_CONN_MAX_AGE"] = "0"
 
 application = get_asgi_application()
+
+# Compile the templates now instead of during the first requests (TEMPLATE_WARMUP)
+from blog_project.warmup import warm_up  # noqa: E402  (needs the app registry loaded above)
+
+warm_up()
@@ -0,0 +1,263 @@
+# blog_project/cache.py
+"""
+Two-tier cache backend: a small in-process LRU (L1) in front of a shared
+cache (L2, e.g. Redis) configured as another CACHES alias.
+
+    CACHES = {
+        "default": {
+            "BACKEND": "blog_project.cache.TieredCache",
+            "LOCATION": "shared",                  # alias of the L2 cache
+            "OPTIONS": {"L1_MAX_ENTRIES": 1000, "L1_TIMEOUT": 5},
+        },
+        "shared": {"BACKEND": "django.core.cache.backends.redis.RedisCache", ...},
+    }
+
+Reads are answered from L1 when possible and fall through to L2 otherwise;
+writes and deletes go to both tiers. Other processes' writes are not seen by
+this process's L1, so L1 entries live at most L1_TIMEOUT seconds: that is the
+staleness bound for data changed elsewhere (L1_TIMEOUT = 0 disables L1).
+
+The async API (aget, aset, ...) answers L1 hits in the event loop without
+a thread hop; only the L2 call is awaited. Methods not overridden here fall
+back to BaseCache's sync_to_async wrappers.
+
+Hit/miss counters are kept per tier for the whole process (TieredCache.stats())
+and per sampled request (blog_project/instrumentation.py).
+"""
+
+import pickle
+import threading
+import time
+from collections import OrderedDict
+
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+
+from . import instrumentation
+
+_MISSING = object()
+
+# One L1 store per TieredCache LOCATION, shared by every thread of the process
+# (django.core.cache.caches hands each thread its own backend instance)
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+class LRUStore:
+    """
+    Thread-safe, size-bounded mapping of key -> (pickled value, expiry time).
+    """
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self.data = OrderedDict()
+        self.lock = threading.Lock()
+        self.counts = {"l1_hits": 0, "l1_misses": 0, "l2_hits": 0, "l2_misses": 0}
+
+    def get(self, key):
+        with self.lock:
+            entry = self.data.get(key)
+            if entry is None:
+                return _MISSING
+            pickled, expires = entry
+            if expires <= time.monotonic():
+                del self.data[key]
+                return _MISSING
+            self.data.move_to_end(key)
+        return pickle.loads(pickled)
+
+    def set(self, key, value, ttl):
+        pickled = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        with self.lock:
+            self.data[key] = (pickled, time.monotonic() + ttl)
+            self.data.move_to_end(key)
+            while len(self.data) > self.max_entries:
+                self.data.popitem(last=False)
+
+    def delete(self, key):
+        with self.lock:
+            self.data.pop(key, None)
+
+    def clear(self):
+        with self.lock:
+            self.data.clear()
+
+    def count(self, name):
+        # Plain increments: a lost update under contention only skews statistics
+        self.counts[name] += 1
+        instrumentation.count_cache(name)
+
+
+def get_store(location, max_entries):
+    with _stores_lock:
+        if location not in _stores:
+            _stores[location] = LRUStore(max_entries)
+        return _stores[location]
+
+
+class TieredCache(BaseCache):
+    def __init__(self, location, params):
+        super().__init__(params)
+        options = params.get("OPTIONS", {})
+        self.shared_alias = location
+        self.l1_timeout = options.get("L1_TIMEOUT", 5)
+        self.store = get_store(location, options.get("L1_MAX_ENTRIES", 1000))
+
+    @property
+    def shared(self):
+        return caches[self.shared_alias]
+
+    def l1_ttl(self, timeout):
+        """
+        Seconds an entry may live in L1: the L2 timeout, capped by L1_TIMEOUT.
+        """
+        timeout = self.get_backend_timeout(timeout)
+        return self.l1_timeout if timeout is None else min(self.l1_timeout, timeout)
+
+    def remember(self, key, value, version, timeout=DEFAULT_TIMEOUT):
+        ttl = self.l1_ttl(timeout)
+        if ttl > 0:
+            self.store.set(self.make_and_validate_key(key, version), value, ttl)
+
+    def forget(self, key, version):
+        self.store.delete(self.make_and_validate_key(key, version))
+
+    # --- reads ---------------------------------------------------------------
+
+    def get(self, key, default=None, version=None):
+        value = self.store.get(self.make_and_validate_key(key, version))
+        if value is not _MISSING:
+            self.store.count("l1_hits")
+            return value
+        self.store.count("l1_misses")
+        value = self.shared.get(key, _MISSING, version=version)
+        if value is _MISSING:
+            self.store.count("l2_misses")
+            return default
+        self.store.count("l2_hits")
+        self.remember(key, value, version)
+        return value
+
+    def get_many(self, keys, version=None):
+        found, remaining = {}, []
+        for key in keys:
+            value = self.store.get(self.make_and_validate_key(key, version))
+            if value is _MISSING:
+                self.store.count("l1_misses")
+                remaining.append(key)
+            else:
+                self.store.count("l1_hits")
+                found[key] = value
+        if remaining:
+            shared = self.shared.get_many(remaining, version=version)
+            for key in remaining:
+                if key in shared:
+                    self.store.count("l2_hits")
+                    self.remember(key, shared[key], version)
+                else:
+                    self.store.count("l2_misses")
+            found.update(shared)
+        return found
+
+    async def aget(self, key, default=None, version=None):
+        value = self.store.get(self.make_and_validate_key(key, version))
+        if value is not _MISSING:
+            self.store.count("l1_hits")
+            return value
+        self.store.count("l1_misses")
+        value = await self.shared.aget(key, _MISSING, version=version)
+        if value is _MISSING:
+            self.store.count("l2_misses")
+            return default
+        self.store.count("l2_hits")
+        self.remember(key, value, version)
+        return value
+
+    async def aget_many(self, keys, version=None):
+        found, remaining = {}, []
+        for key in keys:
+            value = self.store.get(self.make_and_validate_key(key, version))
+            if value is _MISSING:
+                self.store.count("l1_misses")
+                remaining.append(key)
+            else:
+                self.store.count("l1_hits")
+                found[key] = value
+        if remaining:
+            shared = await self.shared.aget_many(remaining, version=version)
+            for key in remaining:
+                if key in shared:
+                    self.store.count("l2_hits")
+                    self.remember(key, shared[key], version)
+                else:
+                    self.store.count("l2_misses")
+            found.update(shared)
+        return found
+
+    def has_key(self, key, version=None):
+        if self.store.get(self.make_and_validate_key(key, version)) is not _MISSING:
+            return True
+        return self.shared.has_key(key, version=version)
+
+    # --- writes --------------------------------------------------------------
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        self.shared.set(key, value, timeout, version=version)
+        self.remember(key, value, version, timeout)
+
+    async def aset(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        await self.shared.aset(key, value, timeout, version=version)
+        self.remember(key, value, version, timeout)
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        added = self.shared.add(key, value, timeout, version=version)
+        if added:
+            self.remember(key, value, version, timeout)
+        else:
+            self.forget(key, version)
+        return added
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        failed = self.shared.set_many(data, timeout, version=version)
+        for key, value in data.items():
+            if key not in failed:
+                self.remember(key, value, version, timeout)
+        return failed
+
+    async def aset_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        failed = await self.shared.aset_many(data, timeout, version=version)
+        for key, value in data.items():
+            if key not in failed:
+                self.remember(key, value, version, timeout)
+        return failed
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        return self.shared.touch(key, timeout, version=version)
+
+    def incr(self, key, delta=1, version=None):
+        self.forget(key, version)
+        return self.shared.incr(key, delta, version=version)
+
+    def delete(self, key, version=None):
+        self.forget(key, version)
+        return self.shared.delete(key, version=version)
+
+    def delete_many(self, keys, version=None):
+        for key in keys:
+            self.forget(key, version)
+        self.shared.delete_many(keys, version=version)
+
+    def clear(self):
+        self.store.clear()
+        self.shared.clear()
+
+    def close(self, **kwargs):
+        self.shared.close(**kwargs)
+
+    # --- statistics ----------------------------------------------------------
+
+    def stats(self):
+        """
+        Process-wide hit/miss counts per tier, plus the current L1 size.
+        """
+        return {**self.store.counts, "l1_entries": len(self.store.data)}
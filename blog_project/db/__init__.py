@@ -0,0 +1,76 @@
+# blog_project/db/__init__.py
+"""
+Database settings helpers shared by the settings modules.
+
+database_config() turns a database URL from the environment into a DATABASES
+entry with connection reuse configured:
+  - persistent connections: DB_CONN_MAX_AGE seconds (default 600, 0 = one
+    connection per request, empty = unlimited), checked before reuse when
+    DB_CONN_HEALTH_CHECKS is on (default)
+  - or, with DB_POOL=True (PostgreSQL only), a psycopg_pool connection pool
+    shared by the threads of a process (blog_project.db.postgresql_pool),
+    sized by DB_POOL_MIN_SIZE / DB_POOL_MAX_SIZE, with DB_POOL_TIMEOUT seconds
+    to wait for a free connection
+
+close_before_fork() and forget_after_fork() keep those connections out of
+forked worker processes (gunicorn.conf.py, with preload_app).
+"""
+
+import sys
+
+from django.core.exceptions import ImproperlyConfigured
+
+POSTGRESQL_ENGINE = "django.db.backends.postgresql"
+POOL_ENGINE = "blog_project.db.postgresql_pool"
+
+
+def database_config(env, var="DATABASE_URL", default=None):
+    """
+    DATABASES entry for the URL in environment variable `var`.
+    """
+    config = env.db(var, default=default) if default is not None else env.db(var)
+    if env.bool("DB_POOL", default=False):
+        if config["ENGINE"] != POSTGRESQL_ENGINE:
+            raise ImproperlyConfigured("DB_POOL=True requires a PostgreSQL DATABASE_URL.")
+        config["ENGINE"] = POOL_ENGINE
+        # The pool owns connection lifetime; Django returns the connection after each request
+        config["CONN_MAX_AGE"] = 0
+        config.setdefault("OPTIONS", {})["pool"] = {
+            "min_size": env.int("DB_POOL_MIN_SIZE", default=2),
+            "max_size": env.int("DB_POOL_MAX_SIZE", default=10),
+            "timeout": env.float("DB_POOL_TIMEOUT", default=10.0),
+        }
+    else:
+        max_age = env.str("DB_CONN_MAX_AGE", default="600")
+        config["CONN_MAX_AGE"] = int(max_age) if max_age else None
+        config["CONN_HEALTH_CHECKS"] = env.bool("DB_CONN_HEALTH_CHECKS", default=True)
+    return config
+
+
+def close_before_fork():
+    """
+    Close every database connection and pool of this process. For a parent
+    about to fork workers: a socket inherited by several processes would be
+    used by all of them at once.
+    """
+    from django.db import connections
+
+    connections.close_all()
+    pool_backend = sys.modules.get(f"{POOL_ENGINE}.base")
+    if pool_backend is not None:
+        pool_backend.close_pools()
+
+
+def forget_after_fork():
+    """
+    Drop the connections and pools a forked child inherited, without closing
+    them: closing would end the sessions on sockets shared with the parent.
+    The child opens its own on first use.
+    """
+    from django.db import connections
+
+    for connection in connections.all(initialized_only=True):
+        connection.connection = None
+    pool_backend = sys.modules.get(f"{POOL_ENGINE}.base")
+    if pool_backend is not None:
+        pool_backend.forget_pools()
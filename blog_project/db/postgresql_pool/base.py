@@ -0,0 +1,119 @@
+# blog_project/db/postgresql_pool/base.py
+"""
+PostgreSQL backend that borrows connections from a psycopg_pool.ConnectionPool.
+
+Django 4.2 has no built-in pool support, so this wrapper replaces the two
+places where the stock backend opens and closes a socket:
+  - get_new_connection() takes a connection from the pool (opening one only
+    if the pool is below max_size and none is idle)
+  - _close() hands it back instead of disconnecting
+
+Configure it with ENGINE = "blog_project.db.postgresql_pool" and
+OPTIONS["pool"] = {"min_size": ..., "max_size": ..., "timeout": ...}
+(see blog_project/db/__init__.py). CONN_MAX_AGE must be 0: Django returns the
+connection at the end of every request and the pool keeps it open.
+"""
+
+import threading
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db import DEFAULT_DB_ALIAS
+from django.db.backends.postgresql import base as postgresql
+
+try:
+    from psycopg import IsolationLevel
+    from psycopg_pool import ConnectionPool
+except ImportError as exc:  # pragma: no cover - depends on the installed extras
+    raise ImproperlyConfigured(
+        "blog_project.db.postgresql_pool requires psycopg 3 with the pool extra "
+        "(pip install 'psycopg[pool]')."
+    ) from exc
+
+# One pool per database, shared by every thread of the process (each thread
+# has its own DatabaseWrapper)
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def close_pools():
+    """
+    Close every pool of this process (before forking workers).
+    """
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.close()
+        _pools.clear()
+
+
+def forget_pools():
+    """
+    Drop the pools inherited from a parent process without closing them: their
+    connections belong to the parent and their worker threads did not survive
+    the fork. The lock is replaced too, as the parent may have held it.
+    """
+    global _pools_lock
+    _pools.clear()
+    _pools_lock = threading.Lock()
+
+
+class DatabaseWrapper(postgresql.DatabaseWrapper):
+    def __init__(self, settings_dict, alias=DEFAULT_DB_ALIAS):
+        super().__init__(settings_dict, alias)
+        if settings_dict.get("CONN_MAX_AGE"):
+            raise ImproperlyConfigured(
+                f"Database {alias!r}: CONN_MAX_AGE must be 0 when using the connection pool."
+            )
+
+    def get_connection_params(self):
+        params = super().get_connection_params()
+        params.pop("pool", None)                   # our option, not a libpq parameter
+        return params
+
+    def pool_key(self):
+        # The test runner renames the database (NAME -> test_NAME) after the
+        # wrapper exists, so the pool is looked up by target, not only by alias
+        settings = self.settings_dict
+        return (self.alias, settings["NAME"], settings["HOST"], settings["PORT"], settings["USER"])
+
+    @property
+    def pool(self):
+        key = self.pool_key()
+        with _pools_lock:
+            if key not in _pools:
+                options = dict(self.settings_dict["OPTIONS"].get("pool") or {})
+                pool = ConnectionPool(
+                    kwargs=self.get_connection_params(),
+                    configure=self.configure_pooled_connection,
+                    check=ConnectionPool.check_connection,  # health check on checkout
+                    name=f"django-{self.alias}",
+                    open=False,
+                    **options,
+                )
+                pool.open()
+                _pools[key] = pool
+            return _pools[key]
+
+    def configure_pooled_connection(self, connection):
+        """
+        Runs once per physical connection, when the pool opens it.
+        The pool requires connections to be returned idle, so autocommit is on
+        here; Django sets its own autocommit mode after checkout.
+        """
+        isolation_level = self.settings_dict["OPTIONS"].get("isolation_level")
+        if isolation_level is not None:
+            connection.isolation_level = IsolationLevel(isolation_level)
+        connection.autocommit = True
+
+    def get_new_connection(self, conn_params):
+        isolation_level = self.settings_dict["OPTIONS"].get("isolation_level")
+        self.isolation_level = (
+            IsolationLevel(isolation_level) if isolation_level is not None
+            else IsolationLevel.READ_COMMITTED
+        )
+        return self.pool.getconn()
+
+    def _close(self):
+        if self.connection is not None:
+            with self.wrap_database_errors:
+                # An open transaction is rolled back by the pool before reuse
+                self.pool.putconn(self.connection)
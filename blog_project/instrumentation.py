@@ -0,0 +1,231 @@
+# blog_project/instrumentation.py
+"""
+Request-level performance instrumentation.
+
+PerformanceMiddleware measures a sampled fraction of requests
+(settings.PERF_SAMPLE_RATE, 0.0-1.0) and records:
+  - total wall time of the request
+  - SQL query count and time, via a DB execute_wrapper on every connection
+  - duplicate queries (same SQL and parameters run more than once) and
+    repeated statements (same SQL, different parameters: the N+1 signature)
+  - template render time (outermost Template.render calls only)
+  - cache hits/misses per tier of blog_project.cache.TieredCache
+  - the resolved URL name, e.g. "posts:post-detail"
+
+Each sampled request gets a Server-Timing header (if settings.PERF_SERVER_TIMING)
+and one JSON log line on the "blog.perf" logger. Unsampled requests pay for a
+single random() call.
+
+The middleware runs natively in sync and async (ASGI) stacks. With the async
+ORM, queries run in a sync_to_async worker thread that has its own connection
+objects, so the async path installs the query recorders from that thread.
+"""
+
+import json
+import logging
+import random
+import time
+from collections import Counter
+from contextlib import ExitStack
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+from django.template import base as template_base
+
+logger = logging.getLogger("blog.perf")
+
+# Metrics of the request being measured in the current thread/task (None = not sampled)
+_current = ContextVar("blog_perf_metrics", default=None)
+
+
+class RequestMetrics:
+    """
+    Counters collected for one sampled request.
+    """
+
+    def __init__(self):
+        self.sql_count = 0
+        self.sql_ms = 0.0
+        self.statements = Counter()                 # SQL text -> executions
+        self.executions = Counter()                 # (SQL text, params) -> executions
+        self.template_ms = 0.0
+        self.template_depth = 0
+        self.cache = Counter()                      # "l1_hits", "l2_misses", ...
+
+    def record_query(self, sql, params, elapsed_ms):
+        self.sql_count += 1
+        self.sql_ms += elapsed_ms
+        self.statements[sql] += 1
+        try:
+            self.executions[(sql, repr(params))] += 1
+        except Exception:                           # unrepresentable params: skip duplicate check
+            pass
+
+    @property
+    def duplicate_queries(self):
+        """
+        Extra executions of identical SQL + parameters.
+        """
+        return sum(count - 1 for count in self.executions.values() if count > 1)
+
+    @property
+    def repeated_statements(self):
+        """
+        Statements run more than once with different parameters (likely N+1).
+        """
+        return {sql: count for sql, count in self.statements.items() if count > 1}
+
+
+class QueryRecorder:
+    """
+    connection.execute_wrapper() hook that times each query.
+    """
+
+    def __init__(self, metrics):
+        self.metrics = metrics
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.metrics.record_query(sql, params, (time.perf_counter() - start) * 1000)
+
+
+def count_cache(name):
+    """
+    Called by the tiered cache for every lookup ("l1_hits", "l2_misses", ...).
+    """
+    metrics = _current.get()
+    if metrics is not None:
+        metrics.cache[name] += 1
+
+
+def _install_template_timer():
+    """
+    Wrap django.template.base.Template.render once per process so sampled
+    requests can accumulate template time. Includes and {% extends %} render
+    nested templates, so only the outermost call is timed.
+    """
+    original = template_base.Template.render
+    if getattr(original, "_blog_perf_wrapped", False):
+        return
+
+    def render(self, context):
+        metrics = _current.get()
+        if metrics is None:
+            return original(self, context)
+        metrics.template_depth += 1
+        start = time.perf_counter()
+        try:
+            return original(self, context)
+        finally:
+            metrics.template_depth -= 1
+            if metrics.template_depth == 0:
+                metrics.template_ms += (time.perf_counter() - start) * 1000
+
+    render._blog_perf_wrapped = True
+    template_base.Template.render = render
+
+
+class PerformanceMiddleware:
+    """
+    Sampled per-request timing. Place it first in MIDDLEWARE so the measured
+    wall time covers the whole stack.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.sample_rate = getattr(settings, "PERF_SAMPLE_RATE", 0.0)
+        self.server_timing = getattr(settings, "PERF_SERVER_TIMING", True)
+        _install_template_timer()
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def sampled(self):
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    @staticmethod
+    def record_queries(metrics):
+        """
+        Attach a QueryRecorder to this thread's connections; closing the
+        returned ExitStack detaches them.
+        """
+        stack = ExitStack()
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(QueryRecorder(metrics)))
+        return stack
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not self.sampled():
+            return self.get_response(request)
+
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        start = time.perf_counter()
+        try:
+            with self.record_queries(metrics):
+                response = self.get_response(request)
+                # Lazy TemplateResponses are rendered by now; streaming bodies are not timed
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, start, metrics)
+
+    async def __acall__(self, request):
+        if not self.sampled():
+            return await self.get_response(request)
+
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        start = time.perf_counter()
+        # Thread-sensitive calls of one request share a worker thread, so the
+        # recorders sit on the connections the async ORM will use
+        stack = await sync_to_async(self.record_queries)(metrics)
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(stack.close)()
+            _current.reset(token)
+        return self.finish(request, response, start, metrics)
+
+    def finish(self, request, response, start, metrics):
+        total_ms = (time.perf_counter() - start) * 1000
+        if self.server_timing:
+            response["Server-Timing"] = self.server_timing_header(total_ms, metrics)
+        self.log(request, response, total_ms, metrics)
+        return response
+
+    @staticmethod
+    def server_timing_header(total_ms, metrics):
+        return (
+            f"app;dur={total_ms:.1f}, "
+            f'db;dur={metrics.sql_ms:.1f};desc="{metrics.sql_count} queries", '
+            f"tpl;dur={metrics.template_ms:.1f}"
+        )
+
+    @staticmethod
+    def log(request, response, total_ms, metrics):
+        match = getattr(request, "resolver_match", None)
+        repeated = metrics.repeated_statements
+        logger.info(json.dumps({
+            "event": "request",
+            "method": request.method,
+            "path": request.path,
+            "url_name": match.view_name if match else None,
+            "status": response.status_code,
+            "total_ms": round(total_ms, 2),
+            "sql_count": metrics.sql_count,
+            "sql_ms": round(metrics.sql_ms, 2),
+            "duplicate_queries": metrics.duplicate_queries,
+            "repeated_statements": len(repeated),
+            "worst_repeated": max(repeated.values()) if repeated else 0,
+            "template_ms": round(metrics.template_ms, 2),
+            "cache": dict(metrics.cache),
+        }))
@@ -0,0 +1,296 @@
+# blog_project/pagecache.py
+"""
+Full-page cache for anonymous GET requests, purged by surrogate key.
+
+Views opt in with cache_response(request, *keys), naming the surrogate keys of
+what the page shows ("post:12", "list", ...), and announce it with
+will_cache_response(request) before they read anything; template tags
+rendering shared fragments add theirs with add_surrogate_keys().
+PageCacheMiddleware then:
+  - sends the keys in a Surrogate-Key header, so a CDN or Varnish (xkey) in
+    front of the site can cache the page and purge it by the same keys;
+  - if settings.PAGE_CACHE_ENABLED, stores the opted-in response of an
+    anonymous client (no session or replica-pin cookie) in
+    settings.PAGE_CACHE_ALIAS for PAGE_CACHE_TIMEOUT seconds, and answers later
+    anonymous GET/HEAD requests for the same URL from it, before the session,
+    CSRF, auth and message middleware, the ORM or the templates run.
+
+Purging works like the feed generations in posts/cache.py: every surrogate key
+has a version in the cache, and a stored page records the versions of its keys.
+purge(keys) writes new versions for exactly those keys, so the pages tagged
+with any of them miss on their next request while every other page keeps
+serving. Purges are repeated after the surrounding transaction commits, so a
+page rendered from the not yet committed state is retired as well. Versions
+are time.time_ns() values: a page whose keys were purged while it was being
+rendered is not stored, and a version lost to eviction is re-created newer
+than every page recorded against it. purge() also sends
+surrogate_keys_purged, for forwarding purges to a CDN; purge_all() retires
+every page at once (after bulk imports, which bypass the signal handlers).
+
+Only responses that are safe to share are stored: status 200, not streaming,
+no cookies, no "private"/"no-store" Cache-Control. Stored pages keep their
+ETag/Last-Modified, so conditional requests get a 304 straight from the cache.
+A miss of an opted-in view reads from the primary database (see
+blog_project/routers.py): a page built from a lagging replica would outlive
+the lag. Anonymous requests to views that never opt in keep reading from the
+replica.
+
+Place the middleware below ReplicaRoutingMiddleware and above
+SessionMiddleware. It runs natively in sync and async stacks.
+"""
+
+import hashlib
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.dispatch import Signal
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import parse_http_date_safe
+
+from blog_project.routers import PIN_COOKIE, pin_to_primary
+
+SURROGATE_KEY_HEADER = "Surrogate-Key"
+STATUS_HEADER = "X-Page-Cache"                      # HIT / MISS, for debugging and tests
+GENERATION_KEY = "pagecache:generation"             # implicit key of every page (purge_all)
+
+# Sent after purge() / purge_all(), with keys=[...] (None for purge_all)
+surrogate_keys_purged = Signal()
+
+
+def add_surrogate_keys(request, *keys):
+    """
+    Record surrogate keys for the response to this request.
+    """
+    request.__dict__.setdefault("_surrogate_keys", set()).update(keys)
+
+
+def will_cache_response(request):
+    """
+    The view will call cache_response(): if the page cache may store this
+    response, send the view's reads to the primary.
+    """
+    if getattr(request, "_page_cache_miss", False):
+        pin_to_primary()
+
+
+def cache_response(request, *keys):
+    """
+    Let the page cache store the response to this request, tagged with keys.
+    """
+    will_cache_response(request)
+    request._page_cacheable = True
+    add_surrogate_keys(request, *keys)
+
+
+def get_surrogate_keys(request):
+    return request.__dict__.get("_surrogate_keys", set())
+
+
+def get_cache():
+    return caches[getattr(settings, "PAGE_CACHE_ALIAS", "default")]
+
+
+def get_timeout():
+    return getattr(settings, "PAGE_CACHE_TIMEOUT", 60 * 10)
+
+
+def page_key(request):
+    url = request.build_absolute_uri()
+    return f"pagecache:page:{hashlib.md5(url.encode()).hexdigest()}"
+
+
+def version_key(key):
+    return f"pagecache:key:{key}"
+
+
+def purge(keys):
+    """
+    Retire every cached page tagged with one of keys. Purges run now and
+    again once the current transaction commits: a page rendered in between
+    saw the old rows.
+    """
+    keys = sorted({key for key in keys if key})
+    if keys:
+        write_versions([version_key(key) for key in keys], keys)
+        transaction.on_commit(lambda: write_versions([version_key(key) for key in keys], keys))
+
+
+def purge_all():
+    """
+    Retire every cached page.
+    """
+    write_versions([GENERATION_KEY], None)
+    transaction.on_commit(lambda: write_versions([GENERATION_KEY], None))
+
+
+def write_versions(names, keys):
+    version = time.time_ns()
+    get_cache().set_many({name: version for name in names}, None)
+    surrogate_keys_purged.send(sender=None, keys=keys)
+
+
+class PageCacheMiddleware:
+    """
+    Serve and store anonymous pages tagged with surrogate keys (see above).
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    # --- decisions and (de)serialization, shared by both paths ------------
+
+    @staticmethod
+    def cacheable_request(request):
+        """
+        Anonymous GET/HEAD with the cache enabled. Clients with a session may
+        see personalised pages; clients pinned to the primary just wrote.
+        """
+        return (
+            getattr(settings, "PAGE_CACHE_ENABLED", False)
+            and request.method in ("GET", "HEAD")
+            and settings.SESSION_COOKIE_NAME not in request.COOKIES
+            and PIN_COOKIE not in request.COOKIES
+        )
+
+    @staticmethod
+    def version_keys(keys):
+        return [GENERATION_KEY] + [version_key(key) for key in sorted(keys)]
+
+    @staticmethod
+    def valid(entry, versions):
+        """
+        The stored page is current if none of its keys was purged since.
+        """
+        return all(versions.get(name) == version for name, version in entry["versions"].items())
+
+    @staticmethod
+    def respond(request, entry):
+        response = HttpResponse(entry["content"], status=entry["status"])
+        for header, value in entry["headers"]:
+            response[header] = value
+        response[STATUS_HEADER] = "HIT"
+        return get_conditional_response(
+            request,
+            etag=response.get("ETag"),
+            last_modified=parse_http_date_safe(response.get("Last-Modified", "")),
+            response=response,
+        )
+
+    @staticmethod
+    def storable(request, response):
+        cache_control = response.get("Cache-Control", "")
+        return (
+            request.method == "GET"
+            and getattr(request, "_page_cacheable", False)
+            and response.status_code == 200
+            and not response.streaming
+            and not response.cookies
+            and "private" not in cache_control
+            and "no-store" not in cache_control
+        )
+
+    @staticmethod
+    def tag(request, response):
+        keys = get_surrogate_keys(request)
+        if keys:
+            response[SURROGATE_KEY_HEADER] = " ".join(sorted(keys))
+        return keys
+
+    @staticmethod
+    def missing_versions(names, versions, started):
+        """
+        Versions to create for keys never purged (or evicted): `started` is
+        newer than any page recorded against an evicted version.
+        """
+        return {name: started for name in names if name not in versions}
+
+    @staticmethod
+    def build_entry(response, versions, started):
+        """
+        The cache entry for a response, or None if one of its keys was purged
+        while it was being rendered.
+        """
+        if any(version > started for version in versions.values()):
+            return None
+        return {
+            "versions": versions,
+            "status": response.status_code,
+            "headers": [
+                (header, value) for header, value in response.items()
+                if header not in (STATUS_HEADER, "Set-Cookie")
+            ],
+            "content": response.content,
+        }
+
+    # --- sync path ---------------------------------------------------------
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not self.cacheable_request(request):
+            response = self.get_response(request)
+            self.tag(request, response)
+            return response
+
+        cache, key = get_cache(), page_key(request)
+        entry = cache.get(key)
+        if entry is not None and self.valid(entry, cache.get_many(list(entry["versions"]))):
+            return self.respond(request, entry)
+
+        started = time.time_ns()
+        request._page_cache_miss = True                 # see will_cache_response()
+        response = self.get_response(request)
+        keys = self.tag(request, response)
+        response[STATUS_HEADER] = "MISS"
+        if keys and self.storable(request, response):
+            names = self.version_keys(keys)
+            versions = cache.get_many(names)
+            missing = self.missing_versions(names, versions, started)
+            for name, version in missing.items():
+                cache.add(name, version, None)
+            if missing:
+                versions = cache.get_many(names)
+            entry = self.build_entry(response, versions, started)
+            if entry is not None and len(versions) == len(names):
+                cache.set(key, entry, get_timeout())
+        return response
+
+    # --- async path ---------------------------------------------------------
+
+    async def __acall__(self, request):
+        if not self.cacheable_request(request):
+            response = await self.get_response(request)
+            self.tag(request, response)
+            return response
+
+        cache, key = get_cache(), page_key(request)
+        entry = await cache.aget(key)
+        if entry is not None and self.valid(entry, await cache.aget_many(list(entry["versions"]))):
+            return self.respond(request, entry)
+
+        started = time.time_ns()
+        request._page_cache_miss = True
+        response = await self.get_response(request)
+        keys = self.tag(request, response)
+        response[STATUS_HEADER] = "MISS"
+        if keys and self.storable(request, response):
+            names = self.version_keys(keys)
+            versions = await cache.aget_many(names)
+            missing = self.missing_versions(names, versions, started)
+            for name, version in missing.items():
+                await cache.aadd(name, version, None)
+            if missing:
+                versions = await cache.aget_many(names)
+            entry = self.build_entry(response, versions, started)
+            if entry is not None and len(versions) == len(names):
+                await cache.aset(key, entry, get_timeout())
+        return response
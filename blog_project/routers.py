@@ -0,0 +1,149 @@
+# blog_project/routers.py
+"""
+Read-replica routing.
+
+When settings.DATABASES has a "replica" alias (DATABASE_REPLICA_URL), reads
+made while handling a GET/HEAD request for a view marked use_replica = True
+go to the replica; everything else (writes, other views, management
+commands) uses "default".
+
+Replicas lag behind the primary, so a client that just wrote something is
+pinned to the primary: ReplicaRoutingMiddleware notices any write during a
+request (db_for_write was asked) and sets a short-lived cookie; while it is
+present, that client's reads stay on the primary
+(settings.DATABASE_REPLICA_PIN_SECONDS).
+
+Data that ends up in a long-lived cache must not be read from a lagging
+replica, or the stale copy would outlive the lag: wrap such reads in
+primary_reads().
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+REPLICA_ALIAS = "replica"
+PIN_COOKIE = "db_pin"
+
+# Routing state of the request being handled in this thread/task (None outside requests)
+_state = ContextVar("db_routing_state", default=None)
+
+
+class RoutingState:
+    def __init__(self, pinned):
+        self.pinned = pinned                # client wrote recently: stay on the primary
+        self.read_from_replica = False      # set by the middleware for use_replica views
+        self.wrote = False
+
+
+def replica_configured():
+    return REPLICA_ALIAS in connections.settings
+
+
+@contextmanager
+def primary_reads():
+    """
+    Send the reads inside the block to the primary, even in a replica view.
+    """
+    state = _state.get()
+    if state is None:
+        yield
+        return
+    previous, state.read_from_replica = state.read_from_replica, False
+    try:
+        yield
+    finally:
+        state.read_from_replica = previous
+
+
+def pin_to_primary():
+    """
+    Send every read of the current request to the primary, like a client that
+    just wrote (used for responses that are cached, see blog_project/pagecache.py).
+    """
+    state = _state.get()
+    if state is not None:
+        state.pinned = True
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        state = _state.get()
+        if state is not None and state.read_from_replica and replica_configured():
+            return REPLICA_ALIAS
+        return None
+
+    def db_for_write(self, model, **hints):
+        state = _state.get()
+        if state is not None:
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # The replica holds the same rows as the primary
+        aliases = {DEFAULT_DB_ALIAS, REPLICA_ALIAS}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Tracks routing state per request. Place it above SessionMiddleware so
+    session writes also count as writes.
+    Runs natively in sync and async stacks: the state lives in a ContextVar,
+    which the async ORM's worker threads inherit.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        state = RoutingState(pinned=PIN_COOKIE in request.COOKIES)
+        token = _state.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            _state.reset(token)
+        return self.pin(state, response)
+
+    async def __acall__(self, request):
+        state = RoutingState(pinned=PIN_COOKIE in request.COOKIES)
+        token = _state.set(state)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _state.reset(token)
+        return self.pin(state, response)
+
+    @staticmethod
+    def pin(state, response):
+        if state.wrote and replica_configured():
+            response.set_cookie(
+                PIN_COOKIE, "1",
+                max_age=getattr(settings, "DATABASE_REPLICA_PIN_SECONDS", 15),
+                httponly=True, samesite="Lax",
+            )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        state = _state.get()
+        view_class = getattr(view_func, "view_class", view_func)
+        if (
+            state is not None
+            and not state.pinned
+            and request.method in ("GET", "HEAD")
+            and getattr(view_class, "use_replica", False)
+        ):
+            state.read_from_replica = True
+        return None
@@ -40,8 +40,11 @@ INSTALLED_APPS = [
 
 # Middleware stack runs on every request/response
 MIDDLEWARE = [
+    "blog_project.instrumentation.PerformanceMiddleware",         # Sampled request timing (first, to time the whole stack)
     "django.middleware.security.SecurityMiddleware",               # Security headers
     "whitenoise.middleware.WhiteNoiseMiddleware",                 # Serves static files in production-ish setups
+    "blog_project.routers.ReplicaRoutingMiddleware",               # Read-replica routing / pin-after-write
+    "blog_project.pagecache.PageCacheMiddleware",                 # Full-page cache for anonymous GETs (before sessions/auth)
     "django.contrib.sessions.middleware.SessionMiddleware",       # Session cookie handling
     "django.middleware.common.CommonMiddleware",                  # Useful defaults like APPEND_SLASH
     "django.middleware.csrf.CsrfViewMiddleware",                  # CSRF protection
@@ -71,6 +74,11 @@ TEMPLATES = [
     }
 ]
 
+# Compile every template under templates/ when wsgi.py/asgi.py load the
+# application, instead of during the first requests (blog_project/warmup.py).
+# Off here, on by default in production.
+TEMPLATE_WARMUP = env.bool("TEMPLATE_WARMUP", default=False)
+
 # WSGI application path; the callable used by WSGI servers
 WSGI_APPLICATION = "blog_project.wsgi.application"
 
@@ -78,6 +86,14 @@ WSGI_APPLICATION = "blog_project.wsgi.application"
 DATABASES = {
     "default": env.db(default=f"sqlite:///{BASE_DIR / 'db.sqlite3'}")
 }
+# Optional read replica: GET requests to the public post/category views read
+# from it (blog_project/routers.py). A client that wrote something reads from
+# the primary for DATABASE_REPLICA_PIN_SECONDS afterwards.
+if env.str("DATABASE_REPLICA_URL", default=""):
+    DATABASES["replica"] = env.db("DATABASE_REPLICA_URL")
+    DATABASES["replica"]["TEST"] = {"MIRROR": "default"}          # tests: same data as default
+DATABASE_ROUTERS = ["blog_project.routers.ReplicaRouter"]
+DATABASE_REPLICA_PIN_SECONDS = env.int("DATABASE_REPLICA_PIN_SECONDS", default=15)
 
 # Password validation (Django's recommended validators)
 AUTH_PASSWORD_VALIDATORS = [
@@ -104,18 +120,108 @@ USE_TZ = True
 # Static files (CSS, JavaScript, Images)
 STATIC_URL = "/static/"
 # Directory where static files will be collected to (for production)
-STATIC_ROOT = BASE_DIR / "staticfiles"
-# Additional static sources for development
+STATIC_ROOT = Path(env.str("STATIC_ROOT", default=str(BASE_DIR / "staticfiles")))
+# Additional static sources for development (static/css/blog.css, the shared stylesheet)
 STATICFILES_DIRS = [BASE_DIR / "static"]
+# Storage backends. Development and tests serve static files under their own
+# names; production settings swap in WhiteNoise's hashed, pre-compressed storage.
+STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+}
 
 
 # Media files (user-uploaded content)
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
 
+# Avatar renditions (accounts/avatars.py): square sizes in px, worker threads,
+# and whether to generate them in the background (False = inline, after commit)
+ACCOUNTS_AVATAR_SIZES = (64, 128, 256)
+ACCOUNTS_AVATAR_WORKERS = env.int("ACCOUNTS_AVATAR_WORKERS", default=2)
+ACCOUNTS_AVATAR_ASYNC = env.bool("ACCOUNTS_AVATAR_ASYNC", default=True)
+
+# Request instrumentation (blog_project/instrumentation.py): fraction of requests
+# to measure (0.0 = off, 1.0 = all), and whether measured responses carry a
+# Server-Timing header. Measurements are logged as JSON on the "blog.perf" logger.
+PERF_SAMPLE_RATE = env.float("PERF_SAMPLE_RATE", default=0.0)
+PERF_SERVER_TIMING = env.bool("PERF_SERVER_TIMING", default=True)
+
+# Caches: "default" is a two-tier cache (blog_project/cache.py) with a small
+# per-process LRU in front of the shared "shared" backend. CACHE_URL selects
+# the shared backend, e.g. redis://localhost:6379/1; the default is an
+# in-process stand-in so tests and local runs need no server (production
+# settings require CACHE_URL).
+# L1 entries live at most CACHE_L1_TIMEOUT seconds (how long a change made by
+# another process can go unseen); 0 disables L1.
+CACHES = {
+    "default": {
+        "BACKEND": "blog_project.cache.TieredCache",
+        "LOCATION": "shared",
+        "OPTIONS": {
+            "L1_MAX_ENTRIES": env.int("CACHE_L1_MAX_ENTRIES", default=1000),
+            "L1_TIMEOUT": env.int("CACHE_L1_TIMEOUT", default=5),
+        },
+    },
+    "shared": env.cache("CACHE_URL", default="locmemcache://blog-shared"),
+}
+
+# Sessions are read from the cache and written through to the database.
+# They use the shared tier directly: a logout must be visible to every process
+# at once, not after an L1 entry expires.
+SESSION_ENGINE = "django.contrib.sessions.backends.cached_db"
+SESSION_CACHE_ALIAS = "shared"
+
 # Default primary key field type
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
+# Pagination mode for post lists: "offset" (?page=N) or "cursor" (keyset, ?cursor=<token>)
+POSTS_PAGINATION = env("POSTS_PAGINATION", default="offset")
+
+# Serve the post list/detail and category views with their async versions
+# (posts/async_views.py). Only pays off under an ASGI server (blog_project/asgi.py).
+POSTS_ASYNC_VIEWS = env.bool("POSTS_ASYNC_VIEWS", default=False)
+
+# Cache alias and lifetime (seconds) for rendered post-detail fragments (posts/cache.py)
+POSTS_CACHE_ALIAS = env("POSTS_CACHE_ALIAS", default="default")
+POSTS_DETAIL_CACHE_TIMEOUT = env.int("POSTS_DETAIL_CACHE_TIMEOUT", default=60 * 15)
+
+# Sitemaps (posts/sitemaps.py): output directory and the absolute origin used in <loc>.
+# The files are served by posts.sitemaps.serve_file at /sitemap.xml and
+# /sitemaps/*.xml, looked up per request, so rebuilds need no restart.
+POSTS_SITEMAP_ROOT = BASE_DIR / "public"
+SITE_URL = env("SITE_URL", default="http://localhost:8000")
+
+# Cached RSS/Atom documents are replaced whenever a post changes; this TTL only
+# bounds how long superseded copies linger in the cache
+POSTS_FEED_CACHE_TIMEOUT = env.int("POSTS_FEED_CACHE_TIMEOUT", default=60 * 60 * 24)
+
+# PostgreSQL text-search configuration (stemming language) for post search (posts/search.py)
+POSTS_SEARCH_CONFIG = env("POSTS_SEARCH_CONFIG", default="english")
+
+# Related posts shown on the detail page (posts/related.py): how many are
+# precomputed per post, and the weight of a shared category / tag
+POSTS_RELATED_COUNT = env.int("POSTS_RELATED_COUNT", default=5)
+POSTS_RELATED_WEIGHTS = {
+    "categories": env.float("POSTS_RELATED_CATEGORY_WEIGHT", default=0.5),
+    "tags": env.float("POSTS_RELATED_TAG_WEIGHT", default=1.0),
+}
+# Most recent posts of each label a post is compared with, which bounds the
+# cost of scoring posts in very large categories / tags
+POSTS_RELATED_CANDIDATES = env.int("POSTS_RELATED_CANDIDATES", default=200)
+
+# Site-wide tag cloud (posts/tagcloud.py): most used tags shown, and the number
+# of weight buckets (CSS classes tag-cloud-1 .. tag-cloud-N)
+POSTS_TAG_CLOUD_SIZE = env.int("POSTS_TAG_CLOUD_SIZE", default=50)
+POSTS_TAG_CLOUD_LEVELS = env.int("POSTS_TAG_CLOUD_LEVELS", default=5)
+
+# Full-page cache for anonymous GET requests (blog_project/pagecache.py), purged
+# by surrogate key. Pages are large, so they skip the per-process L1 tier and go
+# straight to the shared cache. Off here, on by default in production.
+PAGE_CACHE_ENABLED = env.bool("PAGE_CACHE_ENABLED", default=False)
+PAGE_CACHE_ALIAS = env("PAGE_CACHE_ALIAS", default="shared")
+PAGE_CACHE_TIMEOUT = env.int("PAGE_CACHE_TIMEOUT", default=60 * 10)
+
 # Where to redirect after successful login
 LOGIN_REDIRECT_URL = "/"
 # Where to redirect after logout
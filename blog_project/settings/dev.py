@@ -16,6 +16,9 @@ ALLOWED_HOSTS = ["127.0.0.1", "localhost"]
 # Use in-memory email backend for development & tests so emails are captured in django.core.mail.outbox
 EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
 
+# Measure every request while developing (Server-Timing shows up in browser dev tools)
+PERF_SAMPLE_RATE = env.float("PERF_SAMPLE_RATE", default=1.0)
+
 # Optionally add development-specific apps (debug toolbar etc.) here:
 # INSTALLED_APPS += ["debug_toolbar"]
 # MIDDLEWARE = ["debug_toolbar.middleware.DebugToolbarMiddleware"] + MIDDLEWARE
@@ -0,0 +1,74 @@
+# blog_project/warmup.py
+"""
+Template warm-up at process start.
+
+With the cached template loader (explicit in production settings), a template
+is found and compiled once per process, on the first request that renders it,
+and reused afterwards. warm_up() moves that work to start-up: wsgi.py and
+asgi.py call it once the application is loaded, and it compiles every
+template under the DIRS of each Django template engine (the project's
+templates/ directory), so the first requests served by a worker render from
+the cache. When gunicorn preloads the application, the compiled templates are
+built once in the master and shared by the forked workers.
+
+Engines without a cached loader are skipped: they would compile the templates
+again on every request anyway. A template that fails to compile is logged
+and left out; the request that renders it will raise as usual.
+"""
+
+import logging
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.template import TemplateSyntaxError, engines
+from django.template.backends.django import DjangoTemplates
+from django.template.loaders.cached import Loader as CachedLoader
+
+logger = logging.getLogger("blog.startup")
+
+
+def template_names(engine):
+    """
+    Names of every file under the engine's DIRS, relative to its directory.
+    """
+    names = set()
+    for directory in map(Path, engine.dirs):
+        if directory.is_dir():
+            names.update(
+                path.relative_to(directory).as_posix() for path in directory.rglob("*") if path.is_file()
+            )
+    return sorted(names)
+
+
+def caches_templates(engine):
+    return any(isinstance(loader, CachedLoader) for loader in engine.engine.template_loaders)
+
+
+def warm_templates():
+    """
+    Compile the templates of every Django engine with a cached loader.
+    Returns (templates compiled, seconds taken).
+    """
+    started = time.perf_counter()
+    compiled = 0
+    for engine in engines.all():
+        if not isinstance(engine, DjangoTemplates) or not caches_templates(engine):
+            continue
+        for name in template_names(engine.engine):
+            try:
+                engine.get_template(name)
+            except TemplateSyntaxError:
+                logger.exception("Template %s failed to compile during warm-up", name)
+            else:
+                compiled += 1
+    return compiled, time.perf_counter() - started
+
+
+def warm_up():
+    """
+    Start-up hook for wsgi.py/asgi.py: warm the templates if TEMPLATE_WARMUP.
+    """
+    if getattr(settings, "TEMPLATE_WARMUP", False):
+        compiled, seconds = warm_templates()
+        logger.info("Compiled %d templates in %.1f ms", compiled, seconds * 1000)
@@ -13,3 +13,8 @@ os.environ.setdefault("DJANGO_SETTINGS_MODULE", "blog_project.settings.prod")
 
 # Get the WSGI application for use by WSGI servers like Gunicorn or uWSGI
 application = get_wsgi_application()
+
+# Compile the templates now instead of during the first requests (TEMPLATE_WARMUP)
+from blog_project.warmup import warm_up  # noqa: E402  (needs the app registry loaded above)
+
+warm_up()
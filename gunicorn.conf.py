@@ -0,0 +1,116 @@
+# gunicorn.conf.py
+"""
+Gunicorn configuration for production, read from the environment (and .env).
+
+Gunicorn loads this file from the working directory, so from the project root:
+    gunicorn
+serves the site with the settings below. Command-line options still win
+(e.g. `gunicorn --workers 3`).
+
+Environment:
+  GUNICORN_WORKER_CLASS   "gthread" (default): blog_project.wsgi in threaded sync
+                          workers; "uvicorn": blog_project.asgi in uvicorn workers
+                          (pair with POSTS_ASYNC_VIEWS=True for the async views).
+                          blog_project.asgi forces DB_CONN_MAX_AGE=0: persistent
+                          connections are unsafe under ASGI, use DB_POOL=True
+                          to reuse connections
+  WEB_CONCURRENCY         worker processes. Default from the CPUs this process may
+                          run on: 2 x CPUs + 1 for gthread (threads wait on the
+                          database), one per CPU for uvicorn (an event loop keeps
+                          its CPU busy on its own)
+  GUNICORN_THREADS        threads per gthread worker (default 4)
+  GUNICORN_PRELOAD        import the application once in the master and fork the
+                          workers from it (default True): faster boots, memory
+                          shared copy-on-write, warmed templates inherited
+                          (blog_project/warmup.py). Database connections opened
+                          in the master are closed before forking and dropped in
+                          each worker after it (blog_project/db/).
+  GUNICORN_MAX_REQUESTS   recycle a worker after this many requests (default 1000,
+                          0 = never), plus a random GUNICORN_MAX_REQUESTS_JITTER
+                          (default 100) so workers do not all restart together
+  GUNICORN_KEEPALIVE      seconds an idle client connection stays open (default 75).
+                          Behind a reverse proxy that reuses upstream connections
+                          (nginx keepalive, load balancers with a 60 s idle
+                          timeout), gunicorn must outlast the proxy: if gunicorn
+                          closes first, the proxy can send a request down a dying
+                          connection and answer 502.
+  GUNICORN_TIMEOUT        seconds before a silent worker is killed (default 30),
+  GUNICORN_GRACEFUL_TIMEOUT  and allowed to finish its requests on restart (default 30)
+  GUNICORN_BIND           address to listen on (default 0.0.0.0:$PORT, PORT=8000)
+  GUNICORN_FORWARDED_ALLOW_IPS  proxies trusted for X-Forwarded-* (default 127.0.0.1)
+
+Each gthread worker thread holds its own database connection: with the
+connection pool (DB_POOL=True), size DB_POOL_MAX_SIZE to GUNICORN_THREADS.
+"""
+
+import os
+from pathlib import Path
+
+import environ
+
+BASE_DIR = Path(__file__).resolve().parent
+env = environ.Env()
+environ.Env.read_env(os.path.join(BASE_DIR, ".env"))
+
+# Worker class -> (gunicorn worker class, application)
+WORKER_CLASSES = {
+    "gthread": ("gthread", "blog_project.wsgi:application"),
+    "uvicorn": ("uvicorn.workers.UvicornWorker", "blog_project.asgi:application"),
+}
+
+
+def available_cpus():
+    """
+    CPUs this process may run on (respects CPU affinity, e.g. container cpusets).
+    """
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def default_workers(worker_choice, cpus):
+    return cpus if worker_choice == "uvicorn" else 2 * cpus + 1
+
+
+worker_choice = env.str("GUNICORN_WORKER_CLASS", default="gthread")
+if worker_choice not in WORKER_CLASSES:
+    raise RuntimeError(f"GUNICORN_WORKER_CLASS must be one of {', '.join(WORKER_CLASSES)}, not {worker_choice!r}")
+
+worker_class, wsgi_app = WORKER_CLASSES[worker_choice]
+workers = env.int("WEB_CONCURRENCY", default=default_workers(worker_choice, available_cpus()))
+threads = env.int("GUNICORN_THREADS", default=4)
+
+bind = env.str("GUNICORN_BIND", default=f"0.0.0.0:{env.int('PORT', default=8000)}")
+forwarded_allow_ips = env.str("GUNICORN_FORWARDED_ALLOW_IPS", default="127.0.0.1")
+
+preload_app = env.bool("GUNICORN_PRELOAD", default=True)
+max_requests = env.int("GUNICORN_MAX_REQUESTS", default=1000)
+max_requests_jitter = env.int("GUNICORN_MAX_REQUESTS_JITTER", default=100)
+keepalive = env.int("GUNICORN_KEEPALIVE", default=75)
+timeout = env.int("GUNICORN_TIMEOUT", default=30)
+graceful_timeout = env.int("GUNICORN_GRACEFUL_TIMEOUT", default=30)
+
+# Worker heartbeat files on tmpfs when there is one (a disk-backed /tmp can stall them)
+if os.path.isdir("/dev/shm"):
+    worker_tmp_dir = "/dev/shm"
+
+
+def when_ready(server):
+    """
+    Master, after preloading and before the first fork: close what the
+    application opened while loading.
+    """
+    if server.cfg.preload_app:
+        from blog_project.db import close_before_fork
+
+        close_before_fork()
+
+
+def post_fork(server, worker):
+    """
+    New worker: forget database connections inherited from the master.
+    """
+    if server.cfg.preload_app:
+        from blog_project.db import forget_after_fork
+
+        forget_after_fork()
@@ -1,18 +1,19 @@
 # posts/admin.py
 from django.contrib import admin
 from .models import Post, Category, Tag
+from . import search
 
 @admin.register(Tag)
 class TagAdmin(admin.ModelAdmin):
-    # show name and slug in the admin list
-    list_display = ("name", "slug")
+    # show name, slug and post count in the admin list
+    list_display = ("name", "slug", "post_count")
     prepopulated_fields = {"slug": ("name",)}  # optional: auto-fill slug from name
     search_fields = ("name",)
 
 @admin.register(Category)
 class CategoryAdmin(admin.ModelAdmin):
-    # show name and slug in list view and enable search
-    list_display = ("name", "slug")
+    # show name, slug and post count in list view and enable search
+    list_display = ("name", "slug", "post_count")
     search_fields = ("name", "slug")
 
 
@@ -21,6 +22,15 @@ class PostAdmin(admin.ModelAdmin):
     # show key fields in admin list view
     list_display = ("title", "author", "created_at")
     prepopulated_fields = {"slug": ("title",)}  # auto-fill slug from title in admin
-    search_fields = ("title", "content", "author__username")
+    search_fields = ("title", "content", "author__username")  # enables the search box
     # allow selecting many-to-many categories in the admin list form
     filter_horizontal = ("categories","tags")
+
+    def get_search_results(self, request, queryset, search_term):
+        """
+        Use the full-text index (posts/search.py) instead of icontains scans
+        over search_fields.
+        """
+        if not search_term:
+            return queryset, False
+        return search.get_backend(queryset.db).filter(queryset, search_term), False
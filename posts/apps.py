@@ -11,3 +11,8 @@ class PostsConfig(AppConfig):
     """
     default_auto_field = "django.db.models.BigAutoField"  # Default PK field type for models
     name = "posts"                                       # Python path of the app (package name)
+
+    def ready(self):
+        # Import signals module to register cache-invalidation handlers.
+        # Import here to avoid AppRegistryNotReady errors at import time.
+        import posts.signals  # noqa: F401
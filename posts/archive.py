@@ -0,0 +1,124 @@
+# posts/archive.py
+# Month histogram for the date archive (ArchiveMonth rows).
+#
+# Archive navigation needs "how many posts in each month". Grouping the posts
+# table by month on every page view would scan it, so the counts are kept in
+# ArchiveMonth instead: the handlers in posts/signals.py move one row by one
+# when a post is created or deleted (created_at is set once, on insert), and
+# rebuild_histogram() recomputes every row in bulk (`manage.py
+# rebuild_archive_months`, also run after bulk imports).
+#
+# The histogram itself is cached with no timeout under posts:archive-months
+# (posts/cache.py) and dropped whenever a row changes, so the sidebar and the
+# month pages read it without a query. A month page then reads its posts as a
+# created_at range over the (created_at, id) index and takes its row count
+# from the histogram instead of a COUNT(*).
+
+from datetime import datetime
+
+from django.db import transaction
+from django.db.models import Count, F
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+from . import cache as post_cache
+from .models import ArchiveMonth, Post
+
+
+def month_of(moment):
+    """
+    (year, month) of an aware datetime, in the current time zone.
+    """
+    local = timezone.localtime(moment)
+    return local.year, local.month
+
+
+def month_bounds(year, month):
+    """
+    [start, end) of a calendar month as aware datetimes. Raises ValueError
+    for an impossible month.
+    """
+    start = timezone.make_aware(datetime(year, month, 1))
+    end = timezone.make_aware(datetime(year + 1, 1, 1) if month == 12 else datetime(year, month + 1, 1))
+    return start, end
+
+
+def adjust(moment, delta):
+    """
+    Add delta to the count of the month containing moment.
+    """
+    year, month = month_of(moment)
+    with transaction.atomic():
+        if delta > 0:
+            row, created = ArchiveMonth.objects.get_or_create(
+                year=year, month=month, defaults={"post_count": delta}
+            )
+            if not created:
+                ArchiveMonth.objects.filter(pk=row.pk).update(post_count=F("post_count") + delta)
+        else:
+            ArchiveMonth.objects.filter(year=year, month=month, post_count__gte=-delta).update(
+                post_count=F("post_count") + delta
+            )
+    post_cache.invalidate_archive_months()
+
+
+def count_months():
+    """
+    [(year, month, post count)] for every month with posts: one GROUP BY over
+    the posts table, for rebuilds only.
+    """
+    rows = (
+        Post.objects.order_by()
+        .annotate(month=TruncMonth("created_at"))
+        .values("month")
+        .annotate(count=Count("pk"))
+    )
+    return [(row["month"].year, row["month"].month, row["count"]) for row in rows]
+
+
+def rebuild_histogram():
+    """
+    Replace every ArchiveMonth row with counts recomputed from the posts.
+    Returns the number of months written. Callers should also call
+    post_cache.invalidate_archive_months().
+    """
+    months = count_months()
+    ArchiveMonth.objects.all().delete()
+    ArchiveMonth.objects.bulk_create(
+        [ArchiveMonth(year=year, month=month, post_count=count) for year, month, count in months]
+    )
+    return len(months)
+
+
+def build_histogram():
+    """
+    [{"year", "month", "count", "start"}] for every month with posts, newest
+    first (start is the month's first day, for date formatting).
+    """
+    return [
+        {"year": year, "month": month, "count": count, "start": datetime(year, month, 1).date()}
+        for year, month, count in ArchiveMonth.objects.filter(post_count__gt=0)
+        .order_by("-year", "-month")
+        .values_list("year", "month", "post_count")
+    ]
+
+
+def get_histogram():
+    """
+    The cached histogram, built on a miss (one query on the small ArchiveMonth table).
+    """
+    return post_cache.get_cache().get_or_set(post_cache.ARCHIVE_MONTHS_KEY, build_histogram, None)
+
+
+def locate(histogram, year, month):
+    """
+    (entry, older, newer) for a month of the histogram: its own entry and
+    the nearest months with posts on either side. entry is None if the month
+    has no posts.
+    """
+    for index, entry in enumerate(histogram):
+        if (entry["year"], entry["month"]) == (year, month):
+            older = histogram[index + 1] if index + 1 < len(histogram) else None
+            newer = histogram[index - 1] if index > 0 else None
+            return entry, older, newer
+    return None, None, None
@@ -0,0 +1,161 @@
+# posts/async_views.py
+# Async (ASGI-native) versions of the public read views.
+#
+# Selected with settings.POSTS_ASYNC_VIEWS (see posts/urls.py). Under an ASGI
+# server a sync view costs a thread hop per request; these views run in the
+# event loop and only leave it for the queries themselves (async ORM) and
+# for template rendering, which Django 4.2 still runs in a worker thread.
+#
+# Each view subclasses its sync counterpart in posts/views.py and reuses its
+# querysets, templates and context, with two rules:
+#   - every query is awaited before the context is built, so nothing lazy
+#     reaches get_context_data() (which runs in the event loop);
+#   - the conditional-GET validators come from the async functions in
+#     posts/conditional.py, because condition() cannot wrap async views.
+
+from calendar import timegm
+
+from django.http import Http404
+from django.utils.cache import get_conditional_response, quote_etag
+from django.utils.http import http_date
+from django.utils.translation import gettext as _
+from django.views.generic import View
+
+from . import cache as post_cache
+from . import conditional
+from .models import Post
+from .views import CategoryDetailView, CategoryListView, PostDetailView, PostListView, TagDetailView
+from blog_project.routers import primary_reads
+
+
+class AsyncConditionalMixin:
+    """
+    condition() for async views: answer If-None-Match / If-Modified-Since with
+    a 304 before respond() runs, and add ETag / Last-Modified to the response.
+    """
+
+    validators = None                              # async (request, **kwargs) -> (etag, last_modified)
+
+    def dispatch(self, request, *args, **kwargs):
+        # The sync parents wrap dispatch() in condition(), which cannot await
+        return View.dispatch(self, request, *args, **kwargs)
+
+    async def get(self, request, *args, **kwargs):
+        etag, last_modified = await self.validators(request, *args, **kwargs)
+        etag = quote_etag(etag) if etag else None
+        last_modified = timegm(last_modified.utctimetuple()) if last_modified else None
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = await self.respond(request, *args, **kwargs)
+        if last_modified and not response.has_header("Last-Modified"):
+            response.headers["Last-Modified"] = http_date(last_modified)
+        if etag:
+            response.headers.setdefault("ETag", etag)
+        return response
+
+    async def respond(self, request, *args, **kwargs):
+        raise NotImplementedError
+
+
+class AsyncSingleObjectMixin:
+    async def aget_object(self, queryset=None):
+        """
+        Async SingleObjectMixin.get_object() for the slug-addressed views.
+        """
+        if queryset is None:
+            queryset = self.get_queryset()
+        slug = self.kwargs.get(self.slug_url_kwarg)
+        try:
+            return await queryset.filter(**{self.get_slug_field(): slug}).aget()
+        except queryset.model.DoesNotExist:
+            raise Http404(
+                _("No %(verbose_name)s found matching the query")
+                % {"verbose_name": queryset.model._meta.verbose_name}
+            )
+
+
+class AsyncPostListView(AsyncConditionalMixin, PostListView):
+    """
+    Async PostListView: COUNT(*) (offset mode) and the page's rows, with their
+    prefetches, are fetched with the async ORM.
+    """
+
+    validators = staticmethod(conditional.apost_list_validators)
+
+    async def respond(self, request, *args, **kwargs):
+        self.object_list = self.get_queryset()
+        self.pagination = await self.apaginate_queryset(
+            self.object_list, self.get_paginate_by(self.object_list)
+        )
+        return self.render_to_response(self.get_context_data())
+
+    async def apaginate_queryset(self, queryset, page_size):
+        if self.use_cursor_pagination():
+            return await self.apaginate_by_cursor(queryset, page_size)
+        # With the count known, ListView's pagination (?page=, "last", 404 on
+        # a bad page) runs without queries; only the page slice is left to load
+        self.object_count = await queryset.acount()
+        paginator, page, object_list, is_paginated = super().paginate_queryset(queryset, page_size)
+        page.object_list = [post async for post in page.object_list]
+        return (paginator, page, page.object_list, is_paginated)
+
+    def get_paginator(self, queryset, per_page, **kwargs):
+        paginator = super().get_paginator(queryset, per_page, **kwargs)
+        paginator.count = self.object_count        # cached_property, counted in apaginate_queryset()
+        return paginator
+
+    def paginate_queryset(self, queryset, page_size):
+        return self.pagination
+
+
+class AsyncPostDetailView(AsyncConditionalMixin, AsyncSingleObjectMixin, PostDetailView):
+    """
+    Async PostDetailView: a fragment cache hit is two async cache reads; a
+    miss loads the post from the primary and stores its fragments.
+    """
+
+    validators = staticmethod(conditional.apost_detail_validators)
+
+    async def respond(self, request, *args, **kwargs):
+        cached = await post_cache.aload_detail(self.kwargs.get(self.slug_url_kwarg))
+        if cached is None:
+            with primary_reads():                  # see PostDetailView.get()
+                self.object = await self.aget_object()
+            fragments = await post_cache.astore_detail(self.object)
+        else:
+            self.object, fragments = cached
+        return self.render_to_response(
+            {"view": self, "post": self.object, "object": self.object, "fragments": fragments}
+        )
+
+
+class AsyncCategoryListView(CategoryListView):
+    async def get(self, request, *args, **kwargs):
+        self.object_list = [category async for category in self.get_queryset()]
+        return self.render_to_response(self.get_context_data())
+
+
+class AsyncCategoryDetailView(AsyncConditionalMixin, AsyncSingleObjectMixin, CategoryDetailView):
+    validators = staticmethod(conditional.acategory_validators)
+
+    async def respond(self, request, *args, **kwargs):
+        self.object = await self.aget_object()
+        posts = Post.objects.with_listing_data().filter(categories=self.object)
+        self.pagination = await self.apaginate_posts(posts, self.paginate_by)
+        return self.render_to_response(self.get_context_data(object=self.object))
+
+    def paginate_posts(self, queryset, page_size):
+        return self.pagination
+
+
+class AsyncTagDetailView(AsyncConditionalMixin, AsyncSingleObjectMixin, TagDetailView):
+    validators = staticmethod(conditional.atag_validators)
+
+    async def respond(self, request, *args, **kwargs):
+        self.object = await self.aget_object()
+        posts = Post.objects.with_listing_data().filter(tags=self.object)
+        self.pagination = await self.apaginate_posts(posts, self.paginate_by)
+        return self.render_to_response(self.get_context_data(object=self.object))
+
+    def paginate_posts(self, queryset, page_size):
+        return self.pagination
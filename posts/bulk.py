@@ -0,0 +1,296 @@
+# posts/bulk.py
+# Streaming bulk import/export of posts (used by the import_posts / export_posts commands).
+#
+# Record layout (one post per JSON line or CSV row):
+#   title, slug, content, author (username), created_at, updated_at (ISO 8601),
+#   categories, tags
+# Labels are {"slug": ..., "name": ...} objects in JSONL, and "slug:Name" items
+# joined with "|" in CSV.
+#
+# Both directions work in fixed-size chunks so memory stays flat regardless of
+# the number of posts: the importer writes each chunk with bulk_create (posts,
+# new labels, m2m link rows) and the exporter pages through posts by primary key.
+
+import csv
+import json
+from itertools import islice
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from . import archive, counters, related, search
+from . import cache as post_cache
+from .signals import refresh_pages
+from .models import Post, Category, Tag
+from blog_project import pagecache
+
+CSV_FIELDS = ["title", "slug", "content", "author", "created_at", "updated_at", "categories", "tags"]
+
+# Post m2m field -> label model
+LABEL_FIELDS = {"categories": Category, "tags": Tag}
+
+
+# --- record encoding ---------------------------------------------------------
+
+def parse_labels(value):
+    """
+    Normalise a label column to a list of (slug, name) pairs.
+    Accepts a list of dicts/strings (JSONL) or a "slug:Name|slug" string (CSV).
+    """
+    if not value:
+        return []
+    items = value.split("|") if isinstance(value, str) else value
+    labels = []
+    for item in items:
+        if isinstance(item, dict):
+            slug, name = item["slug"], item.get("name") or item["slug"]
+        else:
+            slug, _, name = str(item).partition(":")
+            name = name or slug
+        if slug:
+            labels.append((slug.strip(), name.strip()))
+    return labels
+
+
+def format_labels(labels, fmt):
+    """
+    Inverse of parse_labels() for the given output format.
+    """
+    if fmt == "csv":
+        return "|".join(f"{slug}:{name}" for slug, name in labels)
+    return [{"slug": slug, "name": name} for slug, name in labels]
+
+
+def read_records(stream, fmt):
+    """
+    Yield one dict per post from a JSONL or CSV text stream.
+    """
+    if fmt == "csv":
+        yield from csv.DictReader(stream)
+        return
+    for line in stream:
+        line = line.strip()
+        if line:
+            yield json.loads(line)
+
+
+def chunked(iterable, size):
+    """
+    Yield lists of up to `size` items without materialising the iterable.
+    """
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+# --- import -------------------------------------------------------------------
+
+class PostImporter:
+    """
+    Bulk-load posts chunk by chunk.
+    - authors and labels are resolved with in-memory slug/username -> id maps
+      filled one batch query at a time
+    - posts whose slug already exists, and records without a slug or title,
+      are skipped
+    - a label is matched to an existing one by slug, else by its unique name
+    - bulk_create bypasses Post.save() and signals, so rendered content is
+      filled in before insert, the search index and the related-posts lists
+      of the imported posts (and the lists they enter) are updated per chunk,
+      label counters and archive months are rebuilt once at the end, and the
+      list validators and feeds are invalidated
+    - with update_related=False the related-posts lists are left alone, for
+      imports followed by `manage.py rebuild_related_posts`
+    """
+
+    def __init__(self, chunk_size=1000, default_author=None, update_related=True):
+        self.chunk_size = chunk_size
+        self.default_author = default_author
+        self.update_related = update_related
+        self.author_ids = {}                            # username -> user id
+        self.label_ids = {field: {} for field in LABEL_FIELDS}  # field -> slug -> id
+        self.created = self.skipped = 0
+
+    def resolve_authors(self, usernames):
+        User = get_user_model()
+        missing = {name for name in usernames if name not in self.author_ids}
+        if missing:
+            lookup = {f"{User.USERNAME_FIELD}__in": missing}
+            for pk, username in User.objects.filter(**lookup).values_list("pk", User.USERNAME_FIELD):
+                self.author_ids[username] = pk
+
+    def resolve_labels(self, field, labels):
+        """
+        Make sure every (slug, name) in labels has an id in the map. Labels are
+        matched to existing ones by slug, then by name (names are unique too,
+        so a name stored under another slug is the same label); the rest are
+        created with one bulk_create.
+        """
+        model, ids = LABEL_FIELDS[field], self.label_ids[field]
+        wanted = {slug: name for slug, name in labels if slug not in ids}
+        if not wanted:
+            return
+        by_name = {}
+        existing = model.objects.filter(Q(slug__in=wanted) | Q(name__in=wanted.values()))
+        for pk, slug, name in existing.values_list("pk", "slug", "name"):
+            if slug in wanted:
+                ids[slug] = pk
+            by_name[name] = pk
+        new = {}                                        # name -> slug of the label to create
+        for slug, name in wanted.items():
+            if slug not in ids and name not in by_name:
+                new.setdefault(name, slug)
+        if new:
+            model.objects.bulk_create([model(slug=slug, name=name) for name, slug in new.items()])
+            by_name.update(model.objects.filter(slug__in=new.values()).values_list("name", "pk"))
+        for slug, name in wanted.items():
+            ids.setdefault(slug, by_name[name])
+
+    def import_chunk(self, records):
+        usernames = {r.get("author") or self.default_author for r in records}
+        usernames.add(self.default_author)
+        self.resolve_authors(usernames - {None})
+        existing = set(
+            Post.objects.filter(slug__in=[r.get("slug") for r in records]).values_list("slug", flat=True)
+        )
+
+        posts, links, now = [], [], timezone.now()
+        for record in records:
+            slug = record.get("slug")
+            author_id = self.author_ids.get(record.get("author")) or self.author_ids.get(self.default_author)
+            if not slug or not record.get("title") or slug in existing or author_id is None:
+                self.skipped += 1
+                continue
+            existing.add(slug)                           # duplicate slugs within the file
+            created_at = parse_datetime(record.get("created_at") or "") or now
+            post = Post(
+                title=record["title"],
+                slug=slug,
+                content=record.get("content", ""),
+                author_id=author_id,
+                created_at=created_at,
+                updated_at=parse_datetime(record.get("updated_at") or "") or created_at,
+            )
+            post.render_content()                       # bulk_create skips Post.save()
+            posts.append(post)
+            links.append({field: parse_labels(record.get(field)) for field in LABEL_FIELDS})
+
+        if not posts:
+            return
+        for field in LABEL_FIELDS:
+            self.resolve_labels(field, [label for post_links in links for label in post_links[field]])
+
+        # auto_now/auto_now_add stamp the insert time on each instance during
+        # bulk_create; bulk_update (which skips pre_save) then writes the
+        # imported timestamps back, without touching the shared model fields
+        timestamps = [(post.created_at, post.updated_at) for post in posts]
+        Post.objects.bulk_create(posts, batch_size=self.chunk_size)
+        if any(post.pk is None for post in posts):
+            # Backends that cannot return ids from a bulk insert
+            pks = dict(Post.objects.filter(slug__in=[p.slug for p in posts]).values_list("slug", "pk"))
+            for post in posts:
+                post.pk = pks[post.slug]
+        for post, (created_at, updated_at) in zip(posts, timestamps):
+            post.created_at, post.updated_at = created_at, updated_at
+        Post.objects.bulk_update(posts, ["created_at", "updated_at"], batch_size=self.chunk_size)
+
+        for field, model in LABEL_FIELDS.items():
+            through = getattr(Post, field).through
+            column = f"{model._meta.model_name}_id"
+            rows = [
+                through(post_id=post.pk, **{column: self.label_ids[field][slug]})
+                for post, post_links in zip(posts, links)
+                for slug, _ in post_links[field]
+            ]
+            through.objects.bulk_create(rows, batch_size=self.chunk_size, ignore_conflicts=True)
+
+        post_ids = [post.pk for post in posts]
+        backend = search.get_backend(Post.objects.db)
+        for batch in related.batches(post_ids):
+            backend.index_posts(batch)
+        if self.update_related:
+            # Existing posts whose list gained an imported post show it on their page
+            refresh_pages(set(related.refresh_posts(post_ids)) - set(post_ids))
+        self.created += len(posts)
+
+    def run(self, records):
+        """
+        Import an iterable of records; each chunk commits on its own.
+        """
+        for chunk in chunked(records, self.chunk_size):
+            with transaction.atomic():
+                self.import_chunk(chunk)
+        with transaction.atomic():
+            counters.rebuild_counts()
+            archive.rebuild_histogram()
+        post_cache.invalidate_archive_months()
+        # No signals ran for the imported posts. Their preserved updated_at can
+        # be older than MAX(updated_at), so list validators need the stamp too.
+        post_cache.mark_lists_changed()
+        post_cache.bump_feeds_version()
+        pagecache.purge_all()
+        return self.created, self.skipped
+
+
+# --- export -------------------------------------------------------------------
+
+def iter_export_records(fmt, chunk_size=1000):
+    """
+    Yield one record per post, paging by primary key (no OFFSET, no server-side
+    cursor). Label names are loaded once; links are fetched per chunk.
+    """
+    User = get_user_model()
+    label_names = {
+        field: {pk: (slug, name) for pk, slug, name in model.objects.values_list("pk", "slug", "name")}
+        for field, model in LABEL_FIELDS.items()
+    }
+    columns = ("pk", "title", "slug", "content", f"author__{User.USERNAME_FIELD}", "created_at", "updated_at")
+    last_pk = 0
+    while True:
+        rows = list(
+            Post.objects.filter(pk__gt=last_pk).order_by("pk").values_list(*columns)[:chunk_size]
+        )
+        if not rows:
+            return
+        post_ids = [row[0] for row in rows]
+        links = {field: {} for field in LABEL_FIELDS}
+        for field, model in LABEL_FIELDS.items():
+            through = getattr(Post, field).through
+            column = f"{model._meta.model_name}_id"
+            for post_id, label_id in through.objects.filter(post_id__in=post_ids).values_list("post_id", column):
+                links[field].setdefault(post_id, []).append(label_names[field][label_id])
+        for pk, title, slug, content, author, created_at, updated_at in rows:
+            yield {
+                "title": title,
+                "slug": slug,
+                "content": content,
+                "author": author,
+                "created_at": created_at.isoformat(),
+                "updated_at": updated_at.isoformat(),
+                "categories": format_labels(links["categories"].get(pk, []), fmt),
+                "tags": format_labels(links["tags"].get(pk, []), fmt),
+            }
+        last_pk = post_ids[-1]
+
+
+def write_records(stream, records, fmt):
+    """
+    Write records to a text stream as JSONL or CSV. Returns the number written.
+    """
+    count = 0
+    if fmt == "csv":
+        writer = csv.DictWriter(stream, fieldnames=CSV_FIELDS)
+        writer.writeheader()
+        for record in records:
+            writer.writerow(record)
+            count += 1
+        return count
+    for record in records:
+        stream.write(json.dumps(record, ensure_ascii=False) + "\n")
+        count += 1
+    return count
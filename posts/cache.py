@@ -0,0 +1,317 @@
+# posts/cache.py
+# Rendered-fragment cache for PostDetailView.
+#
+# Layout in the cache (alias settings.POSTS_CACHE_ALIAS):
+#   posts:slug:<slug>   -> post id             (lets a hit skip the slug lookup)
+#   posts:detail:<id>   -> dict of rendered fragments plus the post's
+#                          title/slug/updated_at at render time
+#   posts:lists-changed -> unix time a list last changed without a newer
+#                          updated_at (a post deleted, or its categories/tags
+#                          changed); see posts/conditional.py
+#   posts:changed:<id>  -> unix time the post's page last changed without a
+#                          Post.save() (labels, related posts); folded into its
+#                          detail validators, so updated_at stays the content time
+#   posts:sidebar-changed -> unix time the sidebar (tag cloud, archive months) last changed;
+#                          folded into every page validator, see posts/conditional.py
+#   posts:feeds-version -> generation number of the cached feed documents
+#   posts:feed:<generation>:<name> -> serialized RSS/Atom document (posts/feeds.py)
+#   posts:tag-cloud     -> weighted site-wide tag cloud (posts/tagcloud.py)
+#   posts:archive-months -> month histogram for archive navigation (posts/archive.py)
+# Entries are evicted by the signal handlers in posts/signals.py whenever the
+# post, its categories or its tags change.
+#
+# The a-prefixed functions are the async equivalents used by
+# posts/async_views.py (same keys, Django's async cache API).
+
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.template.defaultfilters import truncatechars
+from django.template.loader import render_to_string
+from django.urls import reverse
+from django.utils.dateparse import parse_datetime
+from django.utils.safestring import mark_safe
+
+from blog_project import pagecache
+
+from . import related, surrogates
+
+
+def get_cache():
+    """
+    Return the cache backend configured for the posts app.
+    """
+    return caches[getattr(settings, "POSTS_CACHE_ALIAS", "default")]
+
+
+def get_timeout():
+    """
+    Lifetime (seconds) of cached detail fragments.
+    """
+    return getattr(settings, "POSTS_DETAIL_CACHE_TIMEOUT", 60 * 15)
+
+
+LISTS_CHANGED_KEY = "posts:lists-changed"
+SIDEBAR_CHANGED_KEY = "posts:sidebar-changed"
+FEEDS_VERSION_KEY = "posts:feeds-version"
+TAG_CLOUD_KEY = "posts:tag-cloud"
+ARCHIVE_MONTHS_KEY = "posts:archive-months"
+
+
+def slug_key(slug):
+    return f"posts:slug:{slug}"
+
+
+def detail_key(post_id):
+    return f"posts:detail:{post_id}"
+
+
+def changed_key(post_id):
+    return f"posts:changed:{post_id}"
+
+
+class CachedPost:
+    """
+    Lightweight stand-in for a Post on a cache hit.
+    Carries only the attributes the detail template and views read.
+    """
+
+    def __init__(self, pk, slug, title, updated_at):
+        self.pk = self.id = pk
+        self.slug = slug
+        self.title = title
+        self.updated_at = updated_at
+
+    def __str__(self):
+        return self.title
+
+    def get_absolute_url(self):
+        return reverse("posts:post-detail", kwargs={"slug": self.slug})
+
+
+def render_detail_fragments(post, related_posts):
+    """
+    Render the expensive parts of post_detail.html for one post:
+      - description: meta description (first 150 chars of the stored excerpt)
+      - article: title, byline and the pre-rendered body (Post.content_html)
+      - categories: the category links block
+      - related: links to the precomputed related posts (posts/related.py)
+    """
+    return {
+        "description": truncatechars(post.excerpt, 150),
+        "article": render_to_string("posts/_post_article.html", {"post": post}),
+        "categories": render_to_string("posts/_post_categories.html", {"post": post}),
+        "related": render_to_string("posts/_post_related.html", {"related_posts": related_posts}),
+    }
+
+
+def detail_entries(post, fragments):
+    """
+    Cache entries written for a post's fragments: {key: value}.
+    """
+    return {
+        slug_key(post.slug): post.pk,
+        detail_key(post.pk): {
+            "pk": post.pk,
+            "slug": post.slug,
+            "title": post.title,
+            "updated_at": post.updated_at.isoformat(),
+            "fragments": fragments,
+        },
+    }
+
+
+def store_detail(post):
+    """
+    Render and cache the fragments for a post. Returns the fragments dict.
+    """
+    fragments = render_detail_fragments(post, related.related_posts(post))
+    get_cache().set_many(detail_entries(post, fragments), get_timeout())
+    return mark_fragments_safe(fragments)
+
+
+async def astore_detail(post):
+    """
+    Async store_detail(). The post's author and categories must already be
+    loaded: rendering runs in the event loop and cannot query.
+    """
+    fragments = render_detail_fragments(post, await related.arelated_posts(post))
+    await get_cache().aset_many(detail_entries(post, fragments), get_timeout())
+    return mark_fragments_safe(fragments)
+
+
+def cached_detail(slug, entry):
+    """
+    (CachedPost, fragments) from a detail entry, or None if it belongs to
+    another slug (the slug pointer outlived a rename).
+    """
+    if entry is None or entry["slug"] != slug:
+        return None
+    post = CachedPost(
+        entry["pk"], entry["slug"], entry["title"], parse_datetime(entry["updated_at"])
+    )
+    return post, mark_fragments_safe(entry["fragments"])
+
+
+def load_detail(slug):
+    """
+    Return (CachedPost, fragments) for a slug, or None on a miss.
+    Never touches the database.
+    """
+    cache = get_cache()
+    post_id = cache.get(slug_key(slug))
+    if post_id is None:
+        return None
+    return cached_detail(slug, cache.get(detail_key(post_id)))
+
+
+async def aload_detail(slug):
+    """
+    Async load_detail().
+    """
+    cache = get_cache()
+    post_id = await cache.aget(slug_key(slug))
+    if post_id is None:
+        return None
+    return cached_detail(slug, await cache.aget(detail_key(post_id)))
+
+
+def mark_fragments_safe(fragments):
+    """
+    Rendered HTML fragments are already escaped; the plain-text description is not.
+    """
+    return {
+        "description": fragments["description"],
+        "article": mark_safe(fragments["article"]),
+        "categories": mark_safe(fragments["categories"]),
+        "related": mark_safe(fragments.get("related", "")),   # absent from entries cached before it existed
+    }
+
+
+def invalidate_posts(post_ids=(), slugs=()):
+    """
+    Evict cached fragments for the given post ids and slug pointers, and
+    purge the cached pages of those posts.
+    """
+    keys = [detail_key(pk) for pk in post_ids] + [slug_key(slug) for slug in slugs if slug]
+    if keys:
+        get_cache().delete_many(keys)
+    pagecache.purge(surrogates.post(pk) for pk in post_ids)
+
+
+def mark_lists_changed():
+    """
+    Record that lists changed without a newer updated_at (a post was removed,
+    or relabelled). MAX(updated_at) cannot see that, so list validators
+    combine it with this stamp.
+    """
+    get_cache().set(LISTS_CHANGED_KEY, time.time(), None)
+
+
+def get_lists_changed():
+    """
+    Unix time of the last removal. If the stamp was evicted, start a new one
+    at "now", which conservatively treats every list as modified.
+    """
+    return get_cache().get_or_set(LISTS_CHANGED_KEY, time.time, None)
+
+
+async def aget_lists_changed():
+    """
+    Async get_lists_changed().
+    """
+    return await get_cache().aget_or_set(LISTS_CHANGED_KEY, time.time, None)
+
+
+def mark_posts_changed(post_ids):
+    """
+    Record that these posts' pages changed without a Post.save() (their
+    categories, tags or related posts). updated_at is left alone; the detail
+    validators combine it with this per-post stamp.
+    """
+    now = time.time()
+    get_cache().set_many({changed_key(pk): now for pk in post_ids}, None)
+
+
+def get_post_changed(post_id):
+    """
+    Unix time of the post's last page change; like get_lists_changed(), an
+    evicted (or never set) stamp starts at "now".
+    """
+    return get_cache().get_or_set(changed_key(post_id), time.time, None)
+
+
+async def aget_post_changed(post_id):
+    """
+    Async get_post_changed().
+    """
+    return await get_cache().aget_or_set(changed_key(post_id), time.time, None)
+
+
+def mark_sidebar_changed():
+    """
+    Record that the sidebar every page shares (templates/base.html) changed.
+    A page's own rows cannot see that, so every validator includes this stamp.
+    """
+    get_cache().set(SIDEBAR_CHANGED_KEY, time.time(), None)
+
+
+def get_sidebar_changed():
+    """
+    Unix time of the last sidebar change; like get_lists_changed(), an
+    evicted stamp restarts at "now".
+    """
+    return get_cache().get_or_set(SIDEBAR_CHANGED_KEY, time.time, None)
+
+
+async def aget_sidebar_changed():
+    """
+    Async get_sidebar_changed().
+    """
+    return await get_cache().aget_or_set(SIDEBAR_CHANGED_KEY, time.time, None)
+
+
+def get_feed_timeout():
+    """
+    Lifetime (seconds) of a cached feed document. Documents are replaced on
+    every post change anyway; the timeout only reclaims old generations.
+    """
+    return getattr(settings, "POSTS_FEED_CACHE_TIMEOUT", 60 * 60 * 24)
+
+
+def feed_key(version, name):
+    return f"posts:feed:{version}:{name}"
+
+
+def get_feeds_version():
+    """
+    Current feed generation. Every feed key embeds it, so bumping it retires
+    all cached feeds (site-wide, per category, per tag) with one write.
+    """
+    return get_cache().get_or_set(FEEDS_VERSION_KEY, time.time_ns, None)
+
+
+def bump_feeds_version():
+    """
+    A post was saved/deleted or relabelled: feeds must be regenerated.
+    """
+    get_cache().set(FEEDS_VERSION_KEY, time.time_ns(), None)
+
+
+def invalidate_tag_cloud():
+    """
+    A tag or a post-tag link changed: the cloud is rebuilt on next use.
+    """
+    get_cache().delete(TAG_CLOUD_KEY)
+    mark_sidebar_changed()
+    pagecache.purge([surrogates.TAG_CLOUD])
+
+
+def invalidate_archive_months():
+    """
+    A month's post count changed: the histogram is rebuilt on next use.
+    """
+    get_cache().delete(ARCHIVE_MONTHS_KEY)
+    mark_sidebar_changed()
+    pagecache.purge([surrogates.ARCHIVE_MONTHS])
@@ -0,0 +1,192 @@
+# posts/conditional.py
+# ETag / Last-Modified validators for the public post views.
+#
+# Used with django.views.decorators.http.condition(), so a request carrying
+# If-None-Match / If-Modified-Since gets a 304 before any template is rendered.
+# Each validator pair is computed with one query and memoised on the request,
+# so condition() calling both the etag and last_modified functions costs only
+# that one query.
+#
+# A post's page also changes when its categories, tags or related posts do,
+# which leaves updated_at (the content edit time) alone: the detail validators
+# add the post's own stamp from posts/cache.py, and list validators the
+# lists-changed stamp.
+#
+# Every page also renders the shared sidebar (tag cloud and archive months,
+# templates/base.html), which none of the page's own rows describe, so every
+# validator folds in the sidebar stamp from posts/cache.py as well.
+#
+# The async views (posts/async_views.py) cannot use condition(), which only
+# wraps sync views in Django 4.2; they await the a-prefixed functions at the
+# end of this module, which return the (etag, last_modified) pair directly.
+
+from datetime import datetime, timezone
+
+from django.db.models import Max
+
+from . import archive
+from . import cache as post_cache
+from .models import Post
+
+
+def _memoise(request, key, compute):
+    """
+    Compute a (etag, last_modified) pair once per request.
+    """
+    validators = request.__dict__.setdefault("_posts_validators", {})
+    if key not in validators:
+        validators[key] = compute()
+    return validators[key]
+
+
+def _list_validators(queryset):
+    """
+    Newest updated_at of a set of posts (one MAX() over the updated_at index),
+    combined with the cached lists-changed stamp so deletions and category/tag
+    changes also change the validators.
+    """
+    latest = queryset.order_by().aggregate(latest=Max("updated_at"))["latest"]
+    if latest is None:
+        return None, None
+    return _combine(latest, post_cache.get_lists_changed(), post_cache.get_sidebar_changed())
+
+
+def _combine(latest, *stamps):
+    """
+    (etag, last_modified) from a row timestamp and cached unix-time stamps.
+    """
+    etag = "-".join([str(latest.timestamp()), *(str(stamp) for stamp in stamps)])
+    return etag, max(latest, *(datetime.fromtimestamp(stamp, tz=timezone.utc) for stamp in stamps))
+
+
+def _detail_validators(slug):
+    """
+    updated_at of a single post, from the fragment cache when possible,
+    else via the unique slug index, with the post's page stamp.
+    """
+    cached = post_cache.load_detail(slug)
+    if cached is not None:
+        post = cached[0]
+        updated_at, pk = post.updated_at, post.pk
+    else:
+        row = Post.objects.filter(slug=slug).values_list("pk", "updated_at").first()
+        if row is None:
+            return None, None                      # let the view raise 404
+        pk, updated_at = row
+    etag, last_modified = _combine(
+        updated_at, post_cache.get_post_changed(pk), post_cache.get_sidebar_changed()
+    )
+    return f"{pk}-{etag}", last_modified
+
+
+def _month_posts(year, month):
+    """
+    Posts of one archive month; an impossible month matches nothing (the
+    view raises 404).
+    """
+    try:
+        start, end = archive.month_bounds(year, month)
+    except ValueError:
+        return Post.objects.none()
+    return Post.objects.filter(created_at__gte=start, created_at__lt=end)
+
+
+# --- functions passed to condition() ---------------------------------------
+
+def post_list_etag(request, *args, **kwargs):
+    return _memoise(request, "list", lambda: _list_validators(Post.objects.all()))[0]
+
+
+def post_list_last_modified(request, *args, **kwargs):
+    return _memoise(request, "list", lambda: _list_validators(Post.objects.all()))[1]
+
+
+def category_etag(request, slug, *args, **kwargs):
+    return _memoise(
+        request, "category", lambda: _list_validators(Post.objects.filter(categories__slug=slug))
+    )[0]
+
+
+def category_last_modified(request, slug, *args, **kwargs):
+    return _memoise(
+        request, "category", lambda: _list_validators(Post.objects.filter(categories__slug=slug))
+    )[1]
+
+
+def tag_etag(request, slug, *args, **kwargs):
+    return _memoise(
+        request, "tag", lambda: _list_validators(Post.objects.filter(tags__slug=slug))
+    )[0]
+
+
+def tag_last_modified(request, slug, *args, **kwargs):
+    return _memoise(
+        request, "tag", lambda: _list_validators(Post.objects.filter(tags__slug=slug))
+    )[1]
+
+
+def author_etag(request, username, *args, **kwargs):
+    return _memoise(
+        request, "author", lambda: _list_validators(Post.objects.filter(author__username=username))
+    )[0]
+
+
+def author_last_modified(request, username, *args, **kwargs):
+    return _memoise(
+        request, "author", lambda: _list_validators(Post.objects.filter(author__username=username))
+    )[1]
+
+
+def month_etag(request, year, month, *args, **kwargs):
+    return _memoise(request, "month", lambda: _list_validators(_month_posts(year, month)))[0]
+
+
+def month_last_modified(request, year, month, *args, **kwargs):
+    return _memoise(request, "month", lambda: _list_validators(_month_posts(year, month)))[1]
+
+
+def post_detail_etag(request, slug, *args, **kwargs):
+    return _memoise(request, "detail", lambda: _detail_validators(slug))[0]
+
+
+def post_detail_last_modified(request, slug, *args, **kwargs):
+    return _memoise(request, "detail", lambda: _detail_validators(slug))[1]
+
+
+# --- async validators (posts/async_views.py) --------------------------------
+
+async def _alist_validators(queryset):
+    latest = (await queryset.order_by().aaggregate(latest=Max("updated_at")))["latest"]
+    if latest is None:
+        return None, None
+    return _combine(
+        latest, await post_cache.aget_lists_changed(), await post_cache.aget_sidebar_changed()
+    )
+
+
+async def apost_list_validators(request, *args, **kwargs):
+    return await _alist_validators(Post.objects.all())
+
+
+async def acategory_validators(request, slug, *args, **kwargs):
+    return await _alist_validators(Post.objects.filter(categories__slug=slug))
+
+
+async def atag_validators(request, slug, *args, **kwargs):
+    return await _alist_validators(Post.objects.filter(tags__slug=slug))
+
+
+async def apost_detail_validators(request, slug, *args, **kwargs):
+    cached = await post_cache.aload_detail(slug)
+    if cached is not None:
+        post = cached[0]
+        pk, updated_at = post.pk, post.updated_at
+    else:
+        row = await Post.objects.filter(slug=slug).values_list("pk", "updated_at").afirst()
+        if row is None:
+            return None, None
+        pk, updated_at = row
+    etag, last_modified = _combine(
+        updated_at, await post_cache.aget_post_changed(pk), await post_cache.aget_sidebar_changed()
+    )
+    return f"{pk}-{etag}", last_modified
@@ -0,0 +1,107 @@
+# posts/counters.py
+# Denormalized Category.post_count / Tag.post_count.
+#
+# Counters move by F() expressions (one UPDATE, no read-modify-write race) from
+# the m2m_changed and pre_delete handlers in posts/signals.py.
+# rebuild_counts() recomputes every counter in bulk from the link tables
+# (`manage.py rebuild_post_counts`).
+
+from django.db.models import Count, F, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from . import cache as post_cache
+from .models import Post, Category, Tag
+
+# through model -> (label model, FK column name on the through model)
+RELATIONS = {
+    Post.categories.through: (Category, "category_id"),
+    Post.tags.through: (Tag, "tag_id"),
+}
+
+
+def adjust(model, label_ids, delta):
+    """
+    Add `delta` to post_count of each label in label_ids.
+    """
+    label_ids = list(label_ids)
+    if label_ids and delta:
+        model.objects.filter(pk__in=label_ids).update(post_count=F("post_count") + delta)
+
+
+def linked_label_ids(through, post_id, label_column, label_ids=None):
+    """
+    Label ids currently linked to a post (optionally restricted to label_ids).
+    """
+    links = through.objects.filter(post_id=post_id)
+    if label_ids is not None:
+        links = links.filter(**{f"{label_column}__in": label_ids})
+    return set(links.values_list(label_column, flat=True))
+
+
+def linked_post_ids(through, label_id, label_column, post_ids=None):
+    """
+    Post ids currently linked to a label (optionally restricted to post_ids).
+    """
+    links = through.objects.filter(**{label_column: label_id})
+    if post_ids is not None:
+        links = links.filter(post_id__in=post_ids)
+    return set(links.values_list("post_id", flat=True))
+
+
+def handle_m2m_change(sender, instance, action, reverse, pk_set):
+    """
+    Keep counters in step with a categories/tags m2m_changed signal.
+      - post_add: Django has already filtered pk_set down to new links.
+      - remove/clear: pk_set may name links that do not exist (or is None for
+        clear), so the links that really go away are captured in pre_*.
+    """
+    model, column = RELATIONS[sender]
+
+    if action in ("pre_remove", "pre_clear"):
+        wanted = None if action == "pre_clear" else pk_set
+        if reverse:
+            instance._removed_links = linked_post_ids(sender, instance.pk, column, wanted)
+        else:
+            instance._removed_links = linked_label_ids(sender, instance.pk, column, wanted)
+        return
+
+    if action == "post_add":
+        changed, delta = pk_set or set(), 1
+    elif action in ("post_remove", "post_clear"):
+        changed, delta = getattr(instance, "_removed_links", set()), -1
+    else:
+        return
+
+    if reverse:
+        # instance is the Category/Tag; `changed` holds post ids
+        adjust(model, [instance.pk], delta * len(changed))
+    else:
+        # instance is the Post; `changed` holds label ids
+        adjust(model, changed, delta)
+
+
+def handle_post_delete(post):
+    """
+    A post is about to be deleted; its link rows will cascade away without
+    m2m_changed, so decrement its categories and tags here.
+    """
+    for through, (model, column) in RELATIONS.items():
+        adjust(model, linked_label_ids(through, post.pk, column), -1)
+
+
+def rebuild_counts():
+    """
+    Recompute every Category/Tag post_count from the link tables.
+    One UPDATE ... SET post_count = (SELECT COUNT(*) ...) per model. The tag
+    cloud is weighted by these counts, so it is dropped too.
+    """
+    for through, (model, column) in RELATIONS.items():
+        per_label = (
+            through.objects.filter(**{column: OuterRef("pk")})
+            .order_by()
+            .values(column)
+            .annotate(total=Count("*"))
+            .values("total")
+        )
+        model.objects.update(post_count=Coalesce(Subquery(per_label), Value(0)))
+    post_cache.invalidate_tag_cloud()
@@ -0,0 +1,183 @@
+# posts/feeds.py
+# RSS 2.0 / Atom feeds of the latest posts: site-wide, per category and per tag.
+#
+# Aggregators poll feeds far more often than posts change, so each serialized
+# document is cached (see posts/cache.py) and served with an ETag and
+# Last-Modified header. A cached poll costs two cache reads and no database
+# query. The signal handlers in posts/signals.py bump the feed generation
+# whenever a post is saved, deleted or relabelled, and the next poll of each
+# feed regenerates it.
+
+import hashlib
+
+from django.contrib.syndication.views import Feed
+from django.http import HttpResponse
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils.cache import get_conditional_response
+from django.utils.feedgenerator import Atom1Feed, Rss201rev2Feed
+from django.utils.http import http_date, parse_http_date_safe, quote_etag
+
+from . import cache as post_cache
+from .models import Post, Category, Tag
+
+# Number of posts in each feed
+FEED_ITEMS = 20
+
+
+class LatestPostsFeed(Feed):
+    """
+    The newest posts on the site (RSS 2.0).
+    """
+    feed_type = Rss201rev2Feed
+    cache_name = "rss"
+    title = "My Blog"
+    description = "Latest posts"
+
+    def link(self):
+        return reverse("posts:post-list")
+
+    def items(self):
+        # with_listing_data(): author and labels preloaded, full body deferred
+        return Post.objects.with_listing_data().order_by("-created_at", "-id")[:FEED_ITEMS]
+
+    def item_title(self, post):
+        return post.title
+
+    def item_description(self, post):
+        return post.excerpt
+
+    def item_link(self, post):
+        return post.get_absolute_url()
+
+    def item_author_name(self, post):
+        return post.author.get_username()
+
+    def item_pubdate(self, post):
+        return post.created_at
+
+    def item_updateddate(self, post):
+        return post.updated_at
+
+    def item_categories(self, post):
+        return [label.name for label in post.categories.all()] + [label.name for label in post.tags.all()]
+
+
+class LatestPostsAtomFeed(LatestPostsFeed):
+    feed_type = Atom1Feed
+    cache_name = "atom"
+    subtitle = LatestPostsFeed.description
+
+
+class CategoryFeed(LatestPostsFeed):
+    """
+    The newest posts in one category (RSS 2.0).
+    """
+    cache_name = "category-rss"
+
+    def get_object(self, request, slug):
+        return get_object_or_404(Category, slug=slug)
+
+    def title(self, category):
+        return f"My Blog: {category.name}"
+
+    def description(self, category):
+        return category.description or f"Latest posts in {category.name}"
+
+    def link(self, category):
+        return category.get_absolute_url()
+
+    def items(self, category):
+        return (
+            category.posts.all().with_listing_data().order_by("-created_at", "-id")[:FEED_ITEMS]
+        )
+
+
+class CategoryAtomFeed(CategoryFeed):
+    feed_type = Atom1Feed
+    cache_name = "category-atom"
+
+    def subtitle(self, category):
+        return self.description(category)
+
+
+class TagFeed(LatestPostsFeed):
+    """
+    The newest posts with one tag (RSS 2.0).
+    """
+    cache_name = "tag-rss"
+
+    def get_object(self, request, slug):
+        return get_object_or_404(Tag, slug=slug)
+
+    def title(self, tag):
+        return f"My Blog: {tag.name}"
+
+    def description(self, tag):
+        return f"Latest posts tagged {tag.name}"
+
+    def link(self, tag):
+        return tag.get_absolute_url()
+
+    def items(self, tag):
+        return tag.posts.all().with_listing_data().order_by("-created_at", "-id")[:FEED_ITEMS]
+
+
+class TagAtomFeed(TagFeed):
+    feed_type = Atom1Feed
+    cache_name = "tag-atom"
+
+    def subtitle(self, tag):
+        return self.description(tag)
+
+
+def document_name(request, feed, slug):
+    """
+    Cache name of one feed document. Items carry absolute URLs, so the
+    scheme and host are part of it.
+    """
+    return f"{feed.cache_name}:{slug or ''}:{request.scheme}://{request.get_host()}"
+
+
+def render_document(request, feed, slug):
+    """
+    Serialize a feed and return the dict stored in the cache.
+    Raises Http404 for an unknown category/tag (nothing is cached then).
+    """
+    response = feed(request, slug=slug) if slug else feed(request)
+    content = response.content
+    return {
+        "content": content,
+        "content_type": response["Content-Type"],
+        "etag": quote_etag(hashlib.md5(content, usedforsecurity=False).hexdigest()),
+        "last_modified": parse_http_date_safe(response.get("Last-Modified", "")),
+    }
+
+
+def cached_feed(feed_class):
+    """
+    Build a view serving feed_class from the feed cache, answering
+    If-None-Match / If-Modified-Since with 304 Not Modified.
+    """
+    feed = feed_class()
+
+    def view(request, slug=None):
+        cache = post_cache.get_cache()
+        key = post_cache.feed_key(post_cache.get_feeds_version(), document_name(request, feed, slug))
+        document = cache.get(key)
+        if document is None:
+            document = render_document(request, feed, slug)
+            cache.set(key, document, post_cache.get_feed_timeout())
+
+        not_modified = get_conditional_response(
+            request, etag=document["etag"], last_modified=document["last_modified"]
+        )
+        if not_modified is not None:
+            return not_modified
+        response = HttpResponse(document["content"], content_type=document["content_type"])
+        response["ETag"] = document["etag"]
+        if document["last_modified"] is not None:
+            response["Last-Modified"] = http_date(document["last_modified"])
+        return response
+
+    return view
@@ -0,0 +1,32 @@
+# posts/management/commands/build_sitemaps.py
+# Write the sharded XML sitemaps to disk (see posts/sitemaps.py).
+# Only shards whose posts/categories changed since the last run are rewritten.
+
+from django.core.management.base import BaseCommand
+
+from posts.sitemaps import SHARD_SIZE, SitemapBuilder
+
+
+class Command(BaseCommand):
+    help = "Write sitemap.xml and its shards, rebuilding only the shards that changed."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--full", action="store_true",
+            help="Rewrite every shard, ignoring the manifest of the previous run.",
+        )
+        parser.add_argument(
+            "--root",
+            help="Output directory (default: settings.POSTS_SITEMAP_ROOT).",
+        )
+        parser.add_argument(
+            "--shard-size", type=int, default=SHARD_SIZE,
+            help="URLs per shard (default: %(default)s, the protocol maximum).",
+        )
+
+    def handle(self, *args, **options):
+        builder = SitemapBuilder(root=options["root"], shard_size=options["shard_size"])
+        rewritten, total = builder.build(full=options["full"])
+        self.stdout.write(
+            self.style.SUCCESS(f"Rewrote {rewritten} of {total} sitemap shard(s) in {builder.root}.")
+        )
@@ -0,0 +1,36 @@
+# posts/management/commands/export_posts.py
+# Stream every post to a JSONL or CSV file (see posts/bulk.py).
+
+from django.core.management.base import BaseCommand, CommandError
+
+from posts.bulk import iter_export_records, write_records
+
+
+class Command(BaseCommand):
+    help = "Export posts to a JSONL or CSV file ('-' for stdout), in chunks."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Output file, or '-' to write stdout.")
+        parser.add_argument(
+            "--format", choices=["jsonl", "csv"],
+            help="Output format (default: guessed from the file extension, else jsonl).",
+        )
+        parser.add_argument(
+            "--chunk-size", type=int, default=1000,
+            help="Posts fetched per query (default: %(default)s).",
+        )
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        fmt = options["format"] or ("csv" if path.endswith(".csv") else "jsonl")
+        try:
+            stream = self.stdout if path == "-" else open(path, "w", newline="", encoding="utf-8")
+        except OSError as exc:
+            raise CommandError(f"Cannot open {path}: {exc}")
+        try:
+            count = write_records(stream, iter_export_records(fmt, options["chunk_size"]), fmt)
+        finally:
+            if stream is not self.stdout:
+                stream.close()
+        if path != "-":
+            self.stdout.write(self.style.SUCCESS(f"Exported {count} post(s) to {path}."))
@@ -0,0 +1,52 @@
+# posts/management/commands/import_posts.py
+# Stream posts from a JSONL or CSV file into the database in bulk (see posts/bulk.py).
+
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from posts.bulk import PostImporter, read_records
+
+
+class Command(BaseCommand):
+    help = "Import posts from a JSONL or CSV file ('-' for stdin), in chunks."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Input file, or '-' to read stdin.")
+        parser.add_argument(
+            "--format", choices=["jsonl", "csv"],
+            help="Input format (default: guessed from the file extension, else jsonl).",
+        )
+        parser.add_argument(
+            "--chunk-size", type=int, default=1000,
+            help="Posts per bulk insert / transaction (default: %(default)s).",
+        )
+        parser.add_argument(
+            "--default-author",
+            help="Username to use when a record's author does not exist.",
+        )
+        parser.add_argument(
+            "--skip-related", action="store_true",
+            help="Leave related-posts lists alone (run rebuild_related_posts afterwards).",
+        )
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        fmt = options["format"] or ("csv" if path.endswith(".csv") else "jsonl")
+        importer = PostImporter(
+            chunk_size=options["chunk_size"],
+            default_author=options["default_author"],
+            update_related=not options["skip_related"],
+        )
+        try:
+            stream = sys.stdin if path == "-" else open(path, newline="", encoding="utf-8")
+        except OSError as exc:
+            raise CommandError(f"Cannot open {path}: {exc}")
+        try:
+            created, skipped = importer.run(read_records(stream, fmt))
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+        self.stdout.write(
+            self.style.SUCCESS(f"Imported {created} post(s), skipped {skipped}.")
+        )
@@ -0,0 +1,18 @@
+# posts/management/commands/rebuild_archive_months.py
+# Recompute the month histogram behind the date archive.
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from posts import archive
+from posts import cache as post_cache
+
+
+class Command(BaseCommand):
+    help = "Recompute the per-month post counts (ArchiveMonth) from the posts table."
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            written = archive.rebuild_histogram()
+        post_cache.invalidate_archive_months()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt archive months ({written} months)."))
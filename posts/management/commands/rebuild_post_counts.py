@@ -0,0 +1,16 @@
+# posts/management/commands/rebuild_post_counts.py
+# Recompute the denormalized Category/Tag post_count columns in bulk.
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from posts import counters
+
+
+class Command(BaseCommand):
+    help = "Recompute Category.post_count and Tag.post_count from the post link tables."
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            counters.rebuild_counts()
+        self.stdout.write(self.style.SUCCESS("Rebuilt category and tag post counts."))
@@ -0,0 +1,16 @@
+# posts/management/commands/rebuild_related_posts.py
+# Recompute every post's precomputed related-posts list.
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from posts import related
+
+
+class Command(BaseCommand):
+    help = "Recompute the related-posts lists of all posts from their categories and tags."
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            written = related.rebuild_all()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt related posts ({written} links)."))
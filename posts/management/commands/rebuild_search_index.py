@@ -0,0 +1,27 @@
+# posts/management/commands/rebuild_search_index.py
+# Repopulate the full-text search index (posts/search.py) from the posts table.
+
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, transaction
+
+from posts import search
+
+
+class Command(BaseCommand):
+    help = "Rebuild the full-text search index for all posts."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--database",
+            default=DEFAULT_DB_ALIAS,
+            help="Database alias to rebuild (default: %(default)s).",
+        )
+
+    def handle(self, *args, **options):
+        using = options["database"]
+        backend = search.get_backend(using)
+        with transaction.atomic(using=using):
+            backend.rebuild()
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt search index with {type(backend).__name__}.")
+        )
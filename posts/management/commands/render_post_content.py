@@ -0,0 +1,37 @@
+# posts/management/commands/render_post_content.py
+# Backfill / refresh the pre-rendered Post fields (content_html, excerpt,
+# word_count, reading_time) produced by posts/rendering.py.
+# bulk_update bypasses the signal handlers, so the caches holding the old
+# output (detail fragments, feeds, full pages) are evicted here.
+
+from django.core.management.base import BaseCommand
+
+from blog_project import pagecache
+from posts import cache as post_cache
+from posts.models import Post
+from posts.rendering import rerender_posts
+
+
+class Command(BaseCommand):
+    help = "Re-render content_html, excerpt, word count and reading time for posts."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--missing", action="store_true",
+            help="Only posts that have content but no rendered HTML yet.",
+        )
+        parser.add_argument(
+            "--chunk-size", type=int, default=500,
+            help="Posts per bulk update (default: %(default)s).",
+        )
+
+    def handle(self, *args, **options):
+        queryset = Post.objects.all()
+        if options["missing"]:
+            queryset = queryset.filter(content_html="").exclude(content="")
+        total, changed = rerender_posts(queryset, chunk_size=options["chunk_size"])
+        if changed:
+            post_cache.invalidate_posts(post_ids=changed)
+            post_cache.bump_feeds_version()
+            pagecache.purge_all()                       # lists show the excerpts
+        self.stdout.write(self.style.SUCCESS(f"Rendered {total} post(s), {len(changed)} changed."))
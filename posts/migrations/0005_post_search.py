@@ -0,0 +1,75 @@
+# Generated by Django 4.2.30 on 2026-10-17 03:58
+#
+# Full-text search index for posts (see posts/search.py):
+#   - PostgreSQL: GIN index on Post.search_vector, backfilled with weighted vectors
+#   - SQLite: FTS5 virtual table posts_post_fts, backfilled from existing posts
+
+import django.contrib.postgres.search
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import migrations
+
+FTS_TABLE = "posts_post_fts"
+GIN_INDEX = "post_search_vector_gin"
+
+
+def create_search_index(apps, schema_editor):
+    Post = apps.get_model("posts", "Post")
+    User = apps.get_model(settings.AUTH_USER_MODEL)
+    quote = schema_editor.quote_name
+    post_table, user_table = quote(Post._meta.db_table), quote(User._meta.db_table)
+    # Historical models drop USERNAME_FIELD, so its name comes from the live
+    # model; the columns come from the historical one.
+    post_pk, author_fk = quote(Post._meta.pk.column), quote(Post._meta.get_field("author").column)
+    user_pk = quote(User._meta.pk.column)
+    username = quote(User._meta.get_field(get_user_model().USERNAME_FIELD).column)
+    config = getattr(settings, "POSTS_SEARCH_CONFIG", "english")
+    vendor = schema_editor.connection.vendor
+
+    if vendor == "postgresql":
+        schema_editor.execute(
+            f"CREATE INDEX {GIN_INDEX} ON {post_table} USING gin (search_vector)"
+        )
+        schema_editor.execute(
+            f"UPDATE {post_table} AS p SET search_vector = "
+            "setweight(to_tsvector(%s::regconfig, coalesce(p.title, '')), 'A') || "
+            "setweight(to_tsvector(%s::regconfig, coalesce(p.content, '')), 'B') || "
+            f"setweight(to_tsvector(%s::regconfig, coalesce(u.{username}::text, '')), 'C') "
+            f"FROM {user_table} AS u WHERE u.{user_pk} = p.{author_fk}",
+            [config] * 3,
+        )
+    elif vendor == "sqlite":
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5("
+            "title, content, author, tokenize = 'porter unicode61')"
+        )
+        schema_editor.execute(
+            f"INSERT INTO {FTS_TABLE} (rowid, title, content, author) "
+            f"SELECT p.{post_pk}, p.title, p.content, u.{username} FROM {post_table} p "
+            f"JOIN {user_table} u ON u.{user_pk} = p.{author_fk}"
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        schema_editor.execute(f"DROP INDEX IF EXISTS {GIN_INDEX}")
+    elif vendor == "sqlite":
+        schema_editor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0004_post_created_id_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 4.2.30 on 2026-10-17 04:04
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_post_counts(apps, schema_editor):
+    """
+    Populate the new counters from the existing link tables.
+    """
+    Post = apps.get_model("posts", "Post")
+    for field_name, column in (("categories", "category_id"), ("tags", "tag_id")):
+        field = Post._meta.get_field(field_name)
+        through = field.remote_field.through
+        per_label = (
+            through.objects.filter(**{column: OuterRef("pk")})
+            .order_by()
+            .values(column)
+            .annotate(total=Count("*"))
+            .values("total")
+        )
+        field.related_model.objects.update(post_count=Coalesce(Subquery(per_label), Value(0)))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0006_post_updated_at_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='post_count',
+            field=models.PositiveIntegerField(db_index=True, default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='tag',
+            name='post_count',
+            field=models.PositiveIntegerField(db_index=True, default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_post_counts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,66 @@
+# Generated by Django 4.2.30 on 2026-10-17 04:20
+
+import math
+
+from django.db import migrations, models
+from django.utils.html import linebreaks
+from django.utils.text import Truncator
+
+# Frozen copy of posts/rendering.py as of this migration: the live module may
+# change, what this migration writes must not.
+EXCERPT_WORDS = 30
+WORDS_PER_MINUTE = 200
+RENDERED_FIELDS = ("content_html", "excerpt", "word_count", "reading_time")
+
+
+def backfill_rendered_content(apps, schema_editor):
+    """
+    Render content_html / excerpt / word_count / reading_time for existing
+    posts, 500 at a time by primary key.
+    """
+    Post = apps.get_model("posts", "Post")
+    last_pk = 0
+    while True:
+        chunk = list(Post.objects.filter(pk__gt=last_pk).order_by("pk").only("pk", "content")[:500])
+        if not chunk:
+            return
+        for post in chunk:
+            text = post.content or ""
+            words = len(text.split())
+            post.content_html = str(linebreaks(text, autoescape=True))
+            post.excerpt = Truncator(text).words(EXCERPT_WORDS, truncate=" …")
+            post.word_count = words
+            post.reading_time = math.ceil(words / WORDS_PER_MINUTE) if words else 0
+        Post.objects.bulk_update(chunk, RENDERED_FIELDS)
+        last_pk = chunk[-1].pk
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0007_label_post_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='content_html',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='excerpt',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='reading_time',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='word_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_rendered_content, migrations.RunPython.noop),
+    ]
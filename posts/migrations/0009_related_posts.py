@@ -0,0 +1,82 @@
+# Generated by Django 4.2.30 on 2026-10-17 04:43
+
+import heapq
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+# Frozen copy of posts/related.py's full rebuild as of this migration: the
+# live module may change, what this migration writes must not.
+LABEL_FIELDS = ("categories", "tags")
+DEFAULT_WEIGHTS = {"categories": 0.5, "tags": 1.0}
+
+
+def weighted_jaccard(a, b, weights):
+    shared = sum(weights[name] for name, _ in a & b)
+    if not shared:
+        return 0.0
+    return round(shared / sum(weights[name] for name, _ in a | b), 6)
+
+
+def backfill_related_posts(apps, schema_editor):
+    """
+    Compute every post's related-posts list from the existing labels: the
+    top POSTS_RELATED_COUNT posts by weighted Jaccard similarity of their
+    category / tag sets, ties to the newer post.
+    """
+    Post = apps.get_model("posts", "Post")
+    RelatedPost = apps.get_model("posts", "RelatedPost")
+    k = getattr(settings, "POSTS_RELATED_COUNT", 5)
+    weights = {**DEFAULT_WEIGHTS, **getattr(settings, "POSTS_RELATED_WEIGHTS", {})}
+
+    labels = defaultdict(set)
+    for name in LABEL_FIELDS:
+        field = Post._meta.get_field(name)
+        column = f"{field.related_model._meta.model_name}_id"
+        for post_id, label_id in field.remote_field.through.objects.values_list("post_id", column).iterator():
+            labels[post_id].add((name, label_id))
+    posts_by_label = defaultdict(list)
+    for post_id, post_labels in labels.items():
+        for label in post_labels:
+            posts_by_label[label].append(post_id)
+
+    rows = []
+    for post_id, post_labels in labels.items():
+        candidates = {pk for label in post_labels for pk in posts_by_label[label]} - {post_id}
+        scores = ((weighted_jaccard(post_labels, labels[pk], weights), pk) for pk in candidates)
+        best = heapq.nlargest(k, (pair for pair in scores if pair[0] > 0))
+        rows.extend(
+            RelatedPost(post_id=post_id, related_id=pk, score=score, rank=rank)
+            for rank, (score, pk) in enumerate(best)
+        )
+    RelatedPost.objects.bulk_create(rows, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0008_post_rendered_content'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RelatedPost',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField()),
+                ('rank', models.PositiveSmallIntegerField()),
+                ('post', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='related_links', to='posts.post')),
+                ('related', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='posts.post')),
+            ],
+            options={
+                'ordering': ['post', 'rank'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='relatedpost',
+            constraint=models.UniqueConstraint(fields=('post', 'rank'), name='relatedpost_post_rank_uniq'),
+        ),
+        migrations.RunPython(backfill_related_posts, migrations.RunPython.noop),
+    ]
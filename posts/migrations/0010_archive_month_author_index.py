@@ -0,0 +1,64 @@
+# Generated by Django 4.2.30 on 2026-10-17 04:57
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import TruncMonth
+import django.db.models.deletion
+
+
+def backfill_archive_months(apps, schema_editor):
+    """
+    Count the existing posts per month (in the current time zone), with one
+    GROUP BY. A frozen copy of posts/archive.py's rebuild as of this migration.
+    """
+    Post = apps.get_model("posts", "Post")
+    ArchiveMonth = apps.get_model("posts", "ArchiveMonth")
+    rows = (
+        Post.objects.order_by()
+        .annotate(month=TruncMonth("created_at"))
+        .values("month")
+        .annotate(count=Count("pk"))
+    )
+    ArchiveMonth.objects.bulk_create([
+        ArchiveMonth(year=row["month"].year, month=row["month"].month, post_count=row["count"])
+        for row in rows
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('posts', '0009_related_posts'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchiveMonth',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.PositiveSmallIntegerField()),
+                ('month', models.PositiveSmallIntegerField()),
+                ('post_count', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'ordering': ['-year', '-month'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['author', '-created_at', '-id'], name='post_author_created_idx'),
+        ),
+        # Drop the plain author_id index only once the composite index covers it
+        migrations.AlterField(
+            model_name='post',
+            name='author',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='posts', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddConstraint(
+            model_name='archivemonth',
+            constraint=models.UniqueConstraint(fields=('year', 'month'), name='archivemonth_year_month_uniq'),
+        ),
+        migrations.RunPython(backfill_archive_months, migrations.RunPython.noop),
+    ]
@@ -4,6 +4,23 @@ from django.db import models                         # Django model base
 from django.conf import settings                     # access AUTH_USER_MODEL
 from django.urls import reverse                       # optional helper for get_absolute_url
 from django.utils.text import slugify                 # helper if you auto-slug (optional)
+from django.contrib.postgres.search import SearchVectorField  # stored tsvector (PostgreSQL)
+
+from .rendering import RENDERED_FIELDS, render_fields  # pre-rendered body / excerpt
+
+def exclude_post_count(instance, kwargs):
+    """
+    post_count is owned by posts/counters.py (F() updates). When an existing
+    Category/Tag is saved, write every other field so a stale in-memory count
+    never overwrites the database value.
+    """
+    if not instance._state.adding and kwargs.get("update_fields") is None:
+        kwargs["update_fields"] = [
+            field.name
+            for field in instance._meta.concrete_fields
+            if not field.primary_key and field.name != "post_count"
+        ]
+
 
 class Tag(models.Model):
     """
@@ -20,6 +37,8 @@ class Tag(models.Model):
         blank=True,                # allow blank so we can auto-generate
         help_text="URL-friendly identifier (auto-generated if left blank)"
     )
+    # Denormalized number of posts with this tag (maintained by posts/counters.py)
+    post_count = models.PositiveIntegerField(default=0, editable=False, db_index=True)
 
     def __str__(self):
         # human readable representation
@@ -29,6 +48,7 @@ class Tag(models.Model):
         # if slug is empty, generate it from name (machine-friendly)
         if not self.slug:
             self.slug = slugify(self.name)
+        exclude_post_count(self, kwargs)
         super().save(*args, **kwargs)
 
     def get_absolute_url(self):
@@ -46,7 +66,9 @@ class Category(models.Model):
     # slug used in URLs; unique to allow reverse lookups like /category/<slug>/
     slug = models.SlugField(max_length=100, unique=True)
     description = models.TextField(blank=True, default="")
-    
+    # Denormalized number of posts in this category (maintained by posts/counters.py)
+    post_count = models.PositiveIntegerField(default=0, editable=False, db_index=True)
+
 
     class Meta:
         verbose_name_plural = "categories"
@@ -65,6 +87,7 @@ class Category(models.Model):
         if not self.slug:
             from django.utils.text import slugify
             self.slug = slugify(self.name)
+        exclude_post_count(self, kwargs)
         super().save(*args, **kwargs)
 
     def get_absolute_url(self):
@@ -75,6 +98,25 @@ class Category(models.Model):
         return reverse("posts:category-detail", kwargs={"slug": self.slug})
 
 
+class PostQuerySet(models.QuerySet):
+    """
+    Custom QuerySet for Post with helpers for the public pages.
+    """
+
+    def with_listing_data(self):
+        """
+        Fetch everything a list page renders in a constant number of queries:
+          - author and author.profile joined in the main query (select_related)
+          - categories and tags loaded in one query each (prefetch_related)
+          - full 'content' and 'content_html' deferred; lists show the stored 'excerpt'
+        """
+        return (
+            self.select_related("author", "author__profile")
+            .prefetch_related("categories", "tags")
+            .defer("content", "content_html", "search_vector")
+        )
+
+
 class Post(models.Model):
     """
     Post model — add categories as a many-to-many relationship.
@@ -84,8 +126,10 @@ class Post(models.Model):
     slug = models.SlugField(max_length=255, unique=True)
     content = models.TextField()
     categories = models.ManyToManyField(Category, blank=True)
+    # Indexed through post_author_created_idx below, which also serves the
+    # author page's "WHERE author_id = ... ORDER BY created_at DESC" read
     author = models.ForeignKey(
-        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="posts"
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="posts", db_index=False
     )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -104,14 +148,92 @@ class Post(models.Model):
         Category, related_name="posts", blank=True
     )
 
+    # Display-ready copies of 'content', regenerated by save() (see posts/rendering.py)
+    content_html = models.TextField(blank=True, default="", editable=False)   # escaped, linebreaks-formatted body
+    excerpt = models.TextField(blank=True, default="", editable=False)        # first 30 words, for lists and feeds
+    word_count = models.PositiveIntegerField(default=0, editable=False)
+    reading_time = models.PositiveIntegerField(default=0, editable=False)     # minutes
+
+    # Stored full-text vector, maintained by posts/search.py (GIN-indexed on PostgreSQL;
+    # unused on SQLite, which keeps its own FTS5 table instead)
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    objects = PostQuerySet.as_manager()  # Post.objects.with_listing_data() for list pages
+
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            # Composite key used by keyset pagination (posts/pagination.py)
+            models.Index(fields=["-created_at", "-id"], name="post_created_id_idx"),
+            # MAX(updated_at) for the conditional-GET validators (posts/conditional.py)
+            models.Index(fields=["updated_at"], name="post_updated_at_idx"),
+            # Author pages: one author's posts, newest first, as an index range scan
+            models.Index(fields=["author", "-created_at", "-id"], name="post_author_created_idx"),
+        ]
 
     def __str__(self):
         return self.title
 
+    def render_content(self):
+        """
+        Refresh content_html / excerpt / word_count / reading_time from content.
+        Called by save(); bulk_create callers must call it themselves.
+        """
+        for name, value in render_fields(self.content).items():
+            setattr(self, name, value)
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None or "content" in update_fields:
+            self.render_content()
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, *RENDERED_FIELDS}
+        super().save(*args, **kwargs)
+
     def get_absolute_url(self):
         """
         Return the detail URL for the Post (adjust name if different).
         """
         return reverse("posts:post-detail", kwargs={"slug": self.slug})
+
+
+class RelatedPost(models.Model):
+    """
+    One entry of a post's precomputed "related posts" list (posts/related.py):
+    `related` is the post's rank-th most similar post by weighted Jaccard
+    similarity of their tags and categories.
+    """
+    # Indexed through the (post, rank) constraint below, which also serves the
+    # detail page's "WHERE post_id = ... ORDER BY rank" read
+    post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name="related_links", db_index=False)
+    related = models.ForeignKey(Post, on_delete=models.CASCADE, related_name="+")
+    score = models.FloatField()
+    rank = models.PositiveSmallIntegerField()          # 0 = most similar
+
+    class Meta:
+        ordering = ["post", "rank"]
+        constraints = [
+            models.UniqueConstraint(fields=["post", "rank"], name="relatedpost_post_rank_uniq"),
+        ]
+
+    def __str__(self):
+        return f"{self.post_id} -> {self.related_id} ({self.score:.3f})"
+
+
+class ArchiveMonth(models.Model):
+    """
+    Number of posts created in one calendar month (in settings.TIME_ZONE):
+    the precomputed histogram behind the date archive (posts/archive.py).
+    """
+    year = models.PositiveSmallIntegerField()
+    month = models.PositiveSmallIntegerField()
+    post_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ["-year", "-month"]
+        constraints = [
+            models.UniqueConstraint(fields=["year", "month"], name="archivemonth_year_month_uniq"),
+        ]
+
+    def __str__(self):
+        return f"{self.year}-{self.month:02d} ({self.post_count})"
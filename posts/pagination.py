@@ -0,0 +1,217 @@
+# posts/pagination.py
+# Keyset ("seek") pagination for Post querysets ordered by (-created_at, -id).
+#
+# Offset pagination (Django's Paginator) runs COUNT(*) and OFFSET n, so deep pages
+# get slower as the archive grows. The cursor paginator instead remembers the
+# (created_at, id) of the last row shown and asks for rows "after" it, which the
+# composite index on Post answers in the same time for page 1 and page 10,000.
+
+import base64
+import binascii
+import json
+from datetime import datetime
+
+from django.conf import settings
+from django.core.paginator import Paginator
+from django.db.models import Q
+from django.http import Http404
+
+# Values for settings.POSTS_PAGINATION
+OFFSET = "offset"
+CURSOR = "cursor"
+
+
+def encode_cursor(post, direction):
+    """
+    Build an opaque, URL-safe token from a post's (created_at, id) and a direction
+    ("n" = rows after this post, "p" = rows before it).
+    """
+    payload = json.dumps([post.created_at.isoformat(), post.pk, direction])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token):
+    """
+    Reverse encode_cursor(). Raises ValueError for anything malformed.
+    """
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        created_at, pk, direction = json.loads(base64.urlsafe_b64decode(padded))
+        created_at = datetime.fromisoformat(created_at)
+        pk = int(pk)
+    except (binascii.Error, TypeError, ValueError, UnicodeDecodeError) as exc:
+        raise ValueError("Invalid cursor") from exc
+    if direction not in ("n", "p"):
+        raise ValueError("Invalid cursor")
+    return created_at, pk, direction
+
+
+class CursorPage:
+    """
+    One page of results from CursorPaginator.
+    Mirrors the parts of django.core.paginator.Page the templates use.
+    """
+
+    def __init__(self, object_list, has_next, has_previous):
+        self.object_list = object_list
+        self.has_next_page = has_next
+        self.has_previous_page = has_previous
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self.has_next_page
+
+    def has_previous(self):
+        return self.has_previous_page
+
+    def has_other_pages(self):
+        return self.has_next_page or self.has_previous_page
+
+    @property
+    def next_cursor(self):
+        """
+        Token for the page after this one (None on the last page).
+        """
+        if not (self.has_next_page and self.object_list):
+            return None
+        return encode_cursor(self.object_list[-1], "n")
+
+    @property
+    def previous_cursor(self):
+        """
+        Token for the page before this one (None on the first page).
+        """
+        if not (self.has_previous_page and self.object_list):
+            return None
+        return encode_cursor(self.object_list[0], "p")
+
+
+class CursorPaginator:
+    """
+    Paginate a Post queryset by (created_at, id), newest first.
+    No COUNT(*) and no OFFSET: every page is a single indexed range scan.
+    """
+
+    def __init__(self, queryset, per_page):
+        self.queryset = queryset
+        self.per_page = int(per_page)
+
+    def plan(self, cursor=None):
+        """
+        Return (queryset, finish) for the page identified by the opaque cursor
+        (first page if None): evaluate the queryset, then finish(rows) builds
+        the CursorPage. Raises ValueError for a malformed cursor.
+        """
+        if not cursor:
+            queryset = self.queryset.order_by("-created_at", "-id")[: self.per_page + 1]
+            return queryset, lambda rows: CursorPage(rows[: self.per_page], len(rows) > self.per_page, False)
+
+        created_at, pk, direction = decode_cursor(cursor)
+        if direction == "n":
+            # Rows strictly older than the cursor post
+            older = Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk)
+            queryset = self.queryset.filter(older).order_by("-created_at", "-id")[: self.per_page + 1]
+            return queryset, lambda rows: CursorPage(rows[: self.per_page], len(rows) > self.per_page, True)
+
+        # direction == "p": rows strictly newer than the cursor post, read upwards
+        newer = Q(created_at__gt=created_at) | Q(created_at=created_at, id__gt=pk)
+        queryset = self.queryset.filter(newer).order_by("created_at", "id")[: self.per_page + 1]
+
+        def finish(rows):
+            has_previous = len(rows) > self.per_page
+            rows = rows[: self.per_page]
+            rows.reverse()
+            return CursorPage(rows, True, has_previous)
+
+        return queryset, finish
+
+    def page(self, cursor=None):
+        """
+        Return the CursorPage identified by the opaque cursor (first page if None).
+        Raises ValueError for a malformed cursor.
+        """
+        queryset, finish = self.plan(cursor)
+        return finish(list(queryset))
+
+    async def apage(self, cursor=None):
+        """
+        Async page(), for the async views (posts/async_views.py).
+        """
+        queryset, finish = self.plan(cursor)
+        return finish([row async for row in queryset])
+
+
+class KeysetPaginationMixin:
+    """
+    Opt-in cursor pagination for views that list posts.
+    Enabled when settings.POSTS_PAGINATION == "cursor"; otherwise the
+    view keeps Django's offset pagination.
+    """
+
+    cursor_kwarg = "cursor"                        # query-string parameter carrying the token
+
+    def use_cursor_pagination(self):
+        """
+        True when the site is configured for keyset pagination.
+        """
+        return getattr(settings, "POSTS_PAGINATION", OFFSET) == CURSOR
+
+    def paginate_by_cursor(self, queryset, page_size):
+        """
+        Return (paginator, page, object_list, is_paginated) like
+        MultipleObjectMixin.paginate_queryset(), but using CursorPaginator.
+        """
+        paginator = CursorPaginator(queryset, page_size)
+        try:
+            page = paginator.page(self.request.GET.get(self.cursor_kwarg))
+        except ValueError:
+            raise Http404("Invalid cursor.")
+        return (paginator, page, page.object_list, page.has_other_pages())
+
+    def paginate_posts(self, queryset, page_size):
+        """
+        Paginate an arbitrary post queryset (e.g. inside a DetailView) with
+        whichever mode is configured. Offset mode reads ?page= like ListView.
+        """
+        if self.use_cursor_pagination():
+            return self.paginate_by_cursor(queryset, page_size)
+        paginator = Paginator(queryset, page_size)
+        page = paginator.get_page(self.request.GET.get("page"))
+        return (paginator, page, page.object_list, page.has_other_pages())
+
+    async def apaginate_by_cursor(self, queryset, page_size):
+        """
+        Async paginate_by_cursor().
+        """
+        paginator = CursorPaginator(queryset, page_size)
+        try:
+            page = await paginator.apage(self.request.GET.get(self.cursor_kwarg))
+        except ValueError:
+            raise Http404("Invalid cursor.")
+        return (paginator, page, page.object_list, page.has_other_pages())
+
+    async def apaginate_posts(self, queryset, page_size):
+        """
+        Async paginate_posts(): the count and the page's rows are fetched with
+        the async ORM, so templates get fully loaded lists.
+        """
+        if self.use_cursor_pagination():
+            return await self.apaginate_by_cursor(queryset, page_size)
+        paginator = Paginator(queryset, page_size)
+        paginator.count = await queryset.acount()     # cached_property: get_page() reuses it
+        page = paginator.get_page(self.request.GET.get("page"))
+        page.object_list = [obj async for obj in page.object_list]
+        return (paginator, page, page.object_list, page.has_other_pages())
+
+    def get_context_data(self, **kwargs):
+        """
+        Tell templates which set of pagination links to render.
+        """
+        context = super().get_context_data(**kwargs)
+        context["cursor_pagination"] = self.use_cursor_pagination()
+        return context
@@ -0,0 +1,336 @@
+# posts/related.py
+# Precomputed "related posts" lists (Post -> RelatedPost rows).
+#
+# Similarity of two posts is the weighted Jaccard index of their label sets:
+#
+#     sum of weights of the labels both posts carry
+#     --------------------------------------------------
+#     sum of weights of the labels either post carries
+#
+# where a label is a category or a tag, weighted per kind by
+# settings.POSTS_RELATED_WEIGHTS (tags are more specific than categories, so
+# they count more by default). Every post stores its top
+# settings.POSTS_RELATED_COUNT neighbours, best first, so the detail page
+# reads them with one indexed query instead of joining the link tables.
+#
+# Candidates are capped: a post is only compared with the
+# settings.POSTS_RELATED_CANDIDATES most recent posts of each label it
+# carries, so the work per post stays bounded however large a label grows
+# (a label on every post would otherwise make each refresh, and the full
+# rebuild, quadratic in its size). Past that size lists are approximate:
+# an incremental refresh can keep an older post that a full rebuild would no
+# longer consider.
+#
+# Lists are kept up to date incrementally by the handlers in posts/signals.py:
+# when posts' labels change, only their scores against the posts sharing a
+# label change, so refresh_posts() recomputes those posts' own lists and then
+# patches the neighbours' lists in place, with a fixed number of queries per
+# batch of posts (id lists are split into IN_BATCH_SIZE pieces to stay under
+# SQLite's bound-parameter limit). A neighbour is recomputed in full only
+# when a post drops within (or out of) a full list, because an unseen
+# candidate may now outrank it. Bulk imports (posts/bulk.py) refresh each
+# imported chunk the same way. rebuild_all() recomputes everything
+# (`manage.py rebuild_related_posts`).
+
+import heapq
+from collections import defaultdict
+from itertools import islice
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
+
+from .models import Post, RelatedPost
+
+LABEL_FIELDS = ("categories", "tags")
+DEFAULT_WEIGHTS = {"categories": 0.5, "tags": 1.0}
+IN_BATCH_SIZE = 500                     # ids per "IN (...)" list
+
+
+def get_count():
+    """
+    Number of related posts stored (and shown) per post.
+    """
+    return getattr(settings, "POSTS_RELATED_COUNT", 5)
+
+
+def get_weights():
+    return {**DEFAULT_WEIGHTS, **getattr(settings, "POSTS_RELATED_WEIGHTS", {})}
+
+
+def get_candidate_limit():
+    """
+    Most recent posts of each label a post is compared with.
+    """
+    return getattr(settings, "POSTS_RELATED_CANDIDATES", 200)
+
+
+def batches(ids):
+    """
+    Split ids into lists of at most IN_BATCH_SIZE.
+    """
+    iterator = iter(ids)
+    while batch := list(islice(iterator, IN_BATCH_SIZE)):
+        yield batch
+
+
+def link_tables():
+    """
+    [(label field name, through model, label FK column)] for the label m2ms.
+    """
+    tables = []
+    for name in LABEL_FIELDS:
+        field = Post._meta.get_field(name)
+        tables.append((name, field.remote_field.through, f"{field.related_model._meta.model_name}_id"))
+    return tables
+
+
+def label_sets(post_ids=None):
+    """
+    {post id: {(label field name, label id), ...}} for the given posts (all
+    posts if None). Posts without labels are absent.
+    """
+    labels = defaultdict(set)
+    for name, through, column in link_tables():
+        if post_ids is None:
+            querysets = [through.objects.all()]
+        else:
+            querysets = [through.objects.filter(post_id__in=batch) for batch in batches(post_ids)]
+        for links in querysets:
+            for post_id, label_id in links.values_list("post_id", column).iterator():
+                labels[post_id].add((name, label_id))
+    return labels
+
+
+def label_members(labels):
+    """
+    {(label field name, label id): [post id, ...]} with the
+    get_candidate_limit() most recent posts of each label, newest first:
+    one windowed query per link table (and batch of labels).
+    """
+    limit, members = get_candidate_limit(), defaultdict(list)
+    for name, through, column in link_tables():
+        label_ids = [label_id for kind, label_id in labels if kind == name]
+        for batch in batches(label_ids):
+            rows = (
+                through.objects.filter(**{f"{column}__in": batch})
+                .annotate(
+                    recency=Window(
+                        RowNumber(),
+                        partition_by=F(column),
+                        order_by=[F("post__created_at").desc(), F("post_id").desc()],
+                    )
+                )
+                .filter(recency__lte=limit)
+                .order_by(column, "recency")
+                .values_list(column, "post_id")
+            )
+            for label_id, post_id in rows:
+                members[(name, label_id)].append(post_id)
+    return members
+
+
+def weighted_jaccard(a, b, weights):
+    shared = sum(weights[name] for name, _ in a & b)
+    if not shared:
+        return 0.0
+    return round(shared / sum(weights[name] for name, _ in a | b), 6)
+
+
+def top(scores, k):
+    """
+    The k best (related id, score) pairs of {related id: score}, best first.
+    Ties go to the newer post (higher id), so lists are deterministic.
+    """
+    best = heapq.nlargest(k, ((score, pk) for pk, score in scores.items() if score > 0))
+    return [(pk, score) for score, pk in best]
+
+
+def compute_scores_many(post_ids):
+    """
+    {post id: {other post id: similarity}} for the given posts, against the
+    capped candidates of their labels. The queries are shared by the batch.
+    """
+    labels = label_sets(post_ids)
+    members = label_members({label for post_labels in labels.values() for label in post_labels})
+    candidates = {
+        pk: {other for label in labels.get(pk, ()) for other in members[label]} - {pk}
+        for pk in post_ids
+    }
+    others = label_sets(set().union(*candidates.values()) - labels.keys())
+    others.update(labels)
+    weights = get_weights()
+    return {
+        pk: {other: weighted_jaccard(labels[pk], others[other], weights) for other in candidates[pk]}
+        for pk in post_ids
+    }
+
+
+def compute_scores(post_id):
+    """
+    {other post id: similarity} for the candidates of post_id.
+    """
+    return compute_scores_many([post_id])[post_id]
+
+
+def current_lists(post_ids):
+    """
+    {post id: {related id: score}} as stored, for the given posts.
+    """
+    lists = {pk: {} for pk in post_ids}
+    for batch in batches(post_ids):
+        rows = RelatedPost.objects.filter(post_id__in=batch).values_list("post_id", "related_id", "score")
+        for post_id, related_id, score in rows:
+            lists[post_id][related_id] = score
+    return lists
+
+
+def save_lists(new_lists, old_lists):
+    """
+    Replace the stored lists that differ from before. Returns the ids of the
+    posts whose list changed.
+    """
+    k = get_count()
+    changed = [
+        pk for pk, ranked in new_lists.items()
+        if ranked != top(old_lists.get(pk, {}), k)
+    ]
+    for batch in batches(changed):
+        RelatedPost.objects.filter(post_id__in=batch).delete()
+    insert_rows(
+        [
+            (pk, related_id, score, rank)
+            for pk in changed
+            for rank, (related_id, score) in enumerate(new_lists[pk])
+        ]
+    )
+    return changed
+
+
+def insert_rows(rows):
+    """
+    Write (post id, related id, score, rank) rows with one executemany(): a
+    single statement however many rows, where bulk_create() would split them
+    into batches on SQLite.
+    """
+    if not rows:
+        return
+    connection = connections[RelatedPost.objects.db]
+    quote, meta = connection.ops.quote_name, RelatedPost._meta
+    columns = ", ".join(quote(meta.get_field(name).column) for name in ("post", "related", "score", "rank"))
+    with connection.cursor() as cursor:
+        cursor.executemany(f"INSERT INTO {quote(meta.db_table)} ({columns}) VALUES (%s, %s, %s, %s)", rows)
+
+
+def refresh_posts(post_ids):
+    """
+    Posts' labels changed (or they were created): recompute their lists and
+    patch the lists they may enter or leave, in one batch. Returns the ids of
+    posts whose list changed.
+    """
+    k, post_ids = get_count(), set(post_ids)
+    if not post_ids:
+        return []
+    scores = compute_scores_many(post_ids)
+    holders = set()
+    for batch in batches(post_ids):
+        holders.update(RelatedPost.objects.filter(related_id__in=batch).values_list("post_id", flat=True))
+    neighbours = (holders | {pk for post_scores in scores.values() for pk in post_scores}) - post_ids
+    old_lists = current_lists(neighbours | post_ids)
+
+    new_lists = {pk: top(scores[pk], k) for pk in post_ids}
+    recompute = set()
+    for pk in neighbours:
+        entries = dict(old_lists[pk])
+        for post_id in post_ids:
+            new, old = scores[post_id].get(pk, 0.0), entries.get(post_id)
+            if old is not None and new < old and len(old_lists[pk]) >= k:
+                # post_id fell within a full list: a post outside it may now rank higher
+                recompute.add(pk)
+                break
+            if new > 0:
+                entries[post_id] = new
+            else:
+                entries.pop(post_id, None)
+        else:
+            new_lists[pk] = top(entries, k)
+    for pk, pk_scores in compute_scores_many(recompute).items():
+        new_lists[pk] = top(pk_scores, k)
+    return save_lists(new_lists, old_lists)
+
+
+def refresh_post(post_id):
+    """
+    refresh_posts() for a single post.
+    """
+    return refresh_posts([post_id])
+
+
+def recompute_posts(post_ids):
+    """
+    Recompute the lists of the given posts from scratch (e.g. after a post
+    they listed was deleted). Returns the ids of posts whose list changed.
+    """
+    post_ids, k = set(post_ids), get_count()
+    new_lists = {pk: top(pk_scores, k) for pk, pk_scores in compute_scores_many(post_ids).items()}
+    return save_lists(new_lists, current_lists(post_ids))
+
+
+def rebuild_all():
+    """
+    Recompute every list from the link tables, in memory, and replace the
+    stored ones in one transaction, writing them with one executemany() (a
+    single statement, however many rows). Returns the number of rows written.
+    """
+    k, weights, limit = get_count(), get_weights(), get_candidate_limit()
+    labels = label_sets()
+    recency = dict(Post.objects.values_list("pk", "created_at").iterator())
+    posts_by_label = defaultdict(list)
+    for post_id, post_labels in labels.items():
+        for label in post_labels:
+            posts_by_label[label].append(post_id)
+    for label, members in posts_by_label.items():
+        # Same cap as label_members(): the newest posts of the label
+        posts_by_label[label] = heapq.nlargest(limit, members, key=lambda pk: (recency[pk], pk))
+
+    rows = []
+    for post_id, post_labels in labels.items():
+        candidates = {pk for label in post_labels for pk in posts_by_label[label]}
+        candidates.discard(post_id)
+        scores = {pk: weighted_jaccard(post_labels, labels[pk], weights) for pk in candidates}
+        rows.extend(
+            (post_id, related_id, score, rank)
+            for rank, (related_id, score) in enumerate(top(scores, k))
+        )
+
+    # One transaction: readers keep the old lists until the new ones are in,
+    # and a failed insert leaves them in place
+    with transaction.atomic(using=RelatedPost.objects.db):
+        RelatedPost.objects.all().delete()
+        insert_rows(rows)
+    return len(rows)
+
+
+def related_posts(post):
+    """
+    The post's related posts, best first: one query over the (post, rank)
+    index, loading only what the template shows.
+    """
+    return [link.related for link in related_links(post)]
+
+
+async def arelated_posts(post):
+    """
+    Async related_posts(), for posts/async_views.py.
+    """
+    return [link.related async for link in related_links(post)]
+
+
+def related_links(post):
+    return (
+        RelatedPost.objects.filter(post_id=post.pk)
+        .select_related("related")
+        .only("related__title", "related__slug")
+        .order_by("rank")
+    )
@@ -0,0 +1,209 @@
+# posts/search.py
+# Full-text search over posts.
+#
+# Two index backends share one interface:
+#   - PostgreSQL: Post.search_vector (a stored tsvector, GIN-indexed) ranked with SearchRank
+#   - SQLite:     an FTS5 virtual table (posts_post_fts) keyed by post id, ranked with bm25()
+# Any other database falls back to icontains scans.
+# The index is kept current per post by the handlers in posts/signals.py;
+# `manage.py rebuild_search_index` repopulates it from scratch.
+
+import re
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db import connections
+from django.db.models import F, FloatField, OuterRef, Q, Subquery, Value
+from django.db.models.expressions import RawSQL
+
+# SQLite FTS5 table mirroring (title, content, author username) of each post
+FTS_TABLE = "posts_post_fts"
+
+# Relative weight of each column: title > content > author
+TITLE_WEIGHT, CONTENT_WEIGHT, AUTHOR_WEIGHT = 10.0, 5.0, 1.0
+
+
+def get_search_config():
+    """
+    Text-search configuration (language) used for stemming on PostgreSQL.
+    """
+    return getattr(settings, "POSTS_SEARCH_CONFIG", "english")
+
+
+def build_search_vector():
+    """
+    Weighted tsvector expression over title (A), content (B) and author username (C).
+    Usable in .update(), so the vector is computed inside the database.
+    """
+    User = get_user_model()
+    username = Subquery(
+        User.objects.filter(pk=OuterRef("author_id")).values(User.USERNAME_FIELD)[:1]
+    )
+    config = get_search_config()
+    return (
+        SearchVector("title", weight="A", config=config)
+        + SearchVector("content", weight="B", config=config)
+        + SearchVector(username, weight="C", config=config)
+    )
+
+
+class PostgresSearchBackend:
+    """
+    Search Post.search_vector with websearch syntax; ranked by SearchRank.
+    """
+
+    def __init__(self, using):
+        self.using = using
+
+    def query(self, text):
+        return SearchQuery(text, config=get_search_config(), search_type="websearch")
+
+    def filter(self, queryset, text):
+        return queryset.filter(search_vector=self.query(text))
+
+    def search(self, queryset, text):
+        query = self.query(text)
+        return (
+            queryset.filter(search_vector=query)
+            .annotate(rank=SearchRank(F("search_vector"), query))
+            .order_by("-rank", "-created_at")
+        )
+
+    def index_posts(self, post_ids):
+        from .models import Post
+        Post.objects.using(self.using).filter(pk__in=post_ids).update(
+            search_vector=build_search_vector()
+        )
+
+    def remove_posts(self, post_ids):
+        # The vector lives on the row itself, so it goes away with the post.
+        pass
+
+    def rebuild(self):
+        from .models import Post
+        Post.objects.using(self.using).update(search_vector=build_search_vector())
+
+
+class SQLiteSearchBackend:
+    """
+    Search the FTS5 table; ranked by bm25() with per-column weights.
+    """
+
+    def __init__(self, using):
+        self.using = using
+
+    def match_expression(self, text):
+        """
+        Turn free text into a safe FTS5 query: every word quoted, all words required.
+        """
+        terms = re.findall(r"\w+", text)
+        return " ".join(f'"{term}"' for term in terms)
+
+    def filter(self, queryset, text):
+        match = self.match_expression(text)
+        if not match:
+            return queryset.none()
+        return queryset.filter(
+            pk__in=RawSQL(f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", [match])
+        )
+
+    def search(self, queryset, text):
+        match = self.match_expression(text)
+        if not match:
+            return queryset.none()
+        post_table = queryset.model._meta.db_table
+        # bm25() is "lower is better"; negate it so rank sorts like SearchRank
+        rank = RawSQL(
+            f"SELECT -bm25({FTS_TABLE}, %s, %s, %s) FROM {FTS_TABLE} "
+            f"WHERE {FTS_TABLE} MATCH %s AND rowid = {post_table}.id",
+            [TITLE_WEIGHT, CONTENT_WEIGHT, AUTHOR_WEIGHT, match],
+            output_field=FloatField(),
+        )
+        return (
+            self.filter(queryset, text)
+            .annotate(rank=rank)
+            .order_by("-rank", "-created_at")
+        )
+
+    def _populate_sql(self, where=""):
+        from .models import Post
+        User = get_user_model()
+        return (
+            f"INSERT INTO {FTS_TABLE} (rowid, title, content, author) "
+            f"SELECT p.id, p.title, p.content, u.{User._meta.get_field(User.USERNAME_FIELD).column} "
+            f"FROM {Post._meta.db_table} p JOIN {User._meta.db_table} u ON u.{User._meta.pk.column} = p.author_id {where}"
+        )
+
+    def index_posts(self, post_ids):
+        post_ids = list(post_ids)
+        if not post_ids:
+            return
+        placeholders = ", ".join(["%s"] * len(post_ids))
+        with connections[self.using].cursor() as cursor:
+            cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid IN ({placeholders})", post_ids)
+            cursor.execute(self._populate_sql(f"WHERE p.id IN ({placeholders})"), post_ids)
+
+    def remove_posts(self, post_ids):
+        post_ids = list(post_ids)
+        if not post_ids:
+            return
+        placeholders = ", ".join(["%s"] * len(post_ids))
+        with connections[self.using].cursor() as cursor:
+            cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid IN ({placeholders})", post_ids)
+
+    def rebuild(self):
+        with connections[self.using].cursor() as cursor:
+            cursor.execute(f"DELETE FROM {FTS_TABLE}")
+            cursor.execute(self._populate_sql())
+
+
+class ScanSearchBackend:
+    """
+    Fallback for databases without a full-text index: icontains scans, unranked.
+    """
+
+    def __init__(self, using):
+        self.using = using
+
+    def filter(self, queryset, text):
+        q = Q()
+        for term in text.split():
+            q &= Q(title__icontains=term) | Q(content__icontains=term) | Q(author__username__icontains=term)
+        return queryset.filter(q)
+
+    def search(self, queryset, text):
+        return self.filter(queryset, text).annotate(rank=Value(0.0, output_field=FloatField()))
+
+    def index_posts(self, post_ids):
+        pass
+
+    def remove_posts(self, post_ids):
+        pass
+
+    def rebuild(self):
+        pass
+
+
+BACKENDS = {
+    "postgresql": PostgresSearchBackend,
+    "sqlite": SQLiteSearchBackend,
+}
+
+
+def get_backend(using="default"):
+    """
+    Return the search backend matching the vendor of database alias `using`.
+    """
+    vendor = connections[using].vendor
+    return BACKENDS.get(vendor, ScanSearchBackend)(using)
+
+
+def search_posts(text, queryset=None):
+    """
+    Ranked search over posts (best match first).
+    """
+    from .models import Post
+    if queryset is None:
+        queryset = Post.objects.all()
+    return get_backend(queryset.db).search(queryset, text)
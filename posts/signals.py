@@ -0,0 +1,340 @@
+# posts/signals.py
+# Signal handlers for the posts app: keep cached post fragments, cached feeds,
+# the full-text search index, the related-posts lists, the tag cloud, the
+# archive month histogram and the full-page cache in sync with the database.
+
+from django.db.models.signals import pre_save, post_save, pre_delete, post_delete, m2m_changed
+from django.dispatch import receiver
+
+from . import cache as post_cache
+from . import search
+from . import counters
+from . import related
+from . import archive
+from . import surrogates
+from blog_project import pagecache
+from .models import Post, Category, Tag, RelatedPost
+
+
+def refresh_pages(post_ids):
+    """
+    Posts whose rendered page changed without a Post.save() (labels, related
+    posts): stamp them for the detail validators and drop their cached
+    fragments. updated_at stays the time of the last content edit.
+    """
+    post_ids = list(post_ids)
+    post_cache.mark_posts_changed(post_ids)
+    post_cache.invalidate_posts(post_ids=post_ids)
+
+
+@receiver(pre_save, sender=Post)
+def remember_previous_slug(sender, instance, **kwargs):
+    """
+    Record the slug and title stored in the database before this save, so a
+    slug change also evicts the pointer for the old URL, and a new slug or
+    title refreshes the pages listing this post as related.
+    """
+    instance._previous_slug = instance._previous_title = None
+    if instance.pk:
+        instance._previous_slug, instance._previous_title = (
+            Post.objects.filter(pk=instance.pk).values_list("slug", "title").first() or (None, None)
+        )
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def evict_post(sender, instance, **kwargs):
+    """
+    A post was saved or deleted: drop its cached detail fragments.
+    """
+    post_cache.invalidate_posts(
+        post_ids=[instance.pk],
+        slugs=[instance.slug, getattr(instance, "_previous_slug", None)],
+    )
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+@receiver(post_save, sender=Category)
+@receiver(pre_delete, sender=Category)
+@receiver(post_save, sender=Tag)
+@receiver(pre_delete, sender=Tag)
+def refresh_feeds(sender, **kwargs):
+    """
+    A post, category or tag changed: retire every cached feed document.
+    """
+    post_cache.bump_feeds_version()
+
+
+@receiver(m2m_changed, sender=Post.categories.through)
+@receiver(m2m_changed, sender=Post.tags.through)
+def refresh_feeds_for_relations(sender, action, **kwargs):
+    """
+    Labels added/removed change per-category/per-tag feeds and item categories.
+    """
+    if action in ("post_add", "post_remove", "post_clear"):
+        post_cache.bump_feeds_version()
+
+
+@receiver(post_save, sender=Post)
+def index_post(sender, instance, using, **kwargs):
+    """
+    Refresh this post's entry in the full-text index (incremental, one post).
+    """
+    search.get_backend(using).index_posts([instance.pk])
+
+
+@receiver(post_delete, sender=Post)
+def unindex_post(sender, instance, using, **kwargs):
+    """
+    Drop a deleted post from the full-text index, and note that lists changed.
+    """
+    search.get_backend(using).remove_posts([instance.pk])
+    post_cache.mark_lists_changed()
+
+
+@receiver(pre_delete, sender=Post)
+def decrement_counts_for_deleted_post(sender, instance, **kwargs):
+    """
+    Link rows cascade away without m2m_changed; adjust the counters first.
+    """
+    counters.handle_post_delete(instance)
+
+
+@receiver(m2m_changed, sender=Post.categories.through)
+@receiver(m2m_changed, sender=Post.tags.through)
+def update_post_counts(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Keep Category.post_count / Tag.post_count in step with link changes.
+    """
+    counters.handle_m2m_change(sender, instance, action, reverse, pk_set)
+
+
+@receiver(m2m_changed, sender=Post.categories.through)
+@receiver(m2m_changed, sender=Post.tags.through)
+def evict_post_relations(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Categories or tags were added/removed/cleared on one side of the relation:
+    refresh the affected posts' pages, and note that lists changed (the label
+    pages gained or lost posts without any updated_at moving).
+      - forward  (post.categories.add(...)): instance is the Post
+      - reverse  (category.posts.add(...)):  pk_set holds the affected Post ids
+    For a reverse clear, pk_set is None, so the post ids are collected in pre_clear.
+    """
+    if not reverse:
+        post_ids = [instance.pk]
+    elif action == "pre_clear":
+        instance._cleared_post_ids = list(instance.posts.values_list("pk", flat=True))
+        return
+    elif action == "post_clear":
+        post_ids = getattr(instance, "_cleared_post_ids", ())
+    else:
+        post_ids = pk_set or ()
+
+    if action in ("post_add", "post_remove", "post_clear"):
+        refresh_pages(post_ids)
+        post_cache.mark_lists_changed()
+
+
+@receiver(post_save, sender=Category)
+@receiver(pre_delete, sender=Category)
+@receiver(post_save, sender=Tag)
+@receiver(pre_delete, sender=Tag)
+def evict_posts_for_label(sender, instance, **kwargs):
+    """
+    A category or tag was renamed or is about to be removed: the fragments of
+    every post linking to it are stale. (pre_delete, because the link rows are
+    gone by post_delete.)
+    """
+    if kwargs.get("created"):
+        return                                      # a brand-new label has no posts yet
+    refresh_pages(instance.posts.values_list("pk", flat=True))
+    post_cache.mark_lists_changed()
+
+
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=Tag)
+@receiver(post_delete, sender=Post)
+def refresh_tag_cloud(sender, **kwargs):
+    """
+    A tag was renamed, created or deleted, or a post took its tag links with
+    it: the cached tag cloud (posts/tagcloud.py) is stale.
+    """
+    post_cache.invalidate_tag_cloud()
+
+
+@receiver(m2m_changed, sender=Post.tags.through)
+def refresh_tag_cloud_for_links(sender, action, **kwargs):
+    """
+    Tags added/removed change the counts the cloud is weighted by.
+    """
+    if action in ("post_add", "post_remove", "post_clear"):
+        post_cache.invalidate_tag_cloud()
+
+
+@receiver(post_save, sender=Post)
+def count_post_in_archive(sender, instance, created, **kwargs):
+    """
+    A new post joins its month in the archive histogram (posts/archive.py).
+    created_at never changes afterwards, so updates need nothing.
+    """
+    if created:
+        archive.adjust(instance.created_at, 1)
+
+
+@receiver(post_delete, sender=Post)
+def uncount_post_in_archive(sender, instance, **kwargs):
+    archive.adjust(instance.created_at, -1)
+
+
+# --- related posts (posts/related.py) -----------------------------------------
+
+@receiver(m2m_changed, sender=Post.categories.through)
+@receiver(m2m_changed, sender=Post.tags.through)
+def refresh_related_posts(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Labels were added/removed: recompute the affected posts' related lists
+    incrementally, and refresh the pages of every post whose list changed.
+    For a reverse clear, the post ids were collected by evict_post_relations.
+    """
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if not reverse:
+        post_ids = [instance.pk]
+    elif action == "post_clear":
+        post_ids = getattr(instance, "_cleared_post_ids", ())
+    else:
+        post_ids = pk_set or ()
+    refresh_pages(related.refresh_posts(post_ids))
+
+
+@receiver(post_save, sender=Post)
+def refresh_related_titles(sender, instance, created, **kwargs):
+    """
+    Pages listing this post as related show its title and link.
+    """
+    if created:
+        return
+    if (instance._previous_slug, instance._previous_title) != (instance.slug, instance.title):
+        refresh_pages(RelatedPost.objects.filter(related_id=instance.pk).values_list("post_id", flat=True))
+
+
+@receiver(pre_delete, sender=Post)
+def remember_related_holders(sender, instance, **kwargs):
+    """
+    The rows listing this post cascade away with it; note whose lists they were.
+    """
+    instance._related_holders = list(
+        RelatedPost.objects.filter(related_id=instance.pk).values_list("post_id", flat=True)
+    )
+
+
+@receiver(post_delete, sender=Post)
+def refill_related_holders(sender, instance, **kwargs):
+    """
+    Refill the lists that lost the deleted post.
+    """
+    holders = getattr(instance, "_related_holders", ())
+    related.recompute_posts(holders)
+    refresh_pages(holders)
+
+
+@receiver(pre_delete, sender=Category)
+@receiver(pre_delete, sender=Tag)
+def remember_label_posts(sender, instance, **kwargs):
+    instance._related_post_ids = list(instance.posts.values_list("pk", flat=True))
+
+
+@receiver(post_delete, sender=Category)
+@receiver(post_delete, sender=Tag)
+def refresh_related_for_label(sender, instance, **kwargs):
+    """
+    The label's links cascaded away without m2m_changed: every post that
+    carried it has new scores. They are refreshed as one batch.
+    """
+    refresh_pages(related.refresh_posts(getattr(instance, "_related_post_ids", ())))
+
+
+# --- full-page cache (blog_project/pagecache.py, keys in posts/surrogates.py) --
+# Post detail pages are purged with their fragments (post_cache.invalidate_posts),
+# the sidebar keys with the tag cloud and the archive histogram.
+
+def label_keys(post):
+    return [surrogates.category(slug) for slug in post.categories.values_list("slug", flat=True)] + [
+        surrogates.tag(slug) for slug in post.tags.values_list("slug", flat=True)
+    ]
+
+
+def listing_keys(post):
+    """
+    Pages listing this post, besides its labels' pages.
+    """
+    return [surrogates.LIST, surrogates.author(post.author_id), surrogates.month(*archive.month_of(post.created_at))]
+
+
+@receiver(post_save, sender=Post)
+def purge_post_listings(sender, instance, created, **kwargs):
+    """
+    A post was saved: purge every page listing it (a new post has no labels yet).
+    """
+    pagecache.purge(listing_keys(instance) + ([] if created else label_keys(instance)))
+
+
+@receiver(pre_delete, sender=Post)
+def remember_post_label_keys(sender, instance, **kwargs):
+    instance._label_keys = label_keys(instance)
+
+
+@receiver(post_delete, sender=Post)
+def purge_deleted_post_listings(sender, instance, **kwargs):
+    pagecache.purge(listing_keys(instance) + getattr(instance, "_label_keys", []))
+
+
+@receiver(m2m_changed, sender=Post.categories.through)
+@receiver(m2m_changed, sender=Post.tags.through)
+def purge_label_pages(sender, instance, action, reverse, model, pk_set, **kwargs):
+    """
+    Labels were added/removed: purge the pages of the labels involved (the
+    posts' own pages go with their fragments, see evict_post_relations).
+    For a forward clear, pk_set is None, so the labels are collected in pre_clear.
+    """
+    is_category = sender is Post.categories.through
+    field, key = ("categories", surrogates.category) if is_category else ("tags", surrogates.tag)
+    if reverse:
+        slugs = [instance.slug]
+    elif action == "pre_clear":
+        instance._cleared_label_slugs = list(getattr(instance, field).values_list("slug", flat=True))
+        return
+    elif action == "post_clear":
+        slugs = getattr(instance, "_cleared_label_slugs", ())
+    else:
+        slugs = model.objects.filter(pk__in=pk_set or ()).values_list("slug", flat=True)
+    if action in ("post_add", "post_remove", "post_clear"):
+        keys = [key(slug) for slug in slugs]
+        if is_category:
+            keys.append(surrogates.CATEGORIES)                  # post counts
+        pagecache.purge(keys)
+
+
+@receiver(pre_save, sender=Category)
+@receiver(pre_save, sender=Tag)
+def remember_previous_label_slug(sender, instance, **kwargs):
+    instance._previous_slug = None
+    if instance.pk:
+        instance._previous_slug = sender.objects.filter(pk=instance.pk).values_list("slug", flat=True).first()
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=Tag)
+def purge_label(sender, instance, **kwargs):
+    """
+    A category or tag was created, renamed or deleted: purge its page (under
+    its old slug too) and, for categories, the category list.
+    """
+    key = surrogates.category if sender is Category else surrogates.tag
+    keys = [key(instance.slug), key(getattr(instance, "_previous_slug", None) or instance.slug)]
+    if sender is Category:
+        keys.append(surrogates.CATEGORIES)
+    pagecache.purge(keys)
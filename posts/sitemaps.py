@@ -0,0 +1,288 @@
+# posts/sitemaps.py
+# Static XML sitemaps for posts, categories and tags, written to disk and served
+# as files (serve_file() below) instead of being rendered per request.
+#
+# Layout under settings.POSTS_SITEMAP_ROOT:
+#   sitemap.xml                  -> sitemap index listing every shard
+#   sitemaps/posts-<n>.xml       -> posts with primary key in (n*size, (n+1)*size]
+#   sitemaps/categories-<n>.xml  -> categories, sharded the same way
+#   sitemaps/tags-<n>.xml        -> tags, sharded the same way
+#   sitemaps/manifest.json       -> signature of each shard as last written
+#
+# Shards are keyed by primary-key range rather than by position, so adding or
+# deleting a post only affects its own shard. A shard's signature is its row
+# count plus its newest updated_at, computed for all shards with one GROUP BY;
+# label shards add a digest of their labels' slugs and names, since renaming
+# a label without posts changes no updated_at. build() rewrites only the
+# shards whose signature changed and deletes shards that became empty. Files
+# are replaced atomically (write + rename).
+#
+# The files are not served by WhiteNoise: it indexes its directories once at
+# start-up, so shards rewritten later would go out with stale headers and new
+# ones would 404. serve_file() looks each file up per request instead and
+# answers conditional requests from its modification time.
+
+import hashlib
+import json
+import os
+from collections import defaultdict
+from datetime import datetime, timezone
+from xml.sax.saxutils import escape
+
+from django.conf import settings
+from django.db.models import Count, ExpressionWrapper, F, IntegerField, Max
+from django.http import FileResponse, Http404
+from django.views.decorators.http import condition, require_safe
+
+from .models import Post, Category, Tag
+
+# The sitemap protocol allows at most 50,000 URLs per file
+SHARD_SIZE = 50_000
+
+INDEX_NAME = "sitemap.xml"
+SHARD_DIR = "sitemaps"
+MANIFEST_NAME = "manifest.json"
+
+URLSET_OPEN = '<?xml version="1.0" encoding="UTF-8"?>\n<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+INDEX_OPEN = '<?xml version="1.0" encoding="UTF-8"?>\n<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+
+
+def get_root():
+    return str(getattr(settings, "POSTS_SITEMAP_ROOT", settings.BASE_DIR / "public"))
+
+
+def get_base_url():
+    """
+    Absolute origin prepended to every path, e.g. "https://blog.example.com".
+    """
+    return getattr(settings, "SITE_URL", "http://localhost:8000").rstrip("/")
+
+
+def shard_number(shard_size):
+    """
+    Expression mapping a row's primary key to its shard number (integer division).
+    """
+    return ExpressionWrapper((F("pk") - 1) / shard_size, output_field=IntegerField())
+
+
+class PostSection:
+    """
+    One sitemap entry per post: get_absolute_url() and updated_at.
+    """
+    name = "posts"
+
+    def queryset(self):
+        return Post.objects.only("pk", "slug", "updated_at")
+
+    def signatures(self, shard_size):
+        """
+        {shard number: [row count, newest updated_at]} for every non-empty shard.
+        """
+        rows = (
+            Post.objects.order_by()
+            .annotate(shard=shard_number(shard_size))
+            .values("shard")
+            .annotate(count=Count("pk"), latest=Max("updated_at"))
+        )
+        return {row["shard"]: [row["count"], row["latest"].isoformat()] for row in rows}
+
+    def entries(self, shard, shard_size):
+        """
+        Yield (path, lastmod) for one shard, streamed in primary-key order.
+        """
+        posts = (
+            self.queryset()
+            .filter(pk__gt=shard * shard_size, pk__lte=(shard + 1) * shard_size)
+            .order_by("pk")
+        )
+        for post in posts.iterator(chunk_size=2000):
+            yield post.get_absolute_url(), post.updated_at
+
+
+class CategorySection:
+    """
+    One entry per category; lastmod is the newest updated_at of its posts
+    (renaming a category touches its posts, see posts/signals.py).
+    """
+    name = "categories"
+    model = Category
+
+    def annotated(self):
+        return self.model.objects.order_by().annotate(latest=Max("posts__updated_at"))
+
+    def signatures(self, shard_size):
+        rows = (
+            self.model.objects.order_by()
+            .annotate(shard=shard_number(shard_size))
+            .values("shard")
+            .annotate(count=Count("pk", distinct=True), latest=Max("posts__updated_at"))
+        )
+        digests = self.digests(shard_size)
+        return {
+            row["shard"]: [
+                row["count"],
+                row["latest"].isoformat() if row["latest"] else None,
+                digests[row["shard"]].hexdigest(),
+            ]
+            for row in rows
+        }
+
+    def digests(self, shard_size):
+        """
+        {shard number: md5 of its labels' slugs and names}. Labels are far
+        fewer than posts, so they are simply streamed in primary-key order.
+        """
+        digests = defaultdict(hashlib.md5)
+        labels = self.model.objects.order_by("pk").values_list("pk", "slug", "name")
+        for pk, slug, name in labels.iterator(chunk_size=2000):
+            digests[(pk - 1) // shard_size].update(f"{pk}\t{slug}\t{name}\n".encode())
+        return digests
+
+    def entries(self, shard, shard_size):
+        labels = (
+            self.annotated()
+            .filter(pk__gt=shard * shard_size, pk__lte=(shard + 1) * shard_size)
+            .order_by("pk")
+        )
+        for label in labels.iterator(chunk_size=2000):
+            yield label.get_absolute_url(), label.latest
+
+
+class TagSection(CategorySection):
+    """
+    One entry per tag page, built like the category entries.
+    """
+    name = "tags"
+    model = Tag
+
+
+SECTIONS = [PostSection(), CategorySection(), TagSection()]
+
+
+def write_atomic(path, chunks):
+    """
+    Write an iterable of text chunks to path via a temporary file and rename,
+    so WhiteNoise never serves a half-written sitemap.
+    """
+    temporary = f"{path}.tmp"
+    with open(temporary, "w", encoding="utf-8") as handle:
+        for chunk in chunks:
+            handle.write(chunk)
+    os.replace(temporary, path)
+
+
+def urlset(entries, base_url):
+    yield URLSET_OPEN
+    for path, lastmod in entries:
+        yield f"  <url><loc>{escape(base_url + path)}</loc>"
+        if lastmod is not None:
+            yield f"<lastmod>{lastmod.isoformat()}</lastmod>"
+        yield "</url>\n"
+    yield "</urlset>\n"
+
+
+def sitemap_index(shards, base_url):
+    yield INDEX_OPEN
+    for filename, lastmod in shards:
+        yield f"  <sitemap><loc>{escape(f'{base_url}/{SHARD_DIR}/{filename}')}</loc>"
+        if lastmod:
+            yield f"<lastmod>{lastmod}</lastmod>"
+        yield "</sitemap>\n"
+    yield "</sitemapindex>\n"
+
+
+class SitemapBuilder:
+    """
+    Bring the files under root in line with the database.
+    - full=True rewrites every shard, ignoring the manifest
+    """
+
+    def __init__(self, root=None, base_url=None, shard_size=SHARD_SIZE, sections=None):
+        self.root = root or get_root()
+        self.base_url = (base_url or get_base_url()).rstrip("/")
+        self.shard_size = shard_size
+        self.sections = sections or SECTIONS
+        self.shard_dir = os.path.join(self.root, SHARD_DIR)
+        self.manifest_path = os.path.join(self.shard_dir, MANIFEST_NAME)
+
+    def load_manifest(self):
+        try:
+            with open(self.manifest_path, encoding="utf-8") as handle:
+                manifest = json.load(handle)
+        except (OSError, ValueError):
+            return {}
+        # Shards written with another size or origin cannot be reused
+        if manifest.get("shard_size") != self.shard_size or manifest.get("base_url") != self.base_url:
+            return {}
+        return manifest.get("sections", {})
+
+    def build(self, full=False):
+        """
+        Returns (rewritten, total): shard files written, and shards in the index.
+        """
+        os.makedirs(self.shard_dir, exist_ok=True)
+        previous = {} if full else self.load_manifest()
+        sections, index, rewritten = {}, [], 0
+
+        for section in self.sections:
+            old = previous.get(section.name, {})
+            current = {}
+            for shard, signature in sorted(section.signatures(self.shard_size).items()):
+                filename = f"{section.name}-{shard}.xml"
+                path = os.path.join(self.shard_dir, filename)
+                if old.get(str(shard)) != signature or not os.path.exists(path):
+                    write_atomic(path, urlset(section.entries(shard, self.shard_size), self.base_url))
+                    rewritten += 1
+                current[str(shard)] = signature
+                index.append((filename, signature[1]))
+            for shard in set(old) - set(current):            # shards that became empty
+                stale = os.path.join(self.shard_dir, f"{section.name}-{shard}.xml")
+                if os.path.exists(stale):
+                    os.remove(stale)
+            sections[section.name] = current
+
+        write_atomic(os.path.join(self.root, INDEX_NAME), sitemap_index(index, self.base_url))
+        write_atomic(self.manifest_path, [json.dumps({
+            "shard_size": self.shard_size,
+            "base_url": self.base_url,
+            "sections": sections,
+        }, indent=1)])
+        return rewritten, len(index)
+
+
+# --- serving -----------------------------------------------------------------
+
+def file_path(name):
+    """
+    Absolute path of sitemap.xml or a shard; name is restricted by the URL
+    patterns (posts/urls.py) to those files.
+    """
+    return os.path.join(get_root(), name)
+
+
+def file_etag(request, name):
+    try:
+        stat = os.stat(file_path(name))
+    except OSError:
+        return None
+    return f"{stat.st_mtime_ns:x}-{stat.st_size:x}"
+
+
+def file_last_modified(request, name):
+    try:
+        return datetime.fromtimestamp(os.stat(file_path(name)).st_mtime, tz=timezone.utc)
+    except OSError:
+        return None
+
+
+@require_safe
+@condition(etag_func=file_etag, last_modified_func=file_last_modified)
+def serve_file(request, name):
+    """
+    Serve the file as it is on disk now (see the module comment).
+    """
+    try:
+        handle = open(file_path(name), "rb")
+    except OSError:
+        raise Http404(name)
+    return FileResponse(handle, content_type="application/xml")
@@ -0,0 +1,60 @@
+# posts/surrogates.py
+# Surrogate keys of the public pages, for the full-page cache
+# (blog_project/pagecache.py) and any CDN in front of the site.
+#
+# A page is tagged with a key for everything it shows; the handlers in
+# posts/signals.py purge exactly the keys a change affects:
+#   post:<id>          post detail page              the post, its labels, its related posts
+#   list               post list                     any post saved or deleted
+#   categories         category list                 categories and their post counts
+#   category:<slug>    category page                 the category, its posts
+#   tag:<slug>         tag page                      the tag, its posts
+#   author:<id>        author page                   the author's posts
+#   archive:<y>-<m>    month archive page            the month's posts
+#   tag-cloud          every page with the sidebar   posts/tagcloud.py
+#   archive-months     every page with the sidebar   posts/archive.py
+
+from blog_project.pagecache import cache_response, will_cache_response
+
+LIST = "list"
+CATEGORIES = "categories"
+TAG_CLOUD = "tag-cloud"
+ARCHIVE_MONTHS = "archive-months"
+
+
+def post(pk):
+    return f"post:{pk}"
+
+
+def category(slug):
+    return f"category:{slug}"
+
+
+def tag(slug):
+    return f"tag:{slug}"
+
+
+def author(pk):
+    return f"author:{pk}"
+
+
+def month(year, month):
+    return f"archive:{year}-{month:02d}"
+
+
+class SurrogateKeysMixin:
+    """
+    Let the page cache store the response, tagged with get_surrogate_keys().
+    """
+
+    def setup(self, request, *args, **kwargs):
+        # Before dispatch(), so the view's first query already knows where to go
+        will_cache_response(request)
+        super().setup(request, *args, **kwargs)
+
+    def get_surrogate_keys(self):
+        return []
+
+    def render_to_response(self, context, **response_kwargs):
+        cache_response(self.request, *self.get_surrogate_keys())
+        return super().render_to_response(context, **response_kwargs)
@@ -0,0 +1,73 @@
+# posts/tagcloud.py
+# Site-wide tag cloud: the most used tags, each with a weight bucket 1..N
+# derived from its post count.
+#
+# The cloud is built from the denormalized Tag.post_count column (maintained
+# by posts/counters.py), so it costs one query over the post_count index, no
+# matter how many posts or links there are. The result is cached with no
+# timeout under posts:tag-cloud (posts/cache.py) and dropped by the handlers
+# in posts/signals.py whenever a tag or a post-tag link changes.
+#
+# Counts are bucketed on a log scale: tag usage is heavy-tailed, so a linear
+# scale would put one or two tags at the top and everything else at 1.
+
+import math
+
+from django.conf import settings
+
+from . import cache as post_cache
+from .models import Tag
+
+
+def get_size():
+    """
+    Maximum number of tags in the cloud (the most used ones).
+    """
+    return getattr(settings, "POSTS_TAG_CLOUD_SIZE", 50)
+
+
+def get_levels():
+    """
+    Number of weight buckets (CSS classes tag-cloud-1 .. tag-cloud-N).
+    """
+    return getattr(settings, "POSTS_TAG_CLOUD_LEVELS", 5)
+
+
+def bucket(count, low, high, levels):
+    """
+    Weight (1..levels) of a post count between the smallest and largest count.
+    """
+    if high == low:
+        return 1
+    position = (math.log(count) - math.log(low)) / (math.log(high) - math.log(low))
+    return 1 + round(position * (levels - 1))
+
+
+def build_cloud():
+    """
+    [{"name", "slug", "count", "weight"}] for the most used tags, by name.
+    One query; tags without posts are left out.
+    """
+    rows = list(
+        Tag.objects.filter(post_count__gt=0)
+        .order_by("-post_count", "name")
+        .values_list("name", "slug", "post_count")[: get_size()]
+    )
+    if not rows:
+        return []
+    counts = [count for _, _, count in rows]
+    low, high, levels = min(counts), max(counts), get_levels()
+    return sorted(
+        (
+            {"name": name, "slug": slug, "count": count, "weight": bucket(count, low, high, levels)}
+            for name, slug, count in rows
+        ),
+        key=lambda entry: entry["name"].lower(),
+    )
+
+
+def get_cloud():
+    """
+    The cached cloud, built on a miss.
+    """
+    return post_cache.get_cache().get_or_set(post_cache.TAG_CLOUD_KEY, build_cloud, None)
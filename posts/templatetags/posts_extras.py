@@ -0,0 +1,32 @@
+# posts/templatetags/posts_extras.py
+# Template tags for the posts app. Load with {% load posts_extras %}.
+# Each tag also adds the surrogate key of what it shows to the page
+# (posts/surrogates.py), so purging the sidebar data purges the pages showing it.
+
+from django import template
+
+from blog_project.pagecache import add_surrogate_keys
+
+from .. import archive, surrogates, tagcloud
+
+register = template.Library()
+
+
+@register.inclusion_tag("posts/_tag_cloud.html", takes_context=True)
+def tag_cloud(context):
+    """
+    Render the cached site-wide tag cloud (posts/tagcloud.py).
+    """
+    if context.get("request") is not None:
+        add_surrogate_keys(context["request"], surrogates.TAG_CLOUD)
+    return {"tags": tagcloud.get_cloud()}
+
+
+@register.inclusion_tag("posts/_archive_months.html", takes_context=True)
+def archive_months(context):
+    """
+    Render the cached month histogram as archive links (posts/archive.py).
+    """
+    if context.get("request") is not None:
+        add_surrogate_keys(context["request"], surrogates.ARCHIVE_MONTHS)
+    return {"months": archive.get_histogram()}
@@ -0,0 +1,156 @@
+# posts/tests/query_budget.py
+# Query and render-time budgets for named routes, checked against a budget file.
+#
+# QueryBudgetMixin (for a TestCase) walks every named route of the URLconf
+# modules in budget_urlconfs, requests each one as its Visit describes, and
+# compares the SQL it ran and the time it took with the budget file:
+#   {"posts:post-list": {"queries": 5, "ms": 150, "sql": ["SELECT ...", ...]}, ...}
+# Each visit starts from empty caches, so the count covers everything the
+# page can cost (sidebar, fragments, validators), not just a warm cache hit.
+# A route over its query budget fails with a diff between the recorded SQL and
+# the new SQL, so an N+1 shows up as the repeated statement it adds. SQL is
+# recorded with literals and savepoint names (s<thread id>_x<n>) replaced by %s
+# and IN lists collapsed, so it does not change with the data or the thread
+# (the text is the test database's SQL, SQLite by default; counts are what is
+# compared).
+#
+# Adding a route without a visit or a budget fails too. After an intended
+# change, rewrite the budget file and review its diff:
+#   QUERY_BUDGET_UPDATE=1 SECRET_KEY=... python manage.py test posts.tests.test_query_budgets
+# Time budgets are written with generous headroom (TIME_HEADROOM x the
+# fastest of REPEATS runs, at least MIN_MS): they catch pages that become
+# several times slower, not noise.
+
+import difflib
+import json
+import math
+import os
+import re
+import time
+from importlib import import_module
+
+from django.core.cache import caches
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern, reverse
+
+UPDATE_ENV = "QUERY_BUDGET_UPDATE"
+REPEATS = 3
+TIME_HEADROOM = 5
+MIN_MS = 150
+
+STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+IN_LIST = re.compile(r"IN \(%s(?:, %s)*\)")
+# Django names savepoints after the thread id and a counter (transaction.savepoint())
+SAVEPOINT_NAME = re.compile(r"(SAVEPOINT [\"`]?)s\d+_x\d+")
+
+
+def normalize_sql(sql):
+    """
+    SQL with its literal values and savepoint names replaced, so runs over
+    different rows (and in different threads) compare equal.
+    """
+    sql = SAVEPOINT_NAME.sub(r"\1%s", sql)
+    sql = NUMBER_LITERAL.sub("%s", STRING_LITERAL.sub("%s", sql))
+    return IN_LIST.sub("IN (...)", sql)
+
+
+def named_routes(urlconf):
+    """
+    "namespace:name" of every named route of a URLconf module (app_name as namespace).
+    """
+    module = import_module(urlconf)
+    prefix = f"{module.app_name}:" if getattr(module, "app_name", None) else ""
+    return [
+        f"{prefix}{pattern.name}"
+        for pattern in module.urlpatterns
+        if isinstance(pattern, URLPattern) and pattern.name
+    ]
+
+
+class Visit:
+    """
+    How to request one route.
+    - kwargs: URL kwargs for reverse(); query: query string without "?"
+    - user: user to log in as (None = anonymous)
+    - method/data: request method and form data; status: expected status code
+    """
+
+    def __init__(self, kwargs=None, query="", user=None, method="get", data=None, status=200):
+        self.kwargs = kwargs or {}
+        self.query = query
+        self.user = user
+        self.method = method
+        self.data = data or {}
+        self.status = status
+
+
+class QueryBudgetMixin:
+    """
+    Set budget_file (a pathlib.Path) and budget_urlconfs, and implement
+    visits() -> {route name: Visit}.
+    """
+
+    budget_file = None
+    budget_urlconfs = ()
+
+    def visits(self):
+        raise NotImplementedError
+
+    def load_budgets(self):
+        if not self.budget_file.exists():
+            return {}
+        return json.loads(self.budget_file.read_text())
+
+    def measure(self, name, visit):
+        """
+        (normalized SQL statements, fastest time in ms) of a visit, each run
+        starting from empty caches.
+        """
+        url = reverse(name, kwargs=visit.kwargs) + (f"?{visit.query}" if visit.query else "")
+        timings = []
+        for _ in range(REPEATS):
+            for cache in caches.all():
+                cache.clear()
+            client = Client()
+            if visit.user is not None:
+                client.force_login(visit.user)
+            with CaptureQueriesContext(connection) as queries:
+                started = time.perf_counter()
+                response = getattr(client, visit.method)(url, visit.data)
+                timings.append((time.perf_counter() - started) * 1000)
+            self.assertEqual(response.status_code, visit.status, f"{name}: {url}")
+        return [normalize_sql(query["sql"]) for query in queries.captured_queries], min(timings)
+
+    def test_every_route_has_a_visit_and_a_budget(self):
+        routes = {name for urlconf in self.budget_urlconfs for name in named_routes(urlconf)}
+        self.assertEqual(set(self.visits()), routes, "routes without a visit (or visits of removed routes)")
+        if not os.environ.get(UPDATE_ENV):
+            self.assertEqual(
+                set(self.load_budgets()), routes,
+                f"budgets out of date: rerun with {UPDATE_ENV}=1 and review {self.budget_file.name}",
+            )
+
+    def test_routes_stay_within_budget(self):
+        budgets, measured = self.load_budgets(), {}
+        for name, visit in sorted(self.visits().items()):
+            sql, ms = self.measure(name, visit)
+            measured[name] = {
+                "queries": len(sql),
+                "ms": max(MIN_MS, math.ceil(ms * TIME_HEADROOM / 10) * 10),
+                "sql": sql,
+            }
+            budget = budgets.get(name)
+            if os.environ.get(UPDATE_ENV) or budget is None:
+                continue
+            with self.subTest(route=name):
+                if len(sql) > budget["queries"]:
+                    diff = "\n".join(difflib.unified_diff(
+                        budget["sql"], sql, "budget", "now", lineterm="", n=1,
+                    ))
+                    self.fail(f"{name}: {len(sql)} queries, budget {budget['queries']}\n{diff}")
+                self.assertLessEqual(ms, budget["ms"], f"{name}: rendered in {ms:.1f} ms, budget {budget['ms']} ms")
+        if os.environ.get(UPDATE_ENV):
+            self.budget_file.write_text(json.dumps(measured, indent=2, sort_keys=True) + "\n")
@@ -0,0 +1,119 @@
+# posts/tests/test_archives.py
+# Tests for the author pages, the month archive and the precomputed month
+# histogram behind it (posts/archive.py).
+
+from datetime import datetime
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from django.contrib.auth import get_user_model
+
+from posts.models import ArchiveMonth, Post
+from posts import archive
+from posts import cache as post_cache
+
+
+def moment(year, month, day=15):
+    return timezone.make_aware(datetime(year, month, day, 12, 0))
+
+
+class ArchiveTests(TestCase):
+    def setUp(self):
+        post_cache.get_cache().clear()
+        User = get_user_model()
+        self.alice = User.objects.create_user(username="alice", password="testpass")
+        self.bob = User.objects.create_user(username="bob", password="testpass")
+        # alice: 12 posts in March 2024, bob: 1 post in January 2024 and 1 in May 2024
+        dated = [(self.alice, moment(2024, 3, 1 + i)) for i in range(12)]
+        dated += [(self.bob, moment(2024, 1)), (self.bob, moment(2024, 5))]
+        for i, (author, created_at) in enumerate(dated):
+            post = Post.objects.create(title=f"Post {i}", slug=f"post-{i}", content="Body", author=author)
+            Post.objects.filter(pk=post.pk).update(created_at=created_at)   # auto_now_add
+        archive.rebuild_histogram()
+        post_cache.invalidate_archive_months()
+
+    def histogram(self):
+        return [(entry["year"], entry["month"], entry["count"]) for entry in archive.get_histogram()]
+
+    def test_histogram_is_newest_first_and_cached(self):
+        self.assertEqual(self.histogram(), [(2024, 5, 1), (2024, 3, 12), (2024, 1, 1)])
+        with self.assertNumQueries(0):
+            archive.get_histogram()
+
+    def test_new_and_deleted_posts_move_the_histogram(self):
+        now = timezone.localtime()
+        post = Post.objects.create(title="Fresh", slug="fresh", content="Body", author=self.bob)
+        self.assertIn((now.year, now.month, 1), self.histogram())
+        post.delete()
+        self.assertNotIn((now.year, now.month, 1), self.histogram())
+        self.assertEqual(ArchiveMonth.objects.get(year=now.year, month=now.month).post_count, 0)
+
+    def test_month_page_lists_the_month_and_links_neighbours(self):
+        resp = self.client.get(reverse("posts:archive-month", kwargs={"year": 2024, "month": 3}))
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(len(resp.context["posts"]), 10)
+        self.assertEqual(resp.context["paginator"].count, 12)
+        self.assertContains(resp, "Posts from March 2024")
+        self.assertContains(resp, 'href="/archive/2024/1/"')
+        self.assertContains(resp, 'href="/archive/2024/5/"')
+        resp = self.client.get(reverse("posts:archive-month", kwargs={"year": 2024, "month": 3}), {"page": 2})
+        self.assertEqual(len(resp.context["posts"]), 2)
+
+    def test_empty_or_impossible_months_are_404(self):
+        for year, month in ((2024, 2), (2024, 13), (0, 1)):
+            resp = self.client.get(reverse("posts:archive-month", kwargs={"year": year, "month": month}))
+            self.assertEqual(resp.status_code, 404)
+
+    def test_month_page_takes_its_count_from_the_histogram(self):
+        """
+        validators + posts + categories prefetch + tags prefetch: no COUNT(*).
+        """
+        url = reverse("posts:archive-month", kwargs={"year": 2024, "month": 3})
+        self.client.get(url)                           # builds the cached sidebar data
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get(url)
+        self.assertEqual(len(ctx.captured_queries), 4)
+        self.assertFalse([q for q in ctx.captured_queries if "COUNT(" in q["sql"]])
+
+    def test_author_page(self):
+        resp = self.client.get(reverse("posts:author-detail", kwargs={"username": "bob"}))
+        self.assertEqual(resp.context["author"], self.bob)
+        self.assertEqual([post.slug for post in resp.context["posts"]], ["post-13", "post-12"])
+        self.assertContains(resp, "Posts by bob")
+        resp = self.client.get(reverse("posts:author-detail", kwargs={"username": "nobody"}))
+        self.assertEqual(resp.status_code, 404)
+
+    def test_author_page_query_count_is_fixed(self):
+        """
+        validators + author lookup + count + posts + categories prefetch + tags prefetch.
+        """
+        url = reverse("posts:author-detail", kwargs={"username": "alice"})
+        self.client.get(url)
+        with self.assertNumQueries(6):
+            resp = self.client.get(url)
+        self.assertEqual(len(resp.context["posts"]), 10)
+
+    def test_conditional_get(self):
+        for url in (
+            reverse("posts:author-detail", kwargs={"username": "alice"}),
+            reverse("posts:archive-month", kwargs={"year": 2024, "month": 3}),
+        ):
+            resp = self.client.get(url)
+            resp = self.client.get(url, HTTP_IF_NONE_MATCH=resp["ETag"])
+            self.assertEqual(resp.status_code, 304, url)
+
+    def test_sidebar_links_archive_months(self):
+        resp = self.client.get(reverse("posts:category-list"))
+        self.assertContains(resp, '<a href="/archive/2024/3/">March 2024</a> (12)', html=False)
+
+    def test_rebuild_command(self):
+        ArchiveMonth.objects.all().delete()
+        out = StringIO()
+        call_command("rebuild_archive_months", stdout=out)
+        self.assertIn("3 months", out.getvalue())
+        self.assertEqual(self.histogram(), [(2024, 5, 1), (2024, 3, 12), (2024, 1, 1)])
@@ -0,0 +1,119 @@
+# posts/tests/test_async_views.py
+# Tests for the async public views (posts/async_views.py), served through
+# Django's async request handler. This module doubles as a URLconf that puts
+# the async views in front of the regular posts URLs.
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import include, path, reverse
+
+from blog_project import urls as project_urls
+from posts import async_views
+from posts import cache as post_cache
+from posts import urls as post_urls
+from posts.models import Category, Post, Tag
+
+async_patterns = [
+    path("", async_views.AsyncPostListView.as_view(), name="post-list"),
+    path("categories/", async_views.AsyncCategoryListView.as_view(), name="category-list"),
+    path("category/<slug:slug>/", async_views.AsyncCategoryDetailView.as_view(), name="category-detail"),
+    path("tag/<slug:slug>/", async_views.AsyncTagDetailView.as_view(), name="tag-detail"),
+    path("<slug:slug>/", async_views.AsyncPostDetailView.as_view(), name="post-detail"),
+]
+urlpatterns = [
+    # Earlier patterns win, so these shadow the sync views of the same name
+    path("", include((async_patterns + post_urls.urlpatterns, "posts"), namespace="posts")),
+] + [pattern for pattern in project_urls.urlpatterns if getattr(pattern, "namespace", None) != "posts"]
+
+
+@override_settings(ROOT_URLCONF=__name__)
+class AsyncViewTests(TestCase):
+    def setUp(self):
+        post_cache.get_cache().clear()
+        User = get_user_model()
+        self.user = User.objects.create_user(username="asyncwriter", password="testpass")
+        self.category = Category.objects.create(name="Django", slug="django")
+        self.tag = Tag.objects.create(name="orm", slug="orm")
+        for i in range(12):
+            post = Post.objects.create(
+                title=f"Async post {i}", slug=f"async-post-{i}", content="Body text", author=self.user
+            )
+            post.categories.add(self.category)
+            post.tags.add(self.tag)
+
+    def test_views_are_async(self):
+        for view in (
+            async_views.AsyncPostListView,
+            async_views.AsyncPostDetailView,
+            async_views.AsyncCategoryListView,
+            async_views.AsyncCategoryDetailView,
+            async_views.AsyncTagDetailView,
+        ):
+            self.assertTrue(view.view_is_async, view.__name__)
+
+    async def test_post_list_pages(self):
+        resp = await self.async_client.get(reverse("posts:post-list"))
+        self.assertEqual(resp.status_code, 200)
+        self.assertContains(resp, "Async post 11")
+        self.assertEqual(len(resp.context["posts"]), 10)
+        self.assertTrue(resp.context["is_paginated"])
+
+        resp = await self.async_client.get(reverse("posts:post-list"), {"page": "last"})
+        self.assertEqual(len(resp.context["posts"]), 2)
+        resp = await self.async_client.get(reverse("posts:post-list"), {"page": 99})
+        self.assertEqual(resp.status_code, 404)
+
+    @override_settings(POSTS_PAGINATION="cursor")
+    async def test_post_list_cursor_pages(self):
+        resp = await self.async_client.get(reverse("posts:post-list"))
+        next_cursor = resp.context["page_obj"].next_cursor
+        resp = await self.async_client.get(reverse("posts:post-list"), {"cursor": next_cursor})
+        self.assertEqual([post.slug for post in resp.context["posts"]], ["async-post-1", "async-post-0"])
+
+    async def test_detail_fills_and_then_serves_from_fragment_cache(self):
+        url = reverse("posts:post-detail", kwargs={"slug": "async-post-3"})
+        resp = await self.async_client.get(url)
+        self.assertContains(resp, "Async post 3")
+        self.assertIsNotNone(await post_cache.aload_detail("async-post-3"))
+
+        resp = await self.async_client.get(url)
+        self.assertContains(resp, "Async post 3")
+        self.assertContains(resp, 'href="/category/django/"')
+
+    async def test_unknown_slugs_are_404(self):
+        resp = await self.async_client.get(reverse("posts:post-detail", kwargs={"slug": "missing"}))
+        self.assertEqual(resp.status_code, 404)
+        resp = await self.async_client.get(reverse("posts:category-detail", kwargs={"slug": "missing"}))
+        self.assertEqual(resp.status_code, 404)
+
+    async def test_conditional_get(self):
+        for url in (
+            reverse("posts:post-list"),
+            reverse("posts:post-detail", kwargs={"slug": "async-post-0"}),
+            reverse("posts:category-detail", kwargs={"slug": "django"}),
+            reverse("posts:tag-detail", kwargs={"slug": "orm"}),
+        ):
+            resp = await self.async_client.get(url)
+            self.assertTrue(resp.has_header("Last-Modified"), url)
+            resp = await self.async_client.get(url, headers={"If-None-Match": resp["ETag"]})
+            self.assertEqual(resp.status_code, 304, url)
+
+    async def test_category_views(self):
+        resp = await self.async_client.get(reverse("posts:category-list"))
+        self.assertContains(resp, "Django")
+        resp = await self.async_client.get(reverse("posts:category-detail", kwargs={"slug": "django"}))
+        self.assertEqual(resp.context["category"], self.category)
+        self.assertEqual(len(resp.context["posts"]), 10)
+
+    async def test_tag_detail(self):
+        resp = await self.async_client.get(reverse("posts:tag-detail", kwargs={"slug": "orm"}))
+        self.assertEqual(resp.context["tag"], self.tag)
+        self.assertEqual(len(resp.context["posts"]), 10)
+        self.assertContains(resp, 'class="tag-cloud-1"')
+        resp = await self.async_client.get(reverse("posts:tag-detail", kwargs={"slug": "missing"}))
+        self.assertEqual(resp.status_code, 404)
+
+    @override_settings(PERF_SAMPLE_RATE=1.0)
+    async def test_instrumentation_counts_async_orm_queries(self):
+        resp = await self.async_client.get(reverse("posts:post-list"))
+        self.assertRegex(resp["Server-Timing"], r'desc="[1-9]\d* queries"')
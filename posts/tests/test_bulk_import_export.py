@@ -0,0 +1,188 @@
+# posts/tests/test_bulk_import_export.py
+# Tests for the streaming import_posts / export_posts management commands.
+
+import json
+import os
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from posts.models import Post, Category, RelatedPost, Tag
+from posts import cache as post_cache
+from posts import related, search
+
+
+class BulkImportExportTests(TestCase):
+    def setUp(self):
+        User = get_user_model()
+        self.user = User.objects.create_user(username="writer", password="testpass")
+        self.tmpdir = tempfile.mkdtemp(prefix="test_bulk_")
+        self.existing = Category.objects.create(name="Django", slug="django")
+
+    def tearDown(self):
+        for name in os.listdir(self.tmpdir):
+            os.remove(os.path.join(self.tmpdir, name))
+        os.rmdir(self.tmpdir)
+
+    def write_jsonl(self, records):
+        path = os.path.join(self.tmpdir, "posts.jsonl")
+        with open(path, "w", encoding="utf-8") as fh:
+            for record in records:
+                fh.write(json.dumps(record) + "\n")
+        return path
+
+    def records(self, count):
+        return [
+            {
+                "title": f"Imported {i}",
+                "slug": f"imported-{i}",
+                "content": f"Body number {i}",
+                "author": "writer",
+                "created_at": f"2020-01-{i % 28 + 1:02d}T10:00:00+00:00",
+                "categories": [{"slug": "django", "name": "Django"}, {"slug": "legacy", "name": "Legacy"}],
+                "tags": ["orm:ORM"] if i % 2 else [],
+            }
+            for i in range(count)
+        ]
+
+    def test_import_creates_posts_labels_links_and_counts(self):
+        path = self.write_jsonl(self.records(25))
+        out = StringIO()
+        call_command("import_posts", path, "--chunk-size", "10", stdout=out)
+        self.assertIn("Imported 25 post(s), skipped 0", out.getvalue())
+
+        self.assertEqual(Post.objects.count(), 25)
+        post = Post.objects.get(slug="imported-3")
+        self.assertEqual(post.created_at.year, 2020)
+        self.assertEqual(sorted(post.categories.values_list("slug", flat=True)), ["django", "legacy"])
+        self.assertEqual(list(post.tags.values_list("name", flat=True)), ["ORM"])
+        self.assertEqual(Category.objects.get(slug="django").post_count, 25)
+        self.assertEqual(Tag.objects.get(slug="orm").post_count, 12)
+        # Imported posts are searchable straight away
+        self.assertEqual(search.search_posts("number").count(), 25)
+
+    def test_import_query_count_does_not_grow_with_posts(self):
+        """
+        Each chunk costs a fixed number of queries, however many rows it holds.
+        """
+        def queries_for(count, prefix):
+            records = self.records(count)
+            for record in records:
+                record["slug"] = f"{prefix}-{record['slug']}"
+            path = self.write_jsonl(records)
+            with CaptureQueriesContext(connection) as ctx:
+                call_command("import_posts", path, "--chunk-size", "100", stdout=StringIO())
+            return len(ctx.captured_queries)
+
+        queries_for(2, "warm")                        # create the labels first
+        self.assertEqual(queries_for(5, "small"), queries_for(50, "large"))
+
+    def test_import_skips_existing_slugs_and_unknown_authors(self):
+        Post.objects.create(title="Old", slug="imported-0", content="x", author=self.user)
+        records = self.records(3)
+        records[1]["author"] = "nobody"
+        out = StringIO()
+        call_command("import_posts", self.write_jsonl(records), stdout=out)
+        self.assertIn("Imported 1 post(s), skipped 2", out.getvalue())
+
+        call_command("import_posts", self.write_jsonl(records), "--default-author", "writer", stdout=StringIO())
+        self.assertTrue(Post.objects.filter(slug="imported-1", author=self.user).exists())
+
+    def test_import_skips_records_without_slug_or_title(self):
+        records = self.records(4)
+        del records[0]["slug"]
+        records[1]["title"] = ""
+        del records[2]["title"]
+        out = StringIO()
+        call_command("import_posts", self.write_jsonl(records), stdout=out)
+        self.assertIn("Imported 1 post(s), skipped 3", out.getvalue())
+        self.assertEqual(list(Post.objects.values_list("slug", flat=True)), ["imported-3"])
+
+    def test_import_matches_existing_labels_by_name(self):
+        # "Django" exists as slug "django"; the names are unique, so it is the same category
+        records = self.records(2)
+        records[0]["categories"] = [{"slug": "django-framework", "name": "Django"}]
+        records[1]["categories"] = "dj:Django|py:Python|python:Python"
+        call_command("import_posts", self.write_jsonl(records), stdout=StringIO())
+        self.assertEqual(sorted(Category.objects.values_list("slug", flat=True)), ["django", "py"])
+        self.assertEqual(list(Post.objects.get(slug="imported-0").categories.all()), [self.existing])
+        self.assertEqual(
+            sorted(Post.objects.get(slug="imported-1").categories.values_list("slug", flat=True)), ["django", "py"]
+        )
+
+    def test_import_keeps_timestamps_without_changing_the_model_fields(self):
+        records = self.records(1)
+        records[0]["updated_at"] = "2021-05-06T07:08:09+00:00"
+        call_command("import_posts", self.write_jsonl(records), stdout=StringIO())
+        post = Post.objects.get(slug="imported-0")
+        self.assertEqual((post.created_at.year, post.updated_at.year), (2020, 2021))
+        self.assertTrue(Post._meta.get_field("created_at").auto_now_add)
+        self.assertTrue(Post._meta.get_field("updated_at").auto_now)
+        post.save()
+        self.assertEqual(post.updated_at.year, Post.objects.get(pk=post.pk).updated_at.year)
+        self.assertGreater(post.updated_at.year, 2021)
+
+    def test_import_indexes_posts_in_batches(self):
+        backend = type(search.get_backend())
+        with mock.patch.object(related, "IN_BATCH_SIZE", 2), mock.patch.object(
+            backend, "index_posts", autospec=True, side_effect=backend.index_posts
+        ) as index_posts:
+            call_command("import_posts", self.write_jsonl(self.records(5)), stdout=StringIO())
+        self.assertEqual([len(call.args[1]) for call in index_posts.call_args_list], [2, 2, 1])
+        self.assertEqual(search.search_posts("number").count(), 5)
+
+    def test_import_changes_list_validators_and_feeds(self):
+        """
+        Imported posts keep their (older) timestamps, so MAX(updated_at) alone
+        would not change; the lists-changed stamp and feed generation must.
+        """
+        post_cache.get_cache().clear()
+        Post.objects.create(title="Newest", slug="newest", content="x", author=self.user)
+        list_url, feed_url = reverse("posts:post-list"), reverse("posts:feed-rss")
+        etag = self.client.get(list_url)["ETag"]
+        self.assertNotContains(self.client.get(feed_url), "Imported 0")
+
+        call_command("import_posts", self.write_jsonl(self.records(3)), stdout=StringIO())
+        self.assertEqual(self.client.get(list_url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+        self.assertContains(self.client.get(feed_url), "Imported 0")
+
+    def test_import_updates_related_lists_of_imported_and_existing_posts(self):
+        existing = Post.objects.create(title="Existing", slug="existing", content="x", author=self.user)
+        existing.categories.add(self.existing)
+        call_command("import_posts", self.write_jsonl(self.records(3)), "--chunk-size", "2", stdout=StringIO())
+        incremental = sorted(RelatedPost.objects.values_list("post_id", "related_id", "rank"))
+        self.assertTrue(RelatedPost.objects.filter(post=existing).exists())
+        related.rebuild_all()
+        self.assertEqual(incremental, sorted(RelatedPost.objects.values_list("post_id", "related_id", "rank")))
+
+    def test_import_can_skip_related_lists(self):
+        call_command("import_posts", self.write_jsonl(self.records(3)), "--skip-related", stdout=StringIO())
+        self.assertFalse(RelatedPost.objects.exists())
+
+    def test_csv_round_trip(self):
+        call_command("import_posts", self.write_jsonl(self.records(5)), stdout=StringIO())
+        csv_path = os.path.join(self.tmpdir, "dump.csv")
+        call_command("export_posts", csv_path, "--chunk-size", "2", stdout=StringIO())
+
+        Post.objects.all().delete()
+        call_command("import_posts", csv_path, stdout=StringIO())
+        self.assertEqual(Post.objects.count(), 5)
+        post = Post.objects.get(slug="imported-1")
+        self.assertEqual(post.content, "Body number 1")
+        self.assertEqual(sorted(post.categories.values_list("slug", flat=True)), ["django", "legacy"])
+        self.assertEqual(post.created_at.isoformat(), "2020-01-02T10:00:00+00:00")
+
+    def test_export_jsonl_to_stdout(self):
+        call_command("import_posts", self.write_jsonl(self.records(3)), stdout=StringIO())
+        out = StringIO()
+        call_command("export_posts", "-", stdout=out)
+        lines = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual(len(lines), 3)
+        self.assertEqual(lines[0]["author"], "writer")
+        self.assertIn({"slug": "legacy", "name": "Legacy"}, lines[0]["categories"])
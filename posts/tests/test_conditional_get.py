@@ -0,0 +1,170 @@
+# posts/tests/test_conditional_get.py
+# Tests for ETag / Last-Modified handling on the post list, detail and category views.
+
+import time
+
+from django.test import TestCase
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from posts.models import ArchiveMonth, Post, Category, Tag
+from posts import cache as post_cache
+
+
+class ConditionalGetTests(TestCase):
+    def setUp(self):
+        post_cache.get_cache().clear()
+        User = get_user_model()
+        self.user = User.objects.create_user(username="etagger", password="testpass")
+        self.category = Category.objects.create(name="Django", slug="django")
+        self.post = Post.objects.create(
+            title="Conditional", slug="conditional", content="Body", author=self.user
+        )
+        self.post.categories.add(self.category)
+        self.urls = [
+            reverse("posts:post-list"),
+            reverse("posts:post-detail", kwargs={"slug": "conditional"}),
+            reverse("posts:category-detail", kwargs={"slug": "django"}),
+        ]
+
+    def test_responses_carry_validators(self):
+        for url in self.urls:
+            resp = self.client.get(url)
+            self.assertEqual(resp.status_code, 200)
+            self.assertTrue(resp.has_header("ETag"), url)
+            self.assertTrue(resp.has_header("Last-Modified"), url)
+
+    def test_matching_etag_returns_304_without_rendering(self):
+        """
+        Lists cost one MAX() query; a cached detail page costs none.
+        """
+        for url, queries in zip(self.urls, [1, 0, 1]):
+            etag = self.client.get(url)["ETag"]
+            with self.assertNumQueries(queries):
+                resp = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(resp.status_code, 304, url)
+            self.assertEqual(resp.content, b"")
+            self.assertEqual(resp.templates, [])
+
+    def test_if_modified_since_returns_304(self):
+        for url in self.urls:
+            last_modified = self.client.get(url)["Last-Modified"]
+            resp = self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+            self.assertEqual(resp.status_code, 304, url)
+
+    def test_editing_post_changes_etags(self):
+        before = [self.client.get(url)["ETag"] for url in self.urls]
+        self.post.content = "Edited"
+        self.post.save()
+        for url, etag in zip(self.urls, before):
+            self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200, url)
+
+    def test_deleting_older_post_changes_list_etag(self):
+        older = Post.objects.create(title="Older", slug="older", content="x", author=self.user)
+        Post.objects.filter(pk=older.pk).update(updated_at=self.post.updated_at.replace(year=2000))
+        url = reverse("posts:post-list")
+        etag = self.client.get(url)["ETag"]
+        older.delete()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_removing_post_from_category_changes_category_etag(self):
+        newer = Post.objects.create(title="Newer", slug="newer", content="x", author=self.user)
+        newer.categories.add(self.category)
+        url = reverse("posts:category-detail", kwargs={"slug": "django"})
+        etag = self.client.get(url)["ETag"]
+        self.category.posts.remove(self.post)
+        resp = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, 200)
+        self.assertNotContains(resp, "Conditional")
+
+    def test_category_change_changes_detail_etag(self):
+        url = reverse("posts:post-detail", kwargs={"slug": "conditional"})
+        etag = self.client.get(url)["ETag"]
+        self.post.categories.add(Category.objects.create(name="Python", slug="python"))
+        resp = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, 200)
+        self.assertContains(resp, "Python")
+
+    def test_relabelling_keeps_updated_at_but_changes_validators(self):
+        """
+        Label and related-list changes move a per-post stamp, not updated_at.
+        """
+        other = Post.objects.create(title="Other", slug="other", content="x", author=self.user)
+        detail = reverse("posts:post-detail", kwargs={"slug": "conditional"})
+        python = reverse("posts:category-detail", kwargs={"slug": "python"})
+        python_category = Category.objects.create(name="Python", slug="python")
+        other.categories.add(python_category)
+        stamps = dict(Post.objects.values_list("pk", "updated_at"))
+        before = self.client.get(detail)
+        listing = self.client.get(python)["ETag"]
+        time.sleep(1)                                  # Last-Modified has one-second resolution
+
+        self.post.categories.add(python_category)       # also enters other's related list
+        python_category.name = "Python 3"
+        python_category.save()
+
+        self.assertEqual(dict(Post.objects.values_list("pk", "updated_at")), stamps)
+        self.assertEqual(self.client.get(detail, HTTP_IF_NONE_MATCH=before["ETag"]).status_code, 200)
+        self.assertEqual(self.client.get(detail, HTTP_IF_MODIFIED_SINCE=before["Last-Modified"]).status_code, 200)
+        self.assertEqual(self.client.get(python, HTTP_IF_NONE_MATCH=listing).status_code, 200)
+        other_detail = reverse("posts:post-detail", kwargs={"slug": "other"})
+        self.assertContains(self.client.get(other_detail), 'href="/conditional/"')
+
+    def test_missing_post_still_404s(self):
+        resp = self.client.get(reverse("posts:post-detail", kwargs={"slug": "missing"}))
+        self.assertEqual(resp.status_code, 404)
+
+
+class SidebarValidatorTests(TestCase):
+    """
+    Every page renders the tag cloud and archive months from base.html, so a tag change must
+    change every page's validators even when the page's own posts did not.
+    """
+
+    def setUp(self):
+        post_cache.get_cache().clear()
+        User = get_user_model()
+        self.user = User.objects.create_user(username="sidebar", password="testpass")
+        self.category = Category.objects.create(name="Django", slug="django")
+        self.tag = Tag.objects.create(name="Orm", slug="orm")
+        self.post = Post.objects.create(
+            title="Sidebar", slug="sidebar", content="Body", author=self.user
+        )
+        self.post.categories.add(self.category)
+        self.post.tags.add(self.tag)
+        created = self.post.created_at
+        self.urls = [
+            reverse("posts:post-list"),
+            reverse("posts:post-detail", kwargs={"slug": "sidebar"}),
+            reverse("posts:category-detail", kwargs={"slug": "django"}),
+            reverse("posts:tag-detail", kwargs={"slug": "orm"}),
+            reverse("posts:author-detail", kwargs={"username": "sidebar"}),
+            reverse("posts:archive-month", kwargs={"year": created.year, "month": created.month}),
+        ]
+
+    def assertValidatorsChange(self, change, text):
+        before = [self.client.get(url) for url in self.urls]
+        change()
+        for url, resp in zip(self.urls, before):
+            etag = self.client.get(url, HTTP_IF_NONE_MATCH=resp["ETag"])
+            self.assertEqual(etag.status_code, 200, url)
+            self.assertContains(etag, text)
+            since = self.client.get(url, HTTP_IF_MODIFIED_SINCE=resp["Last-Modified"])
+            self.assertEqual(since.status_code, 200, url)
+
+    def test_tag_cloud_change_changes_every_validator(self):
+        def rename():
+            # A bulk change (as counters.rebuild() makes) touches no post rows
+            time.sleep(1)                          # Last-Modified has one-second resolution
+            Tag.objects.filter(pk=self.tag.pk).update(name="Queries")
+            post_cache.invalidate_tag_cloud()
+
+        self.assertValidatorsChange(rename, "Queries")
+
+    def test_archive_months_change_changes_every_validator(self):
+        def count_elsewhere():
+            # A month histogram rebuild touches no post rows either
+            time.sleep(1)
+            ArchiveMonth.objects.create(year=1999, month=12, post_count=3)
+            post_cache.invalidate_archive_months()
+
+        self.assertValidatorsChange(count_elsewhere, "1999")
@@ -0,0 +1,89 @@
+# posts/tests/test_detail_cache.py
+# Tests for the PostDetailView fragment cache and its signal-driven invalidation.
+
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from posts.models import Post, Category, Tag
+from posts import cache as post_cache
+
+
+class DetailFragmentCacheTests(TestCase):
+    def setUp(self):
+        """
+        Start every test with an empty cache (TestCase rollbacks do not fire delete signals).
+        """
+        post_cache.get_cache().clear()
+        User = get_user_model()
+        self.user = User.objects.create_user(username="cacher", password="testpass")
+        self.category = Category.objects.create(name="Django", slug="django")
+        self.post = Post.objects.create(
+            title="Cached Post", slug="cached-post", content="First body", author=self.user
+        )
+        self.post.categories.add(self.category)
+        self.url = reverse("posts:post-detail", kwargs={"slug": self.post.slug})
+
+    def test_hot_post_is_served_without_queries(self):
+        self.client.get(self.url)                     # miss: renders and stores
+        with self.assertNumQueries(0):
+            resp = self.client.get(self.url)          # hit: no posts tables touched
+        self.assertContains(resp, "First body")
+        self.assertContains(resp, "Django")
+        self.assertEqual(resp.context["post"].slug, "cached-post")
+
+    def test_saving_post_evicts_fragments(self):
+        self.client.get(self.url)
+        self.post.content = "Second body"
+        self.post.save()
+        resp = self.client.get(self.url)
+        self.assertContains(resp, "Second body")
+        self.assertNotContains(resp, "First body")
+
+    def test_changing_slug_evicts_old_url(self):
+        self.client.get(self.url)
+        self.post.slug = "renamed-post"
+        self.post.save()
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+
+    def test_deleting_post_evicts_fragments(self):
+        self.client.get(self.url)
+        self.post.delete()
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+
+    def test_category_changes_evict_fragments(self):
+        self.client.get(self.url)
+        python = Category.objects.create(name="Python", slug="python")
+        self.post.categories.add(python)
+        self.assertContains(self.client.get(self.url), "Python")
+
+        python.posts.remove(self.post)                # reverse side of the relation
+        self.assertNotContains(self.client.get(self.url), "Python")
+
+        self.category.name = "Django ORM"
+        self.category.save()
+        self.assertContains(self.client.get(self.url), "Django ORM")
+
+        self.category.posts.clear()
+        self.assertNotContains(self.client.get(self.url), "Django ORM")
+
+    def test_tag_changes_evict_fragments(self):
+        self.client.get(self.url)
+        self.post.tags.add(Tag.objects.create(name="orm"))
+        self.assertIsNone(post_cache.get_cache().get(post_cache.detail_key(self.post.pk)))
+
+    @override_settings(
+        CACHES={
+            "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+            "shared": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},   # sessions
+            "fragments": {
+                "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+                "LOCATION": "posts-fragments",
+            },
+        },
+        POSTS_CACHE_ALIAS="fragments",
+    )
+    def test_cache_alias_is_configurable(self):
+        self.client.get(self.url)
+        self.assertIsNotNone(caches["fragments"].get(post_cache.detail_key(self.post.pk)))
+        caches["fragments"].clear()
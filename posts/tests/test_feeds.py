@@ -0,0 +1,85 @@
+# posts/tests/test_feeds.py
+# Tests for the cached RSS/Atom feeds (posts/feeds.py).
+
+from django.test import TestCase
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from posts.models import Post, Category, Tag
+from posts import cache as post_cache
+
+
+class FeedTests(TestCase):
+    def setUp(self):
+        post_cache.get_cache().clear()
+        User = get_user_model()
+        self.user = User.objects.create_user(username="feeder", password="testpass")
+        self.category = Category.objects.create(name="Django", slug="django")
+        self.tag = Tag.objects.create(name="orm", slug="orm")
+        self.post = Post.objects.create(
+            title="First entry", slug="first-entry", content="Hello feed readers", author=self.user
+        )
+        self.post.categories.add(self.category)
+        self.post.tags.add(self.tag)
+        self.other = Post.objects.create(
+            title="Unlabelled", slug="unlabelled", content="No labels here", author=self.user
+        )
+
+    def test_site_feeds(self):
+        rss = self.client.get(reverse("posts:feed-rss"))
+        self.assertEqual(rss.status_code, 200)
+        self.assertTrue(rss["Content-Type"].startswith("application/rss+xml"))
+        self.assertContains(rss, "First entry")
+        self.assertContains(rss, "Unlabelled")
+        self.assertContains(rss, "/first-entry/")
+
+        atom = self.client.get(reverse("posts:feed-atom"))
+        self.assertTrue(atom["Content-Type"].startswith("application/atom+xml"))
+        self.assertContains(atom, "<feed")
+        self.assertContains(atom, "First entry")
+
+    def test_category_and_tag_feeds(self):
+        for name in ("posts:category-feed-rss", "posts:category-feed-atom"):
+            resp = self.client.get(reverse(name, kwargs={"slug": "django"}))
+            self.assertContains(resp, "First entry")
+            self.assertNotContains(resp, "Unlabelled")
+        for name in ("posts:tag-feed-rss", "posts:tag-feed-atom"):
+            resp = self.client.get(reverse(name, kwargs={"slug": "orm"}))
+            self.assertContains(resp, "First entry")
+            self.assertNotContains(resp, "Unlabelled")
+        resp = self.client.get(reverse("posts:category-feed-rss", kwargs={"slug": "missing"}))
+        self.assertEqual(resp.status_code, 404)
+
+    def test_cached_feed_costs_no_queries(self):
+        url = reverse("posts:feed-rss")
+        first = self.client.get(url)
+        with self.assertNumQueries(0):
+            second = self.client.get(url)
+        self.assertEqual(first.content, second.content)
+        self.assertEqual(first["ETag"], second["ETag"])
+
+    def test_etag_revalidation(self):
+        url = reverse("posts:feed-atom")
+        etag = self.client.get(url)["ETag"]
+        with self.assertNumQueries(0):
+            resp = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, 304)
+
+    def test_saving_a_post_regenerates_feeds(self):
+        url = reverse("posts:feed-rss")
+        etag = self.client.get(url)["ETag"]
+        self.post.title = "Renamed entry"
+        self.post.save()
+        resp = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, 200)
+        self.assertContains(resp, "Renamed entry")
+
+    def test_deleting_or_relabelling_regenerates_feeds(self):
+        tag_url = reverse("posts:tag-feed-rss", kwargs={"slug": "orm"})
+        self.assertContains(self.client.get(tag_url), "First entry")
+        self.post.tags.remove(self.tag)
+        self.assertNotContains(self.client.get(tag_url), "First entry")
+
+        url = reverse("posts:feed-rss")
+        self.assertContains(self.client.get(url), "Unlabelled")
+        self.other.delete()
+        self.assertNotContains(self.client.get(url), "Unlabelled")
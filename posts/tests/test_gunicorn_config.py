@@ -0,0 +1,93 @@
+# posts/tests/test_gunicorn_config.py
+# Tests for the environment-driven gunicorn configuration (gunicorn.conf.py).
+
+import os
+import runpy
+from unittest import mock
+
+import environ
+from django.conf import settings
+from django.test import SimpleTestCase
+from gunicorn.config import Config
+
+from blog_project.db import database_config
+
+CONFIG_FILE = settings.BASE_DIR / "gunicorn.conf.py"
+
+
+def load_config(cpus=4, **environment):
+    """
+    Module namespace of gunicorn.conf.py under the given environment, on a
+    machine with `cpus` CPUs available.
+    """
+    clean = {
+        name: value for name, value in os.environ.items()
+        if not name.startswith("GUNICORN_") and name not in ("WEB_CONCURRENCY", "PORT")
+    }
+    with mock.patch.dict(os.environ, {**clean, **environment}, clear=True), \
+            mock.patch("os.sched_getaffinity", return_value=set(range(cpus)), create=True):
+        return runpy.run_path(str(CONFIG_FILE))
+
+
+class GunicornConfigTests(SimpleTestCase):
+    def test_gthread_defaults(self):
+        config = load_config(cpus=4)
+        self.assertEqual(config["worker_class"], "gthread")
+        self.assertEqual(config["wsgi_app"], "blog_project.wsgi:application")
+        self.assertEqual(config["workers"], 9)
+        self.assertEqual(config["threads"], 4)
+        self.assertTrue(config["preload_app"])
+        self.assertEqual((config["max_requests"], config["max_requests_jitter"]), (1000, 100))
+        self.assertEqual(config["keepalive"], 75)
+        self.assertEqual(config["bind"], "0.0.0.0:8000")
+
+    def test_uvicorn_workers_serve_the_asgi_app_one_per_cpu(self):
+        config = load_config(cpus=4, GUNICORN_WORKER_CLASS="uvicorn")
+        self.assertEqual(config["worker_class"], "uvicorn.workers.UvicornWorker")
+        self.assertEqual(config["wsgi_app"], "blog_project.asgi:application")
+        self.assertEqual(config["workers"], 4)
+
+    def test_environment_overrides(self):
+        config = load_config(
+            WEB_CONCURRENCY="3", GUNICORN_THREADS="8", GUNICORN_PRELOAD="False",
+            GUNICORN_KEEPALIVE="120", GUNICORN_MAX_REQUESTS="0", PORT="9000",
+        )
+        self.assertEqual((config["workers"], config["threads"]), (3, 8))
+        self.assertFalse(config["preload_app"])
+        self.assertEqual(config["keepalive"], 120)
+        self.assertEqual(config["max_requests"], 0)
+        self.assertEqual(config["bind"], "0.0.0.0:9000")
+
+    def test_unknown_worker_class_is_rejected(self):
+        with self.assertRaises(RuntimeError):
+            load_config(GUNICORN_WORKER_CLASS="eventlet")
+
+    def test_gunicorn_accepts_every_setting(self):
+        config, gunicorn = load_config(), Config()
+        names = [name for name in config if name in gunicorn.settings]
+        self.assertIn("max_requests_jitter", names)
+        for name in names:
+            gunicorn.set(name, config[name])            # validates the value's type
+        self.assertEqual(gunicorn.worker_class_str, "gthread")
+        self.assertTrue(callable(gunicorn.post_fork))
+
+    def test_fork_hooks_run_only_with_preload(self):
+        config = load_config()
+        server = mock.Mock()
+        for preload in (False, True):
+            server.cfg.preload_app = preload
+            with mock.patch("blog_project.db.close_before_fork") as close, \
+                    mock.patch("blog_project.db.forget_after_fork") as forget:
+                config["when_ready"](server)
+                config["post_fork"](server, mock.Mock())
+            self.assertEqual((close.called, forget.called), (preload, preload))
+
+    def test_asgi_application_disables_persistent_connections(self):
+        """
+        Uvicorn workers load blog_project.asgi, which must win over a
+        DB_CONN_MAX_AGE meant for the threaded WSGI workers.
+        """
+        with mock.patch.dict(os.environ, {"DB_CONN_MAX_AGE": "600"}):
+            runpy.run_module("blog_project.asgi")
+            config = database_config(environ.Env(), "DATABASE_URL", default="sqlite:///asgi.sqlite3")
+        self.assertEqual(config["CONN_MAX_AGE"], 0)
@@ -0,0 +1,58 @@
+# posts/tests/test_instrumentation.py
+# Tests for the sampled request instrumentation middleware (blog_project/instrumentation.py).
+
+import json
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from posts.models import Post
+from posts import cache as post_cache
+from blog_project.instrumentation import RequestMetrics
+
+
+class PerformanceMiddlewareTests(TestCase):
+    def setUp(self):
+        post_cache.get_cache().clear()
+        User = get_user_model()
+        self.user = User.objects.create_user(username="timer", password="testpass")
+        Post.objects.create(title="Timed", slug="timed", content="Body", author=self.user)
+
+    @override_settings(PERF_SAMPLE_RATE=1.0, PERF_SERVER_TIMING=True)
+    def test_sampled_request_gets_server_timing_and_log_line(self):
+        with self.assertLogs("blog.perf", level="INFO") as logs:
+            resp = self.client.get(reverse("posts:post-list"))
+        self.assertEqual(resp.status_code, 200)
+        timing = resp["Server-Timing"]
+        self.assertIn("app;dur=", timing)
+        self.assertIn("db;dur=", timing)
+        self.assertIn("tpl;dur=", timing)
+
+        record = json.loads(logs.records[0].getMessage())
+        self.assertEqual(record["url_name"], "posts:post-list")
+        self.assertEqual(record["status"], 200)
+        self.assertGreater(record["sql_count"], 0)
+        self.assertIn(f'desc="{record["sql_count"]} queries"', timing)
+        self.assertGreater(record["template_ms"], 0)
+
+    @override_settings(PERF_SAMPLE_RATE=0.0)
+    def test_unsampled_request_is_untouched(self):
+        resp = self.client.get(reverse("posts:post-list"))
+        self.assertEqual(resp.status_code, 200)
+        self.assertFalse(resp.has_header("Server-Timing"))
+
+    @override_settings(PERF_SAMPLE_RATE=1.0, PERF_SERVER_TIMING=False)
+    def test_server_timing_header_can_be_disabled(self):
+        with self.assertLogs("blog.perf", level="INFO"):
+            resp = self.client.get(reverse("posts:post-detail", kwargs={"slug": "timed"}))
+        self.assertFalse(resp.has_header("Server-Timing"))
+
+    def test_duplicate_and_repeated_query_detection(self):
+        metrics = RequestMetrics()
+        metrics.record_query("SELECT 1 WHERE id = %s", (1,), 0.5)
+        metrics.record_query("SELECT 1 WHERE id = %s", (1,), 0.5)
+        metrics.record_query("SELECT 1 WHERE id = %s", (2,), 0.5)
+        metrics.record_query("SELECT 2", (), 0.5)
+        self.assertEqual(metrics.sql_count, 4)
+        self.assertEqual(metrics.duplicate_queries, 1)
+        self.assertEqual(metrics.repeated_statements, {"SELECT 1 WHERE id = %s": 3})
@@ -0,0 +1,86 @@
+# posts/tests/test_listing_queries.py
+# Tests that list pages use a fixed number of queries (no N+1 on author/categories/tags).
+
+from unittest import mock
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from posts.models import Post, Category, Tag
+from posts.views import PostListView
+
+
+class ListingQueryCountTests(TestCase):
+    def setUp(self):
+        """
+        Create several authors, and posts spread across them with categories and tags.
+        """
+        User = get_user_model()
+        self.authors = [
+            User.objects.create_user(username=f"author{i}", password="testpass")
+            for i in range(5)
+        ]
+        self.category = Category.objects.create(name="Django", slug="django")
+        self.tag = Tag.objects.create(name="orm", slug="orm")
+        for i in range(30):
+            post = Post.objects.create(
+                title=f"Post {i}",
+                slug=f"post-{i}",
+                content="word " * 200,
+                author=self.authors[i % len(self.authors)],
+            )
+            post.categories.add(self.category)
+            post.tags.add(self.tag)
+
+    def get_list_query_count(self, page_size):
+        """
+        Render the post list with the given paginate_by and return the number of queries
+        (after a first request has built the cached sidebar, see templates/base.html).
+        """
+        with mock.patch.object(PostListView, "paginate_by", page_size):
+            self.client.get(reverse("posts:post-list"))
+            with CaptureQueriesContext(connection) as ctx:
+                resp = self.client.get(reverse("posts:post-list"))
+        self.assertEqual(resp.status_code, 200)
+        return len(ctx.captured_queries)
+
+    def test_post_list_query_count_is_independent_of_page_size(self):
+        """
+        A page of 5 posts and a page of 30 posts should cost the same number of queries.
+        """
+        small = self.get_list_query_count(5)
+        large = self.get_list_query_count(30)
+        self.assertEqual(small, large)
+
+    def test_post_list_query_count_is_fixed(self):
+        """
+        validators + count + posts (joined with author/profile) + categories prefetch
+        + tags prefetch (the first request also builds the cached sidebar).
+        """
+        self.client.get(reverse("posts:post-list"))
+        with self.assertNumQueries(5):
+            resp = self.client.get(reverse("posts:post-list"))
+        self.assertEqual(resp.status_code, 200)
+        self.assertContains(resp, "author0")
+
+    def test_category_detail_query_count_is_fixed(self):
+        """
+        validators + category lookup + count + posts + categories prefetch + tags prefetch
+        (the first request also builds the cached tag cloud, see posts/tagcloud.py).
+        """
+        url = reverse("posts:category-detail", kwargs={"slug": "django"})
+        self.client.get(url)
+        with self.assertNumQueries(6):
+            resp = self.client.get(url)
+        self.assertContains(resp, "Post 29")
+
+    def test_listing_queryset_defers_content_and_uses_excerpt(self):
+        """
+        with_listing_data() should not load the full body but still expose the excerpt.
+        """
+        post = Post.objects.with_listing_data().first()
+        self.assertIn("content", post.get_deferred_fields())
+        self.assertIn("content_html", post.get_deferred_fields())
+        self.assertTrue(post.excerpt.startswith("word"))
@@ -0,0 +1,165 @@
+# posts/tests/test_page_cache.py
+# Tests for the full-page cache (blog_project/pagecache.py) and the surrogate
+# keys the public post views tag their pages with (posts/surrogates.py).
+
+from unittest import mock
+
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+
+from blog_project import pagecache
+from posts.models import Post, Category, Tag
+from posts.views import PostListView
+
+
+@override_settings(PAGE_CACHE_ENABLED=True, PAGE_CACHE_ALIAS="shared")
+class PageCacheTests(TestCase):
+    def setUp(self):
+        caches["default"].clear()
+        caches["shared"].clear()
+        self.user = get_user_model().objects.create_user(username="paged", password="testpass")
+        self.django = Category.objects.create(name="Django", slug="django")
+        self.python = Category.objects.create(name="Python", slug="python")
+        self.orm = Tag.objects.create(name="orm", slug="orm")
+        self.post = self.make_post("cached", categories=[self.django], tags=[self.orm])
+        self.other = self.make_post("other", categories=[self.python])
+
+    def make_post(self, slug, categories=(), tags=()):
+        post = Post.objects.create(title=slug.title(), slug=slug, content="Body", author=self.user)
+        post.categories.add(*categories)
+        post.tags.add(*tags)
+        return post
+
+    def status(self, url, **extra):
+        return self.client.get(url, **extra).get(pagecache.STATUS_HEADER)
+
+    def test_anonymous_pages_are_served_from_the_cache(self):
+        url = reverse("posts:post-list")
+        resp = self.client.get(url)
+        self.assertEqual(resp[pagecache.STATUS_HEADER], "MISS")
+        self.assertEqual(resp[pagecache.SURROGATE_KEY_HEADER], "archive-months list tag-cloud")
+        with self.assertNumQueries(0):
+            cached = self.client.get(url)
+        self.assertEqual(cached[pagecache.STATUS_HEADER], "HIT")
+        self.assertEqual(cached.content, resp.content)
+        self.assertEqual(cached[pagecache.SURROGATE_KEY_HEADER], "archive-months list tag-cloud")
+
+    def test_surrogate_keys_of_each_page(self):
+        sidebar = ["archive-months", "tag-cloud"]
+        pages = {
+            reverse("posts:post-detail", kwargs={"slug": "cached"}): sidebar + [f"post:{self.post.pk}"],
+            reverse("posts:category-list"): sidebar + ["categories"],
+            reverse("posts:category-detail", kwargs={"slug": "django"}): sidebar + ["category:django"],
+            reverse("posts:tag-detail", kwargs={"slug": "orm"}): sidebar + ["tag:orm"],
+            reverse("posts:author-detail", kwargs={"username": "paged"}): sidebar + [f"author:{self.user.pk}"],
+        }
+        for url, keys in pages.items():
+            resp = self.client.get(url)
+            self.assertEqual(resp[pagecache.SURROGATE_KEY_HEADER].split(), sorted(keys), url)
+
+    def test_post_save_purges_exactly_its_pages(self):
+        detail = reverse("posts:post-detail", kwargs={"slug": "cached"})
+        other_detail = reverse("posts:post-detail", kwargs={"slug": "other"})
+        django = reverse("posts:category-detail", kwargs={"slug": "django"})
+        python = reverse("posts:category-detail", kwargs={"slug": "python"})
+        urls = [detail, other_detail, django, python, reverse("posts:post-list")]
+        for url in urls:
+            self.client.get(url)
+
+        self.post.title = "Edited"
+        self.post.save()
+        self.assertEqual(
+            {url: self.status(url) for url in urls},
+            {detail: "MISS", other_detail: "HIT", django: "MISS", python: "HIT", urls[-1]: "MISS"},
+        )
+
+    def test_label_changes_purge_the_label_pages(self):
+        django = reverse("posts:category-detail", kwargs={"slug": "django"})
+        python = reverse("posts:category-detail", kwargs={"slug": "python"})
+        categories = reverse("posts:category-list")
+        for url in (django, python, categories):
+            self.client.get(url)
+        self.other.categories.add(self.django)
+        self.assertEqual(self.status(django), "MISS")
+        self.assertEqual(self.status(python), "HIT")
+        self.assertEqual(self.status(categories), "MISS")          # post counts changed
+
+        self.other.categories.clear()
+        self.assertEqual(self.status(django), "MISS")
+        self.assertEqual(self.status(python), "MISS")
+
+    def test_renamed_label_purges_its_old_url(self):
+        url = reverse("posts:tag-detail", kwargs={"slug": "orm"})
+        self.client.get(url)
+        self.orm.slug = "database"
+        self.orm.save()
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+    def test_conditional_requests_are_answered_from_the_cache(self):
+        url = reverse("posts:post-detail", kwargs={"slug": "cached"})
+        etag = self.client.get(url)["ETag"]
+        with self.assertNumQueries(0):
+            resp = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, 304)
+
+    def test_clients_with_a_session_bypass_the_cache(self):
+        url = reverse("posts:post-list")
+        self.client.get(url)
+        self.client.force_login(self.user)
+        resp = self.client.get(url)
+        self.assertNotIn(pagecache.STATUS_HEADER, resp)
+        self.assertEqual(resp[pagecache.SURROGATE_KEY_HEADER], "archive-months list tag-cloud")
+
+    def test_untagged_and_failed_pages_are_not_stored(self):
+        for url in (reverse("posts:post-search"), reverse("posts:post-detail", kwargs={"slug": "missing"})):
+            self.client.get(url)
+            self.assertEqual(self.status(url), "MISS", url)
+
+    def test_only_opted_in_misses_read_from_the_primary(self):
+        """
+        Anonymous requests to views that never cache keep using the replica.
+        """
+        with mock.patch.object(pagecache, "pin_to_primary") as pin:
+            self.client.get(reverse("posts:post-search"), {"q": "cached"})
+            pin.assert_not_called()
+            self.client.get(reverse("posts:post-list"))
+            pin.assert_called_with()
+            pin.reset_mock()
+            self.client.get(reverse("posts:post-list"))       # a hit reads nothing
+            with self.settings(PAGE_CACHE_ENABLED=False):
+                self.client.get(reverse("posts:post-detail", kwargs={"slug": "cached"}))
+            pin.assert_not_called()
+
+    def test_purge_sends_signal_and_purge_all_retires_everything(self):
+        purged = []
+        handler = lambda sender, keys, **kwargs: purged.append(keys)
+        pagecache.surrogate_keys_purged.connect(handler)
+        self.addCleanup(pagecache.surrogate_keys_purged.disconnect, handler)
+        pagecache.purge(["tag:orm", "list", "list"])
+        self.assertEqual(purged, [["list", "tag:orm"]])
+
+        url = reverse("posts:post-detail", kwargs={"slug": "cached"})
+        self.client.get(url)
+        pagecache.purge_all()
+        self.assertEqual(self.status(url), "MISS")
+
+    def test_pages_purged_during_rendering_are_not_stored(self):
+        url = reverse("posts:post-list")
+        original = PostListView.get_queryset
+
+        def purge_while_rendering(view):
+            pagecache.purge(["list"])
+            return original(view)
+
+        with mock.patch.object(PostListView, "get_queryset", purge_while_rendering):
+            self.client.get(url)
+        self.assertEqual(self.status(url), "MISS")
+
+    async def test_async_stack(self):
+        url = reverse("posts:post-list")
+        resp = await self.async_client.get(url)
+        self.assertEqual(resp[pagecache.STATUS_HEADER], "MISS")
+        resp = await self.async_client.get(url)
+        self.assertEqual(resp[pagecache.STATUS_HEADER], "HIT")
@@ -0,0 +1,105 @@
+# posts/tests/test_pagination_cursor.py
+# Tests for keyset (cursor) pagination on the post list and category pages.
+
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from django.contrib.auth import get_user_model
+from posts.models import Post, Category
+from posts.pagination import CursorPaginator, encode_cursor, decode_cursor
+
+
+@override_settings(POSTS_PAGINATION="cursor")
+class CursorPaginationTests(TestCase):
+    def setUp(self):
+        """
+        Create 25 posts; several share the same created_at to exercise the id tie-breaker.
+        """
+        User = get_user_model()
+        self.user = User.objects.create_user(username="pager", password="testpass")
+        self.category = Category.objects.create(name="Django", slug="django")
+        for i in range(25):
+            post = Post.objects.create(
+                title=f"Post {i:02d}", slug=f"post-{i}", content="body", author=self.user
+            )
+            post.categories.add(self.category)
+        same_moment = timezone.now()
+        Post.objects.filter(slug__in=["post-8", "post-9", "post-10", "post-11"]).update(
+            created_at=same_moment
+        )
+        self.expected = list(Post.objects.order_by("-created_at", "-id"))
+
+    def walk(self, url):
+        """
+        Follow next_cursor links from the first page and return every post seen.
+        """
+        seen = []
+        resp = self.client.get(url)
+        while True:
+            self.assertEqual(resp.status_code, 200)
+            seen.extend(resp.context["posts"])
+            next_cursor = resp.context["page_obj"].next_cursor
+            if not next_cursor:
+                return seen
+            resp = self.client.get(url, {"cursor": next_cursor})
+
+    def test_walking_cursors_visits_every_post_once_in_order(self):
+        seen = self.walk(reverse("posts:post-list"))
+        self.assertEqual(seen, self.expected)
+
+    def test_category_detail_supports_cursor_pagination(self):
+        seen = self.walk(reverse("posts:category-detail", kwargs={"slug": "django"}))
+        self.assertEqual(seen, self.expected)
+
+    def test_previous_cursor_returns_previous_page(self):
+        url = reverse("posts:post-list")
+        first = self.client.get(url)
+        second = self.client.get(url, {"cursor": first.context["page_obj"].next_cursor})
+        back = self.client.get(url, {"cursor": second.context["page_obj"].previous_cursor})
+        self.assertEqual(list(back.context["posts"]), list(first.context["posts"]))
+        self.assertFalse(back.context["page_obj"].has_previous())
+
+    def test_deep_page_costs_the_same_as_first_page(self):
+        """
+        No COUNT(*) or OFFSET, and the same number of queries on page 1 and page 3.
+        """
+        url = reverse("posts:post-list")
+        with CaptureQueriesContext(connection) as first:
+            resp = self.client.get(url)
+        cursor = resp.context["page_obj"].next_cursor
+        cursor = self.client.get(url, {"cursor": cursor}).context["page_obj"].next_cursor
+        with CaptureQueriesContext(connection) as deep:
+            self.client.get(url, {"cursor": cursor})
+        self.assertEqual(len(first.captured_queries), len(deep.captured_queries))
+        for query in first.captured_queries + deep.captured_queries:
+            self.assertNotIn("COUNT(", query["sql"].upper())
+            self.assertNotIn("OFFSET", query["sql"].upper())
+
+    def test_invalid_cursor_returns_404(self):
+        resp = self.client.get(reverse("posts:post-list"), {"cursor": "not-a-cursor"})
+        self.assertEqual(resp.status_code, 404)
+
+    def test_cursor_round_trip(self):
+        post = self.expected[0]
+        created_at, pk, direction = decode_cursor(encode_cursor(post, "n"))
+        self.assertEqual((created_at, pk, direction), (post.created_at, post.pk, "n"))
+
+    def test_paginator_last_page_has_no_next(self):
+        paginator = CursorPaginator(Post.objects.all(), 10)
+        last = paginator.page(encode_cursor(self.expected[19], "n"))
+        self.assertEqual(list(last), self.expected[20:])
+        self.assertFalse(last.has_next())
+        self.assertIsNone(last.next_cursor)
+
+
+class OffsetPaginationDefaultTests(TestCase):
+    def test_post_list_uses_offset_pagination_by_default(self):
+        User = get_user_model()
+        user = User.objects.create_user(username="offset", password="testpass")
+        for i in range(12):
+            Post.objects.create(title=f"P{i}", slug=f"p-{i}", content="x", author=user)
+        resp = self.client.get(reverse("posts:post-list"))
+        self.assertFalse(resp.context["cursor_pagination"])
+        self.assertContains(resp, "Page 1 of 2")
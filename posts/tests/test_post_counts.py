@@ -0,0 +1,96 @@
+# posts/tests/test_post_counts.py
+# Tests for the denormalized Category.post_count / Tag.post_count counters.
+
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from posts.models import Post, Category, Tag
+
+
+class PostCountTests(TestCase):
+    def setUp(self):
+        User = get_user_model()
+        self.user = User.objects.create_user(username="counter", password="testpass")
+        self.django = Category.objects.create(name="Django", slug="django")
+        self.python = Category.objects.create(name="Python", slug="python")
+        self.tag = Tag.objects.create(name="orm")
+        self.posts = [
+            Post.objects.create(title=f"P{i}", slug=f"p{i}", content="x", author=self.user)
+            for i in range(3)
+        ]
+
+    def counts(self):
+        self.django.refresh_from_db()
+        self.python.refresh_from_db()
+        self.tag.refresh_from_db()
+        return self.django.post_count, self.python.post_count, self.tag.post_count
+
+    def test_forward_add_remove_clear(self):
+        post = self.posts[0]
+        post.categories.add(self.django, self.python)
+        post.tags.add(self.tag)
+        self.assertEqual(self.counts(), (1, 1, 1))
+
+        post.categories.add(self.django)               # already linked: no change
+        post.categories.remove(self.python, self.python)
+        post.categories.remove(self.python)            # no longer linked: no change
+        self.assertEqual(self.counts(), (1, 0, 1))
+
+        post.categories.clear()
+        post.tags.clear()
+        self.assertEqual(self.counts(), (0, 0, 0))
+
+    def test_reverse_add_remove_clear(self):
+        self.django.posts.add(*self.posts)
+        self.tag.posts.add(self.posts[0], self.posts[1])
+        self.assertEqual(self.counts(), (3, 0, 2))
+
+        self.django.posts.remove(self.posts[0])
+        self.assertEqual(self.counts(), (2, 0, 2))
+
+        self.django.posts.clear()
+        self.assertEqual(self.counts(), (0, 0, 2))
+
+    def test_set_keeps_counts_consistent(self):
+        post = self.posts[0]
+        post.categories.set([self.django])
+        post.categories.set([self.python])
+        self.assertEqual(self.counts(), (0, 1, 0))
+
+    def test_deleting_post_decrements_counts(self):
+        for post in self.posts:
+            post.categories.add(self.django)
+            post.tags.add(self.tag)
+        self.posts[0].delete()
+        Post.objects.filter(pk=self.posts[1].pk).delete()
+        self.assertEqual(self.counts(), (1, 0, 1))
+
+    def test_rebuild_command_recomputes_counts(self):
+        self.django.posts.add(*self.posts)
+        Category.objects.update(post_count=99)
+        Tag.objects.update(post_count=99)
+        call_command("rebuild_post_counts", stdout=StringIO())
+        self.assertEqual(self.counts(), (3, 0, 0))
+
+    def test_category_list_shows_counts_and_sorts_by_popularity(self):
+        self.python.posts.add(*self.posts)
+        self.django.posts.add(self.posts[0])
+        url = reverse("posts:category-list")
+        self.client.get(url)                           # builds the cached tag cloud
+        with self.assertNumQueries(1):
+            resp = self.client.get(url, {"sort": "popular"})
+        self.assertEqual([c.name for c in resp.context["categories"]], ["Python", "Django"])
+        self.assertContains(resp, "Python</a> (3)")
+        alphabetical = self.client.get(url)
+        self.assertEqual([c.name for c in alphabetical.context["categories"]], ["Django", "Python"])
+
+    def test_saving_stale_instance_keeps_count(self):
+        stale = Category.objects.get(pk=self.django.pk)
+        self.django.posts.add(self.posts[0])
+        stale.name = "Django ORM"
+        stale.save()
+        self.assertEqual(self.counts(), (1, 0, 0))
+        self.assertEqual(self.django.name, "Django ORM")
@@ -0,0 +1,49 @@
+# posts/tests/test_production_settings.py
+# Tests for the checks and defaults of blog_project/settings/prod.py, which is
+# executed here as a fresh module with a patched environment.
+
+import os
+import runpy
+from unittest import mock
+
+from django.core.exceptions import ImproperlyConfigured
+from django.test import SimpleTestCase
+
+PRODUCTION_ENV = {
+    "SECRET_KEY": "production-test",
+    "DATABASE_URL": "sqlite:///production-test.sqlite3",
+    "CACHE_URL": "redis://cache:6379/1",
+}
+
+
+def load_settings(**env):
+    """
+    The names defined by the production settings module under env.
+    """
+    environ = {**PRODUCTION_ENV, **env}
+    with mock.patch.dict(os.environ, {k: v for k, v in environ.items() if v is not None}):
+        for name in [k for k, v in environ.items() if v is None]:
+            os.environ.pop(name, None)
+        return runpy.run_module("blog_project.settings.prod", run_name="production_settings_test")
+
+
+class SharedCacheTests(SimpleTestCase):
+    def test_cache_url_is_the_shared_tier(self):
+        settings = load_settings()
+        self.assertEqual(settings["CACHES"]["shared"]["BACKEND"], "django.core.cache.backends.redis.RedisCache")
+        self.assertEqual(settings["CACHES"]["default"]["LOCATION"], "shared")
+
+    def test_cache_url_is_required(self):
+        with self.assertRaises(ImproperlyConfigured):
+            load_settings(CACHE_URL=None)
+
+    def test_in_process_caches_are_refused(self):
+        for url in ("locmemcache://blog-shared", "dummycache://"):
+            with self.subTest(url=url), self.assertRaisesMessage(ImproperlyConfigured, "shared by every worker"):
+                load_settings(CACHE_URL=url)
+
+
+class InstrumentationTests(SimpleTestCase):
+    def test_server_timing_is_off_unless_enabled(self):
+        self.assertIs(load_settings(PERF_SERVER_TIMING=None)["PERF_SERVER_TIMING"], False)
+        self.assertIs(load_settings(PERF_SERVER_TIMING="True")["PERF_SERVER_TIMING"], True)
@@ -0,0 +1,102 @@
+# posts/tests/test_query_budgets.py
+# Query-count and render-time budgets for every named route in posts.urls and
+# accounts.urls (harness in posts/tests/query_budget.py, budgets in
+# posts/tests/query_budgets.json).
+
+import shutil
+import tempfile
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.tokens import default_token_generator
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils.encoding import force_bytes
+from django.utils.http import urlsafe_base64_encode
+
+from benchmarks import data
+from posts import archive
+from posts.models import Post
+from posts.sitemaps import SitemapBuilder
+from posts.tests.query_budget import QueryBudgetMixin, Visit, named_routes, normalize_sql
+
+
+class RouteQueryBudgetTests(QueryBudgetMixin, TestCase):
+    budget_file = Path(__file__).with_name("query_budgets.json")
+    budget_urlconfs = ("posts.urls", "accounts.urls")
+
+    @classmethod
+    def setUpTestData(cls):
+        # Enough posts for several pages, with shared categories and tags
+        data.generate(users=6, posts=60, categories=5, tags=12)
+        cls.post = Post.objects.select_related("author").get(slug="bench-post-0")
+        cls.author = cls.post.author
+        cls.reader = Post.objects.exclude(author=cls.author).first().author
+        # Never logged in by a visit: logging in changes the user's reset tokens
+        cls.forgetful = get_user_model().objects.exclude(pk__in=[cls.author.pk, cls.reader.pk]).first()
+        cls.newest_month = archive.build_histogram()[0]
+        sitemap_root = tempfile.mkdtemp(prefix="test_budget_sitemaps_")
+        cls.addClassCleanup(shutil.rmtree, sitemap_root, ignore_errors=True)
+        cls.enterClassContext(override_settings(POSTS_SITEMAP_ROOT=sitemap_root))
+        SitemapBuilder(root=sitemap_root).build()
+
+    def visits(self):
+        post = {"slug": self.post.slug}
+        category, tag = {"slug": "category-0"}, {"slug": "tag-0"}
+        reset = {
+            "uidb64": urlsafe_base64_encode(force_bytes(self.forgetful.pk)),
+            "token": default_token_generator.make_token(self.forgetful),
+        }
+        return {
+            "posts:post-list": Visit(),
+            "posts:post-detail": Visit(kwargs=post),
+            "posts:post-search": Visit(query="q=django"),
+            "posts:category-list": Visit(),
+            "posts:category-detail": Visit(kwargs=category),
+            "posts:tag-detail": Visit(kwargs=tag),
+            "posts:author-detail": Visit(kwargs={"username": self.author.username}),
+            "posts:archive-month": Visit(
+                kwargs={"year": self.newest_month["year"], "month": self.newest_month["month"]}
+            ),
+            "posts:feed-rss": Visit(),
+            "posts:feed-atom": Visit(),
+            "posts:category-feed-rss": Visit(kwargs=category),
+            "posts:category-feed-atom": Visit(kwargs=category),
+            "posts:tag-feed-rss": Visit(kwargs=tag),
+            "posts:tag-feed-atom": Visit(kwargs=tag),
+            "posts:sitemap": Visit(kwargs={"name": "sitemap.xml"}),
+            # The create/edit forms cannot render yet (their field list names "Tags",
+            # see the failing form tests), so these budget the permission check
+            "posts:post-create": Visit(user=self.reader, status=403),
+            "posts:post-update": Visit(kwargs=post, user=self.reader, status=403),
+            "posts:post-delete": Visit(kwargs=post, user=self.author),
+            "accounts:register": Visit(),
+            "accounts:login": Visit(),
+            "accounts:logout": Visit(user=self.reader, method="post", status=302),
+            "accounts:password_reset": Visit(),
+            "accounts:password_reset_done": Visit(),
+            # A valid link redirects to the set-password form, as the token leaves the URL
+            "accounts:password_reset_confirm": Visit(kwargs=reset, status=302),
+            "accounts:password_reset_complete": Visit(),
+            "accounts:password_change": Visit(user=self.reader),
+            "accounts:password_change_done": Visit(user=self.reader),
+            "accounts:profile-update": Visit(user=self.reader),
+        }
+
+
+class QueryBudgetHelperTests(SimpleTestCase):
+    def test_normalize_sql_replaces_literals(self):
+        self.assertEqual(
+            normalize_sql('''SELECT "t1"."id" FROM "t1" WHERE "slug" = 'it''s' AND "id" IN (3, 14) LIMIT 10'''),
+            '''SELECT "t1"."id" FROM "t1" WHERE "slug" = %s AND "id" IN (...) LIMIT %s''',
+        )
+
+    def test_normalize_sql_replaces_savepoint_names(self):
+        for sql in ('SAVEPOINT "s140079468915584_x32"', 'RELEASE SAVEPOINT "s139683238140800_x7"'):
+            self.assertEqual(normalize_sql(sql), sql.split('"')[0] + '"%s"')
+        self.assertEqual(normalize_sql("ROLLBACK TO SAVEPOINT `s1_x1`"), "ROLLBACK TO SAVEPOINT `%s`")
+
+    def test_named_routes_are_namespaced(self):
+        routes = named_routes("posts.urls")
+        self.assertIn("posts:post-list", routes)
+        self.assertIn("posts:post-detail", routes)
+        self.assertIn("accounts:profile-update", named_routes("accounts.urls"))
@@ -0,0 +1,183 @@
+# posts/tests/test_related_posts.py
+# Tests for the precomputed related-posts lists (posts/related.py) and their
+# display on the post detail page.
+
+import random
+import re
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+
+from posts.models import Post, Category, Tag, RelatedPost
+from posts import cache as post_cache
+from posts import related
+
+
+def stored_lists():
+    lists = {}
+    for link in RelatedPost.objects.order_by("post_id", "rank"):
+        lists.setdefault(link.post_id, []).append((link.related_id, link.score))
+    return lists
+
+
+@override_settings(POSTS_RELATED_COUNT=2, POSTS_RELATED_WEIGHTS={"categories": 0.5, "tags": 1.0})
+class RelatedPostsTests(TestCase):
+    def setUp(self):
+        post_cache.get_cache().clear()
+        self.user = get_user_model().objects.create_user(username="relator", password="testpass")
+        self.django = Category.objects.create(name="Django", slug="django")
+        self.orm, self.cache, self.views = (
+            Tag.objects.create(name=name, slug=name) for name in ("orm", "cache", "views")
+        )
+
+    def make_post(self, slug, tags=(), categories=()):
+        post = Post.objects.create(title=slug.title(), slug=slug, content="Body", author=self.user)
+        post.tags.add(*tags)
+        post.categories.add(*categories)
+        return post
+
+    def related_slugs(self, post):
+        return [p.slug for p in related.related_posts(post)]
+
+    def test_weighted_jaccard(self):
+        weights = {"categories": 0.5, "tags": 1.0}
+        a = {("tags", 1), ("tags", 2), ("categories", 1)}
+        b = {("tags", 1), ("categories", 1)}
+        self.assertAlmostEqual(related.weighted_jaccard(a, b, weights), 1.5 / 2.5)
+        self.assertEqual(related.weighted_jaccard(a, {("tags", 3)}, weights), 0.0)
+
+    def test_lists_rank_by_similarity(self):
+        a = self.make_post("a", tags=[self.orm, self.cache])
+        b = self.make_post("b", tags=[self.orm, self.cache])
+        c = self.make_post("c", tags=[self.orm])
+        self.make_post("d", tags=[self.views])
+        self.assertEqual(self.related_slugs(a), ["b", "c"])
+        self.assertEqual(self.related_slugs(c), ["b", "a"])     # tie: newer post first
+        self.assertEqual(self.related_slugs(b), ["a", "c"])
+
+    def test_detail_page_shows_related_posts_with_one_query(self):
+        self.make_post("a", tags=[self.orm])
+        self.make_post("b", tags=[self.orm])
+        url = reverse("posts:post-detail", kwargs={"slug": "a"})
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.get(url)
+        self.assertContains(resp, 'href="/b/"')
+        related_queries = [q for q in ctx.captured_queries if "posts_relatedpost" in q["sql"]]
+        self.assertEqual(len(related_queries), 1)
+
+        with self.assertNumQueries(0):
+            self.assertContains(self.client.get(url), 'href="/b/"')   # part of the cached fragments
+
+    def test_label_changes_refresh_neighbour_pages(self):
+        a = self.make_post("a", tags=[self.orm])
+        url = reverse("posts:post-detail", kwargs={"slug": "a"})
+        self.assertNotContains(self.client.get(url), "Related posts")
+        self.make_post("b", tags=[self.orm])
+        self.assertContains(self.client.get(url), 'href="/b/"')
+
+        self.orm.posts.clear()                         # reverse clear empties both lists
+        self.assertEqual(self.related_slugs(a), [])
+        self.assertNotContains(self.client.get(url), "Related posts")
+
+    def test_renaming_a_related_post_refreshes_pages_listing_it(self):
+        self.make_post("a", tags=[self.orm])
+        b = self.make_post("b", tags=[self.orm])
+        url = reverse("posts:post-detail", kwargs={"slug": "a"})
+        self.client.get(url)
+        b.title = "Renamed"
+        b.save()
+        self.assertContains(self.client.get(url), "Renamed")
+
+    def test_deleting_a_post_refills_lists(self):
+        a = self.make_post("a", tags=[self.orm, self.cache])
+        b = self.make_post("b", tags=[self.orm, self.cache])
+        c = self.make_post("c", tags=[self.orm, self.cache])
+        self.make_post("d", tags=[self.orm])
+        self.assertEqual(self.related_slugs(a), ["c", "b"])
+        c.delete()
+        self.assertEqual(self.related_slugs(a), ["b", "d"])
+        b.delete()
+        self.assertEqual(self.related_slugs(a), ["d"])
+
+    def test_deleting_a_label_updates_lists(self):
+        a = self.make_post("a", tags=[self.cache])
+        self.make_post("b", tags=[self.cache])
+        self.cache.delete()
+        self.assertEqual(self.related_slugs(a), [])
+
+    def test_incremental_updates_match_a_full_rebuild(self):
+        rng = random.Random(7)
+        tags = [self.orm, self.cache, self.views]
+        categories = [self.django, Category.objects.create(name="Python", slug="python")]
+        posts = [self.make_post(f"p{i}") for i in range(8)]
+        for _ in range(40):
+            post = rng.choice(posts)
+            label = rng.choice(tags + categories)
+            manager = post.tags if isinstance(label, Tag) else post.categories
+            action = rng.random()
+            if action < 0.6:
+                manager.add(label)
+            elif action < 0.9:
+                manager.remove(label)
+            else:
+                manager.clear()
+        incremental = stored_lists()
+        related.rebuild_all()
+        self.assertEqual(incremental, stored_lists())
+
+    @override_settings(POSTS_RELATED_CANDIDATES=2)
+    def test_candidates_are_capped_to_the_newest_posts_of_each_label(self):
+        a = self.make_post("a", tags=[self.orm])
+        self.make_post("b", tags=[self.orm])
+        c = self.make_post("c", tags=[self.orm])
+        d = self.make_post("d", tags=[self.orm])
+        self.assertEqual(set(related.compute_scores(a.pk)), {c.pk, d.pk})
+        related.rebuild_all()
+        self.assertEqual(self.related_slugs(a), ["d", "c"])
+
+    def test_label_deletion_refreshes_posts_in_one_batch(self):
+        def queries_to_delete(count):
+            tag = Tag.objects.create(name=f"bulk{count}", slug=f"bulk{count}")
+            for i in range(count):
+                self.make_post(f"bulk{count}-{i}", tags=[tag])
+            with CaptureQueriesContext(connection) as ctx:
+                tag.delete()
+            return len(ctx.captured_queries)
+
+        self.assertEqual(queries_to_delete(3), queries_to_delete(6))
+
+    def test_id_lists_are_split_into_batches(self):
+        posts = [self.make_post(f"p{i}", tags=[self.orm, self.cache][: 1 + i % 2]) for i in range(7)]
+        with mock.patch.object(related, "IN_BATCH_SIZE", 2):
+            RelatedPost.objects.all().delete()
+            with CaptureQueriesContext(connection) as ctx:
+                related.recompute_posts([post.pk for post in posts])
+        in_lists = [m for q in ctx.captured_queries for m in re.findall(r" IN \(([^)]*)\)", q["sql"])]
+        self.assertTrue(in_lists)
+        self.assertLessEqual(max(len(ids.split(",")) for ids in in_lists), 2)
+        incremental = stored_lists()
+        related.rebuild_all()
+        self.assertEqual(incremental, stored_lists())
+
+    def test_failed_rebuild_keeps_the_stored_lists(self):
+        self.make_post("a", tags=[self.orm])
+        self.make_post("b", tags=[self.orm])
+        with mock.patch.object(related, "insert_rows", side_effect=RuntimeError("killed")):
+            with self.assertRaises(RuntimeError):
+                related.rebuild_all()
+        self.assertEqual(RelatedPost.objects.count(), 2)
+
+    def test_rebuild_command(self):
+        self.make_post("a", tags=[self.orm])
+        self.make_post("b", tags=[self.orm])
+        RelatedPost.objects.all().delete()
+        out = StringIO()
+        call_command("rebuild_related_posts", stdout=out)
+        self.assertIn("2 links", out.getvalue())
+        self.assertEqual(RelatedPost.objects.count(), 2)
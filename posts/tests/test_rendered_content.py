@@ -0,0 +1,78 @@
+# posts/tests/test_rendered_content.py
+# Tests for the pre-rendered Post fields (content_html, excerpt, word_count,
+# reading_time) produced by posts/rendering.py.
+
+from io import StringIO
+
+from django.core.management import call_command
+from django.template.defaultfilters import linebreaks_filter, truncatewords
+from django.test import TestCase
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from posts.models import Post
+from posts import cache as post_cache
+
+
+class RenderedContentTests(TestCase):
+    def setUp(self):
+        post_cache.get_cache().clear()
+        User = get_user_model()
+        self.user = User.objects.create_user(username="renderer", password="testpass")
+        self.body = "First paragraph <b>bold?</b>\n\nSecond paragraph\nwith a break. " + "word " * 400
+        self.post = Post.objects.create(title="Rendered", slug="rendered", content=self.body, author=self.user)
+
+    def test_save_stores_same_output_as_the_old_filters(self):
+        self.assertEqual(self.post.content_html, linebreaks_filter(self.body))
+        self.assertEqual(self.post.excerpt, truncatewords(self.body, 30))
+        self.assertIn("&lt;b&gt;", self.post.content_html)        # markup is escaped
+        self.assertEqual(self.post.word_count, len(self.body.split()))
+        self.assertEqual(self.post.reading_time, 3)                 # 409 words at 200 wpm
+
+    def test_update_fields_with_content_refreshes_rendered_fields(self):
+        self.post.content = "Short"
+        self.post.save(update_fields=["content"])
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.content_html, "<p>Short</p>")
+        self.assertEqual((self.post.excerpt, self.post.word_count, self.post.reading_time), ("Short", 1, 1))
+
+    def test_pages_emit_stored_strings(self):
+        Post.objects.filter(pk=self.post.pk).update(excerpt="Stored excerpt", content_html="<p>Stored html</p>")
+        self.assertContains(self.client.get(reverse("posts:post-list")), "Stored excerpt")
+        detail = self.client.get(reverse("posts:post-detail", kwargs={"slug": "rendered"}))
+        self.assertContains(detail, "<p>Stored html</p>", html=False)
+        self.assertContains(detail, "3 min read")
+
+    def test_backfill_command(self):
+        Post.objects.filter(pk=self.post.pk).update(content_html="", excerpt="", word_count=0, reading_time=0)
+        out = StringIO()
+        call_command("render_post_content", missing=True, stdout=out)
+        self.assertIn("Rendered 1 post(s)", out.getvalue())
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.content_html, linebreaks_filter(self.body))
+        self.assertEqual(self.post.reading_time, 3)
+
+        out = StringIO()
+        call_command("render_post_content", missing=True, stdout=out)
+        self.assertIn("Rendered 0 post(s)", out.getvalue())
+
+    def test_rerender_evicts_cached_pages_and_bumps_updated_at(self):
+        url = reverse("posts:post-detail", kwargs={"slug": "rendered"})
+        before = self.client.get(url)
+        stamp = self.post.updated_at
+        # A queryset update bypasses the signals, like a change in the rendering rules would
+        Post.objects.filter(pk=self.post.pk).update(content="Freshly rendered words")
+        out = StringIO()
+        call_command("render_post_content", stdout=out)
+        self.assertIn("Rendered 1 post(s), 1 changed", out.getvalue())
+        self.post.refresh_from_db()
+        self.assertGreater(self.post.updated_at, stamp)
+
+        after = self.client.get(url)
+        self.assertContains(after, "<p>Freshly rendered words</p>", html=False)
+        self.assertNotEqual(after["ETag"], before["ETag"])
+        self.assertContains(self.client.get(reverse("posts:post-list")), "Freshly rendered words")
+
+        # Nothing changed: nothing is written or evicted
+        out = StringIO()
+        call_command("render_post_content", stdout=out)
+        self.assertIn("Rendered 1 post(s), 0 changed", out.getvalue())
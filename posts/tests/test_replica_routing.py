@@ -0,0 +1,89 @@
+# posts/tests/test_replica_routing.py
+# Tests for read-replica routing (blog_project/routers.py).
+#
+# The stand-in replica is a second SQLite database registered for this test
+# class only; it is migrated but not replicated, so a row created on one
+# database is invisible on the other and shows where each read went.
+
+import shutil
+import tempfile
+from pathlib import Path
+
+from django.core.management import call_command
+from django.db import connections
+from django.test import TestCase
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from posts.models import Post
+from posts import cache as post_cache
+from blog_project.routers import PIN_COOKIE, REPLICA_ALIAS
+
+
+class ReplicaRoutingTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # Declared here rather than as a class attribute: the test runner sets
+        # up databases listed at discovery time, before this alias exists
+        cls.databases = {"default", REPLICA_ALIAS}
+        cls.replica_dir = tempfile.mkdtemp(prefix="test_replica_")
+        connections.settings[REPLICA_ALIAS] = connections.configure_settings({
+            "default": connections.settings["default"],
+            REPLICA_ALIAS: {
+                "ENGINE": "django.db.backends.sqlite3",
+                "NAME": str(Path(cls.replica_dir) / "replica.sqlite3"),
+            },
+        })[REPLICA_ALIAS]
+        call_command("migrate", database=REPLICA_ALIAS, verbosity=0)
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        connections[REPLICA_ALIAS].close()
+        del connections[REPLICA_ALIAS]
+        del connections.settings[REPLICA_ALIAS]
+        shutil.rmtree(cls.replica_dir, ignore_errors=True)
+
+    def setUp(self):
+        post_cache.get_cache().clear()
+        User = get_user_model()
+        self.user = User.objects.create_user(username="writer", password="testpass")
+        self.post = Post.objects.create(
+            title="Primary only", slug="primary-only", content="Body", author=self.user
+        )
+
+    def test_public_list_reads_from_replica(self):
+        resp = self.client.get(reverse("posts:post-list"))
+        self.assertContains(resp, "No posts yet")          # the replica has no rows
+
+        User = get_user_model()
+        # bulk_create: the profile signal would write the user's profile to the primary
+        User.objects.using(REPLICA_ALIAS).bulk_create([User(username="writer")])
+        replica_user = User.objects.using(REPLICA_ALIAS).get(username="writer")
+        Post.objects.using(REPLICA_ALIAS).create(
+            title="Replica row", slug="replica-row", content="Body", author=replica_user
+        )
+        resp = self.client.get(reverse("posts:post-list"))
+        self.assertContains(resp, "Replica row")
+        self.assertNotContains(resp, "Primary only")
+
+    def test_other_views_and_code_outside_requests_use_primary(self):
+        self.assertEqual(Post.objects.count(), 1)
+        resp = self.client.get(reverse("posts:post-search"), {"q": "primary"})
+        self.assertContains(resp, "Primary only")
+
+    def test_detail_cache_fill_reads_from_primary(self):
+        resp = self.client.get(reverse("posts:post-detail", kwargs={"slug": "primary-only"}))
+        self.assertContains(resp, "Primary only")
+
+    def test_client_is_pinned_to_primary_after_a_write(self):
+        self.client.force_login(self.user)
+        other = Post.objects.create(title="Doomed", slug="doomed", content="Body", author=self.user)
+        resp = self.client.post(reverse("posts:post-delete", kwargs={"slug": other.slug}))
+        self.assertEqual(resp.status_code, 302)
+        self.assertIn(PIN_COOKIE, resp.cookies)
+        self.assertGreater(resp.cookies[PIN_COOKIE]["max-age"], 0)
+
+        resp = self.client.get(reverse("posts:post-list"))
+        self.assertContains(resp, "Primary only")
+        self.assertNotContains(resp, "Doomed")
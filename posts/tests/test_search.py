@@ -0,0 +1,124 @@
+# posts/tests/test_search.py
+# Tests for full-text post search: /search/ view, incremental indexing and admin reuse.
+
+from importlib import import_module
+from io import StringIO
+
+from django.apps import apps
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from posts.models import Post
+from posts import search
+
+
+class PostSearchTests(TestCase):
+    def setUp(self):
+        User = get_user_model()
+        self.user = User.objects.create_user(username="searcher", password="testpass")
+        self.title_match = Post.objects.create(
+            title="Django query optimisation",
+            slug="django-queries",
+            content="Notes on select_related.",
+            author=self.user,
+        )
+        self.body_match = Post.objects.create(
+            title="Weekend notes",
+            slug="weekend-notes",
+            content="I spent the weekend reading about django internals.",
+            author=self.user,
+        )
+        self.other = Post.objects.create(
+            title="Gardening", slug="gardening", content="Tomatoes and basil.", author=self.user
+        )
+
+    def search_titles(self, q):
+        resp = self.client.get(reverse("posts:post-search"), {"q": q})
+        self.assertEqual(resp.status_code, 200)
+        return [post.title for post in resp.context["posts"]]
+
+    def test_search_ranks_title_matches_first(self):
+        titles = self.search_titles("django")
+        self.assertEqual(titles, ["Django query optimisation", "Weekend notes"])
+
+    def test_search_requires_all_terms(self):
+        self.assertEqual(self.search_titles("django internals"), ["Weekend notes"])
+
+    def test_search_stems_words(self):
+        self.assertEqual(self.search_titles("tomato"), ["Gardening"])
+
+    def test_empty_or_symbol_only_query_returns_nothing(self):
+        self.assertEqual(self.search_titles(""), [])
+        self.assertEqual(self.search_titles('"*()'), [])
+
+    def test_index_updates_incrementally_on_save_and_delete(self):
+        self.other.content = "Growing django plants"
+        self.other.save()
+        self.assertIn("Gardening", self.search_titles("django"))
+        self.other.delete()
+        self.assertNotIn("Gardening", self.search_titles("django"))
+
+    def test_author_username_is_searchable(self):
+        self.assertEqual(len(self.search_titles("searcher")), 3)
+
+    def test_rebuild_command_restores_index(self):
+        search.get_backend().remove_posts(Post.objects.values_list("pk", flat=True))
+        self.assertEqual(self.search_titles("django"), [])
+        call_command("rebuild_search_index", stdout=StringIO())
+        self.assertEqual(len(self.search_titles("django")), 2)
+
+    def test_admin_search_uses_index(self):
+        admin = get_user_model().objects.create_superuser(
+            username="admin", password="adminpass", email="a@example.com"
+        )
+        self.client.force_login(admin)
+        resp = self.client.get(reverse("admin:posts_post_changelist"), {"q": "tomato"})
+        self.assertContains(resp, "Gardening")
+        self.assertNotContains(resp, "Weekend notes")
+
+
+class RecordingSchemaEditor:
+    """
+    Just enough of a schema editor to run the index migration's RunPython
+    function: statements run on the test connection (and are recorded), with
+    the vendor reported as given.
+    """
+
+    def __init__(self, vendor):
+        self.connection = type("Connection", (), {"vendor": vendor})()
+        self.quote_name = connection.ops.quote_name
+        self.statements = []
+
+    def execute(self, sql, params=()):
+        self.statements.append((sql, params))
+        if self.connection.vendor == connection.vendor:
+            with connection.cursor() as cursor:
+                cursor.execute(sql, params)
+
+
+class SearchMigrationTests(TestCase):
+    migration = import_module("posts.migrations.0005_post_search")
+
+    def test_sqlite_backfill_indexes_existing_posts(self):
+        if connection.vendor != "sqlite":
+            self.skipTest("FTS5 backfill")
+        user = get_user_model().objects.create_user(username="backfilled", password="testpass")
+        Post.objects.create(title="Before the index", slug="before", content="Legacy words.", author=user)
+        with connection.cursor() as cursor:
+            cursor.execute(f"DROP TABLE {search.FTS_TABLE}")
+        self.migration.create_search_index(apps, RecordingSchemaEditor("sqlite"))
+        self.assertEqual([p.slug for p in search.search_posts("backfilled legacy")], ["before"])
+
+    @override_settings(POSTS_SEARCH_CONFIG="simple")
+    def test_postgres_backfill_uses_configured_language_and_user_columns(self):
+        editor = RecordingSchemaEditor("postgresql")
+        self.migration.create_search_index(apps, editor)
+        sql, params = editor.statements[-1]
+        self.assertEqual(list(params), ["simple"] * 3)
+        self.assertNotIn("english", sql)
+        User = get_user_model()
+        username = User._meta.get_field(User.USERNAME_FIELD).column
+        self.assertIn(f"u.{connection.ops.quote_name(username)}", sql)
+        self.assertIn(f"u.{connection.ops.quote_name(User._meta.pk.column)} = ", sql)
@@ -0,0 +1,116 @@
+# posts/tests/test_sitemaps.py
+# Tests for the sharded, incrementally rebuilt sitemaps (posts/sitemaps.py).
+
+import os
+import shutil
+import tempfile
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.contrib.auth import get_user_model
+from posts.models import Post, Category
+from posts.sitemaps import SitemapBuilder
+
+
+class SitemapBuilderTests(TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp(prefix="test_sitemaps_")
+        self.addCleanup(shutil.rmtree, self.root, ignore_errors=True)
+        User = get_user_model()
+        self.user = User.objects.create_user(username="mapper", password="testpass")
+        self.category = Category.objects.create(name="Django", slug="django")
+        self.posts = [
+            Post.objects.create(title=f"Post {i}", slug=f"post-{i}", content="Body", author=self.user)
+            for i in range(5)
+        ]
+        self.posts[0].categories.add(self.category)
+        # Shards follow primary-key ranges: with size 2, pk 1-2 -> shard 0, 3-4 -> shard 1, ...
+        self.builder = SitemapBuilder(root=self.root, base_url="https://blog.example.com/", shard_size=2)
+
+    def read(self, *parts):
+        with open(os.path.join(self.root, *parts), encoding="utf-8") as handle:
+            return handle.read()
+
+    def post_shard(self, post):
+        return f"posts-{(post.pk - 1) // 2}.xml"
+
+    def test_index_and_shards(self):
+        rewritten, total = self.builder.build()
+        shards = {self.post_shard(post) for post in self.posts}
+        self.assertEqual(total, len(shards) + 1)              # + categories-N
+        self.assertEqual(rewritten, total)
+
+        index = self.read("sitemap.xml")
+        for shard in shards:
+            self.assertIn(f"<loc>https://blog.example.com/sitemaps/{shard}</loc>", index)
+        for post in self.posts:
+            shard = self.read("sitemaps", self.post_shard(post))
+            self.assertIn(f"<loc>https://blog.example.com{post.get_absolute_url()}</loc>", shard)
+            self.assertLessEqual(shard.count("<url>"), 2)
+        categories = self.read("sitemaps", f"categories-{(self.category.pk - 1) // 2}.xml")
+        self.assertIn("/category/django/", categories)
+
+    def test_only_changed_shards_are_rebuilt(self):
+        _, total = self.builder.build()
+        self.assertEqual(self.builder.build(), (0, total))
+
+        edited = self.posts[3]
+        edited.title = "Edited"
+        edited.save()
+        rewritten, _ = self.builder.build()
+        self.assertEqual(rewritten, 1)
+
+    def test_deleted_posts_shrink_or_remove_shards(self):
+        self.builder.build()
+        last = self.posts[-1]
+        shard = self.post_shard(last)
+        siblings = [p for p in self.posts if self.post_shard(p) == shard and p != last]
+        last.delete()
+        rewritten, _ = self.builder.build()
+        self.assertEqual(rewritten, 1 if siblings else 0)
+        path = os.path.join(self.root, "sitemaps", shard)
+        if siblings:
+            self.assertNotIn(f"/{last.slug}/", self.read("sitemaps", shard))
+        else:
+            self.assertFalse(os.path.exists(path))
+            self.assertNotIn(shard, self.read("sitemap.xml"))
+
+    def test_renamed_empty_label_rewrites_its_shard(self):
+        empty = Category.objects.create(name="Empty", slug="empty")
+        self.builder.build()
+        empty.name, empty.slug = "Renamed", "renamed"
+        empty.save()
+        self.assertEqual(self.builder.build()[0], 1)
+        shard = self.read("sitemaps", f"categories-{(empty.pk - 1) // 2}.xml")
+        self.assertIn("/category/renamed/", shard)
+        self.assertNotIn("/category/empty/", shard)
+
+    def test_files_are_served_as_they_are_rebuilt(self):
+        with override_settings(POSTS_SITEMAP_ROOT=self.root):
+            self.assertEqual(self.client.get("/sitemap.xml").status_code, 404)
+            self.builder.build()
+            resp = self.client.get("/sitemap.xml")
+            self.assertEqual(resp.status_code, 200)
+            self.assertEqual(resp["Content-Type"], "application/xml")
+            etag = resp["ETag"]
+            self.assertEqual(self.client.get("/sitemap.xml", HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+            # A shard created by a later build is served without a restart
+            new = Post.objects.create(title="New", slug="new", content="Body", author=self.user)
+            self.builder.build()
+            shard = b"".join(self.client.get(f"/sitemaps/{self.post_shard(new)}").streaming_content)
+            self.assertIn(b"/new/", shard)
+            self.assertEqual(self.client.get("/sitemap.xml", HTTP_IF_NONE_MATCH=etag).status_code, 200)
+            self.assertEqual(self.client.get("/sitemaps/manifest.json").status_code, 404)
+
+    def test_management_command(self):
+        out = StringIO()
+        call_command("build_sitemaps", root=self.root, stdout=out)
+        self.assertIn("Rewrote", out.getvalue())
+        out = StringIO()
+        call_command("build_sitemaps", root=self.root, stdout=out)
+        self.assertIn("Rewrote 0 of", out.getvalue())
+        out = StringIO()
+        call_command("build_sitemaps", root=self.root, full=True, stdout=out)
+        self.assertNotIn("Rewrote 0 of", out.getvalue())
@@ -0,0 +1,96 @@
+# posts/tests/test_static_assets.py
+# Tests for the shared stylesheet (static/css/blog.css): pages link it instead of
+# inlining CSS, and the production storage serves it hashed, pre-compressed and
+# with immutable cache headers.
+
+import shutil
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.staticfiles import finders
+from django.core.management import call_command
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from posts.models import Post, Category
+
+PRODUCTION_STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {"BACKEND": "whitenoise.storage.CompressedManifestStaticFilesStorage"},
+}
+
+
+class StylesheetTests(TestCase):
+    def setUp(self):
+        user = get_user_model().objects.create_user(username="styled", password="testpass")
+        self.category = Category.objects.create(name="Django", slug="django")
+        post = Post.objects.create(title="Styled", slug="styled", content="Body", author=user)
+        post.categories.add(self.category)
+        self.urls = [
+            reverse("posts:post-list"),
+            reverse("posts:post-detail", kwargs={"slug": "styled"}),
+            reverse("posts:category-list"),
+            reverse("posts:category-detail", kwargs={"slug": "django"}),
+        ]
+
+    def test_stylesheet_is_a_static_file(self):
+        self.assertIsNotNone(finders.find("css/blog.css"))
+
+    def test_pages_link_the_stylesheet_instead_of_inlining_css(self):
+        for url in self.urls:
+            resp = self.client.get(url)
+            self.assertContains(resp, '<link rel="stylesheet" href="/static/css/blog.css">', count=1)
+            self.assertNotContains(resp, "<style")
+
+    def test_every_page_template_extends_base(self):
+        # Partials (_*.html), base.html itself and the password reset e-mail are not pages
+        root = Path(settings.BASE_DIR) / "templates"
+        for path in root.rglob("*.html"):
+            if path.name.startswith("_") or path.name in ("base.html", "password_reset_email.html"):
+                continue
+            with self.subTest(template=str(path.relative_to(root))):
+                self.assertIn('{% extends "base.html" %}', path.read_text())
+
+    def test_account_pages_link_the_stylesheet(self):
+        for url in (reverse("accounts:login"), reverse("accounts:register"), reverse("accounts:password_reset")):
+            resp = self.client.get(url)
+            self.assertContains(resp, '<link rel="stylesheet" href="/static/css/blog.css">', count=1)
+
+    def test_detail_head_keeps_its_meta_tags(self):
+        resp = self.client.get(reverse("posts:post-detail", kwargs={"slug": "styled"}))
+        head = resp.content.decode().split("</head>")[0]
+        self.assertIn('<link rel="canonical"', head)
+        self.assertIn('<meta property="og:title" content="Styled">', head)
+
+
+class ProductionStaticFilesTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.static_root = Path(tempfile.mkdtemp())
+        cls.addClassCleanup(shutil.rmtree, cls.static_root)
+        cls.settings = override_settings(STATIC_ROOT=cls.static_root, STORAGES=PRODUCTION_STORAGES)
+        cls.settings.enable()
+        cls.addClassCleanup(cls.settings.disable)
+        call_command("collectstatic", interactive=False, verbosity=0)
+        cls.hashed = next((cls.static_root / "css").glob("blog.*.css")).name
+
+    def test_collectstatic_writes_hashed_and_compressed_copies(self):
+        css = self.static_root / "css" / self.hashed
+        self.assertTrue(Path(f"{css}.gz").exists())
+        self.assertLess(Path(f"{css}.gz").stat().st_size, css.stat().st_size)
+
+    def test_pages_link_the_hashed_name(self):
+        resp = Client().get(reverse("posts:post-list"))
+        self.assertContains(resp, f'href="/static/css/{self.hashed}"')
+
+    def test_hashed_stylesheet_is_served_compressed_and_immutable(self):
+        # A new client loads a fresh middleware stack, so WhiteNoise indexes this STATIC_ROOT
+        resp = Client().get(f"/static/css/{self.hashed}", HTTP_ACCEPT_ENCODING="gzip")
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp["Content-Encoding"], "gzip")
+        self.assertIn("immutable", resp["Cache-Control"])
+        self.assertIn("max-age=315360000", resp["Cache-Control"])
+        resp.close()
@@ -0,0 +1,123 @@
+# posts/tests/test_tag_views.py
+# Tests for the tag detail page and the cached site-wide tag cloud (posts/tagcloud.py).
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+
+from posts.models import Post, Tag
+from posts import cache as post_cache
+from posts import tagcloud
+
+
+class TagDetailViewTests(TestCase):
+    def setUp(self):
+        post_cache.get_cache().clear()
+        self.user = get_user_model().objects.create_user(username="tagger", password="testpass")
+        self.orm = Tag.objects.create(name="orm", slug="orm")
+        self.other = Tag.objects.create(name="views", slug="views")
+        for i in range(12):
+            post = Post.objects.create(title=f"Tagged {i}", slug=f"tagged-{i}", content="Body", author=self.user)
+            post.tags.add(self.orm)
+        untagged = Post.objects.create(title="Elsewhere", slug="elsewhere", content="Body", author=self.user)
+        untagged.tags.add(self.other)
+
+    def test_tag_urls_resolve(self):
+        self.assertEqual(self.orm.get_absolute_url(), "/tag/orm/")
+        resp = self.client.get(self.orm.get_absolute_url())
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.context["tag"], self.orm)
+        self.assertContains(resp, "Posts tagged orm")
+        self.assertNotContains(resp, "Elsewhere")
+
+    def test_tag_detail_is_paginated(self):
+        url = reverse("posts:tag-detail", kwargs={"slug": "orm"})
+        resp = self.client.get(url)
+        self.assertTrue(resp.context["is_paginated"])
+        self.assertEqual(len(resp.context["posts"]), 10)
+        resp = self.client.get(url, {"page": 2})
+        self.assertEqual(len(resp.context["posts"]), 2)
+
+    def test_unknown_tag_is_404(self):
+        resp = self.client.get(reverse("posts:tag-detail", kwargs={"slug": "missing"}))
+        self.assertEqual(resp.status_code, 404)
+
+    def test_conditional_get(self):
+        url = reverse("posts:tag-detail", kwargs={"slug": "orm"})
+        resp = self.client.get(url)
+        resp = self.client.get(url, HTTP_IF_NONE_MATCH=resp["ETag"])
+        self.assertEqual(resp.status_code, 304)
+
+    def test_query_count_is_independent_of_page_size(self):
+        """
+        validators + tag lookup + count + posts + categories prefetch + tags prefetch
+        (the tag cloud is warmed first).
+        """
+        url = reverse("posts:tag-detail", kwargs={"slug": "orm"})
+        self.client.get(url)
+        with self.assertNumQueries(6):
+            self.client.get(url)
+
+    def test_feed_links_to_tag_page(self):
+        resp = self.client.get(reverse("posts:tag-feed-rss", kwargs={"slug": "orm"}))
+        self.assertContains(resp, "/tag/orm/</link>")
+
+
+@override_settings(POSTS_TAG_CLOUD_SIZE=3, POSTS_TAG_CLOUD_LEVELS=3)
+class TagCloudTests(TestCase):
+    def setUp(self):
+        post_cache.get_cache().clear()
+        self.user = get_user_model().objects.create_user(username="clouder", password="testpass")
+        self.posts = [
+            Post.objects.create(title=f"Post {i}", slug=f"post-{i}", content="Body", author=self.user)
+            for i in range(10)
+        ]
+        # usage: big 10, mid 3, small 1, rare 1 (only the top 3 make the cloud)
+        self.tags = {}
+        for name, uses in (("big", 10), ("mid", 3), ("small", 1), ("rare", 1)):
+            tag = self.tags[name] = Tag.objects.create(name=name, slug=name)
+            tag.posts.add(*self.posts[:uses])
+
+    def test_cloud_is_weighted_and_sorted_by_name(self):
+        cloud = tagcloud.get_cloud()
+        self.assertEqual(
+            [(entry["name"], entry["count"], entry["weight"]) for entry in cloud],
+            [("big", 10, 3), ("mid", 3, 2), ("rare", 1, 1)],     # "small" loses the tie on name
+        )
+
+    def test_bucket_uses_a_log_scale(self):
+        self.assertEqual(tagcloud.bucket(1, 1, 100, 3), 1)
+        self.assertEqual(tagcloud.bucket(10, 1, 100, 3), 2)
+        self.assertEqual(tagcloud.bucket(100, 1, 100, 3), 3)
+        self.assertEqual(tagcloud.bucket(7, 7, 7, 3), 1)
+
+    def test_cloud_is_one_query_then_cached(self):
+        with self.assertNumQueries(1):
+            tagcloud.get_cloud()
+        with self.assertNumQueries(0):
+            tagcloud.get_cloud()
+
+    def test_link_changes_refresh_the_cloud(self):
+        tagcloud.get_cloud()
+        self.tags["small"].posts.add(*self.posts[1:5])
+        self.assertIn("small", [entry["name"] for entry in tagcloud.get_cloud()])
+        self.tags["small"].posts.clear()
+        self.assertNotIn("small", [entry["name"] for entry in tagcloud.get_cloud()])
+
+    def test_tag_changes_refresh_the_cloud(self):
+        tagcloud.get_cloud()
+        self.tags["mid"].name = "middle"
+        self.tags["mid"].save()
+        self.assertIn("middle", [entry["name"] for entry in tagcloud.get_cloud()])
+        self.tags["big"].delete()
+        self.assertNotIn("big", [entry["name"] for entry in tagcloud.get_cloud()])
+
+    def test_deleting_a_post_refreshes_the_cloud(self):
+        tagcloud.get_cloud()
+        self.posts[0].delete()
+        counts = {entry["name"]: entry["count"] for entry in tagcloud.get_cloud()}
+        self.assertEqual(counts["big"], 9)
+
+    def test_cloud_is_rendered_on_pages_extending_base(self):
+        resp = self.client.get(reverse("posts:category-list"))
+        self.assertContains(resp, '<a class="tag-cloud-3" href="/tag/big/"', html=False)
@@ -0,0 +1,72 @@
+# posts/tests/test_template_warmup.py
+# Tests for the start-up template warm-up (blog_project/warmup.py).
+
+import shutil
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+from django.template import engines
+from django.template.loaders.filesystem import Loader as FileSystemLoader
+from django.test import SimpleTestCase, override_settings
+
+from blog_project import warmup
+
+
+def engine_settings(directory, cached=True):
+    loaders = ["django.template.loaders.filesystem.Loader"]
+    if cached:
+        loaders = [("django.template.loaders.cached.Loader", loaders)]
+    return [
+        {
+            "BACKEND": "django.template.backends.django.DjangoTemplates",
+            "DIRS": [directory],
+            "OPTIONS": {"loaders": loaders},
+        }
+    ]
+
+
+class TemplateWarmupTests(SimpleTestCase):
+    def setUp(self):
+        self.directory = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.directory)
+        (self.directory / "pages").mkdir()
+        (self.directory / "base.html").write_text("<main>{% block content %}{% endblock %}</main>")
+        (self.directory / "pages" / "home.html").write_text(
+            '{% extends "base.html" %}{% block content %}Home{% endblock %}'
+        )
+
+    def test_template_names_cover_the_project_templates(self):
+        names = warmup.template_names(engines["django"].engine)
+        self.assertIn("base.html", names)
+        self.assertIn("posts/post_list.html", names)
+        self.assertIn("registration/password_reset_subject.txt", names)
+
+    def test_warmed_templates_render_without_reading_files(self):
+        with override_settings(TEMPLATES=engine_settings(self.directory)):
+            self.assertEqual(warmup.warm_templates()[0], 2)
+            with mock.patch.object(FileSystemLoader, "get_contents") as get_contents:
+                html = engines["django"].get_template("pages/home.html").render({})
+            get_contents.assert_not_called()
+        self.assertEqual(html, "<main>Home</main>")
+
+    def test_broken_templates_are_logged_and_skipped(self):
+        (self.directory / "broken.html").write_text("{% if %}")
+        with override_settings(TEMPLATES=engine_settings(self.directory)):
+            with self.assertLogs("blog.startup", "ERROR") as logs:
+                compiled, seconds = warmup.warm_templates()
+        self.assertEqual(compiled, 2)
+        self.assertIn("broken.html", logs.output[0])
+
+    def test_engines_without_a_cached_loader_are_skipped(self):
+        with override_settings(TEMPLATES=engine_settings(self.directory, cached=False)):
+            self.assertEqual(warmup.warm_templates()[0], 0)
+
+    def test_warm_up_follows_the_setting(self):
+        with mock.patch.object(warmup, "warm_templates", return_value=(0, 0.0)) as warm:
+            with override_settings(TEMPLATE_WARMUP=False):
+                warmup.warm_up()
+            warm.assert_not_called()
+            with override_settings(TEMPLATE_WARMUP=True):
+                warmup.warm_up()
+            warm.assert_called_once_with()
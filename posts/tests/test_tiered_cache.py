@@ -0,0 +1,101 @@
+# posts/tests/test_tiered_cache.py
+# Tests for the two-tier cache backend (blog_project/cache.py) and cached_db sessions.
+
+import json
+
+from django.core.cache import caches
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+
+from blog_project.cache import LRUStore, TieredCache
+from posts.models import Post
+
+
+class TieredCacheTests(TestCase):
+    def setUp(self):
+        self.cache = TieredCache("shared", {"OPTIONS": {"L1_MAX_ENTRIES": 3, "L1_TIMEOUT": 60}})
+        self.cache.store = LRUStore(3)                 # isolated L1 for each test
+        self.shared = caches["shared"]
+        self.cache.clear()
+
+    def test_read_falls_through_and_fills_l1(self):
+        self.shared.set("k", "from-l2")
+        self.assertEqual(self.cache.get("k"), "from-l2")
+        self.assertEqual(self.cache.get("k"), "from-l2")
+        stats = self.cache.stats()
+        self.assertEqual((stats["l1_misses"], stats["l2_hits"], stats["l1_hits"]), (1, 1, 1))
+        self.assertIsNone(self.cache.get("absent"))
+        self.assertEqual(self.cache.stats()["l2_misses"], 1)
+
+    def test_writes_and_deletes_reach_both_tiers(self):
+        self.cache.set("k", {"a": 1})
+        self.assertEqual(self.shared.get("k"), {"a": 1})
+        self.cache.delete("k")
+        self.assertIsNone(self.shared.get("k"))
+        self.assertIsNone(self.cache.get("k"))
+
+        self.cache.set_many({"x": 1, "y": 2})
+        self.assertEqual(self.cache.get_many(["x", "y", "z"]), {"x": 1, "y": 2})
+        self.assertEqual(self.cache.incr("x"), 2)
+        self.assertEqual(self.cache.get("x"), 2)
+        self.assertFalse(self.cache.add("y", 5))
+        self.assertEqual(self.cache.get_or_set("z", 9), 9)
+
+    async def test_async_api_shares_both_tiers(self):
+        await self.cache.aset_many({"x": 1, "y": 2})
+        self.assertEqual(self.shared.get("x"), 1)
+        self.assertEqual(await self.cache.aget_many(["x", "y", "z"]), {"x": 1, "y": 2})
+        self.assertEqual(self.cache.stats()["l1_hits"], 2)   # served without touching L2
+        self.shared.set("k", "from-l2")
+        self.assertEqual(await self.cache.aget("k"), "from-l2")
+        self.assertEqual(self.cache.get("k"), "from-l2")
+        self.assertEqual(await self.cache.aget_or_set("n", 7), 7)
+
+    def test_l1_bounds_staleness_and_size(self):
+        self.cache.set("k", "old")
+        self.shared.set("k", "new")                    # written by "another process"
+        self.assertEqual(self.cache.get("k"), "old")   # served from L1 until it expires
+
+        for key in ("a", "b", "c"):                    # L1 holds 3 entries: "k" is evicted
+            self.cache.set(key, key)
+        self.assertEqual(self.cache.get("k"), "new")
+
+    def test_l1_can_be_disabled(self):
+        cache = TieredCache("shared", {"OPTIONS": {"L1_TIMEOUT": 0}})
+        cache.store = LRUStore(3)
+        cache.set("k", "old")
+        self.shared.set("k", "new")
+        self.assertEqual(cache.get("k"), "new")
+        self.assertEqual(len(cache.store.data), 0)
+
+    def test_cached_values_are_copies(self):
+        self.cache.set("k", {"list": [1]})
+        self.cache.get("k")["list"].append(2)
+        self.assertEqual(self.cache.get("k"), {"list": [1]})
+
+
+class CachedSessionTests(TestCase):
+    def setUp(self):
+        caches["default"].clear()
+        User = get_user_model()
+        self.user = User.objects.create_user(username="sessioner", password="testpass")
+        Post.objects.create(title="Cached", slug="cached", content="Body", author=self.user)
+
+    def test_authenticated_request_skips_session_table(self):
+        self.client.login(username="sessioner", password="testpass")
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.get(reverse("posts:post-list"))
+        self.assertEqual(resp.status_code, 200)
+        self.assertFalse([q for q in ctx.captured_queries if "django_session" in q["sql"]])
+
+    @override_settings(PERF_SAMPLE_RATE=1.0)
+    def test_request_log_reports_cache_tiers(self):
+        url = reverse("posts:post-list")
+        self.client.get(url)
+        with self.assertLogs("blog.perf", level="INFO") as logs:
+            self.client.get(url)
+        record = json.loads(logs.records[-1].getMessage())
+        self.assertGreater(record["cache"].get("l1_hits", 0), 0)
@@ -1,15 +1,43 @@
 # posts/urls.py
-from django.urls import path
-from .views import PostListView, PostDetailView, PostCreateView, PostUpdateView, PostDeleteView, CategoryListView, CategoryDetailView
+from django.conf import settings
+from django.urls import path, re_path
+from .views import PostListView, PostDetailView, PostCreateView, PostUpdateView, PostDeleteView, CategoryListView, CategoryDetailView, TagDetailView, PostSearchView, AuthorPostListView, PostMonthArchiveView
+from .sitemaps import serve_file as sitemap_file
+from .feeds import (
+    cached_feed, LatestPostsFeed, LatestPostsAtomFeed, CategoryFeed, CategoryAtomFeed, TagFeed, TagAtomFeed,
+)
+
+# Async (ASGI-native) public read views, see posts/async_views.py
+if getattr(settings, "POSTS_ASYNC_VIEWS", False):
+    from .async_views import (
+        AsyncPostListView as PostListView,
+        AsyncPostDetailView as PostDetailView,
+        AsyncCategoryListView as CategoryListView,
+        AsyncCategoryDetailView as CategoryDetailView,
+        AsyncTagDetailView as TagDetailView,
+    )
 
 app_name = "posts"
 
 urlpatterns = [
     path("", PostListView.as_view(), name="post-list"),
     path("create/", PostCreateView.as_view(), name="post-create"),
+    path("search/", PostSearchView.as_view(), name="post-search"),
+    # RSS / Atom feeds (served from the feed cache, see posts/feeds.py)
+    path("feed/rss/", cached_feed(LatestPostsFeed), name="feed-rss"),
+    path("feed/atom/", cached_feed(LatestPostsAtomFeed), name="feed-atom"),
+    path("feed/category/<slug:slug>/rss/", cached_feed(CategoryFeed), name="category-feed-rss"),
+    path("feed/category/<slug:slug>/atom/", cached_feed(CategoryAtomFeed), name="category-feed-atom"),
+    path("feed/tag/<slug:slug>/rss/", cached_feed(TagFeed), name="tag-feed-rss"),
+    path("feed/tag/<slug:slug>/atom/", cached_feed(TagAtomFeed), name="tag-feed-atom"),
+    # Sitemap index and shards, written by `manage.py build_sitemaps` (posts/sitemaps.py)
+    re_path(r"^(?P<name>sitemap\.xml|sitemaps/[a-z]+-[0-9]+\.xml)$", sitemap_file, name="sitemap"),
     # Move category URLs BEFORE the generic slug pattern
     path("categories/", CategoryListView.as_view(), name="category-list"),
     path("category/<slug:slug>/", CategoryDetailView.as_view(), name="category-detail"),
+    path("tag/<slug:slug>/", TagDetailView.as_view(), name="tag-detail"),
+    path("author/<str:username>/", AuthorPostListView.as_view(), name="author-detail"),
+    path("archive/<int:year>/<int:month>/", PostMonthArchiveView.as_view(), name="archive-month"),
     # Keep post-specific patterns
     path("<slug:slug>/edit/", PostUpdateView.as_view(), name="post-update"),
     path("<slug:slug>/delete/", PostDeleteView.as_view(), name="post-delete"),
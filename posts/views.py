@@ -4,31 +4,134 @@
 from django.views.generic import ListView, DetailView, CreateView, UpdateView, DeleteView
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
 from django.urls import reverse_lazy
-from django.http import HttpResponseForbidden
+from django.http import Http404, HttpResponseForbidden
+from django.contrib.auth import get_user_model
 from django.contrib.auth.views import redirect_to_login
-from .models import Post, Category
+from .models import Post, Category, Tag
+from .pagination import KeysetPaginationMixin
+from . import cache as post_cache
+from . import search
+from . import archive
+from . import surrogates
+from .surrogates import SurrogateKeysMixin
 from django.shortcuts import get_object_or_404
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
+from . import conditional
+from blog_project.routers import primary_reads
 
 
-class PostListView(ListView):
+@method_decorator(
+    condition(etag_func=conditional.post_list_etag, last_modified_func=conditional.post_list_last_modified),
+    name="dispatch",
+)
+class PostListView(SurrogateKeysMixin, KeysetPaginationMixin, ListView):
     """
     Displays a paginated list of Post objects (newest first via model Meta.ordering).
+    Uses offset pagination (?page=) by default, or keyset pagination (?cursor=)
+    when settings.POSTS_PAGINATION = "cursor".
     """
     model = Post                                   # model to query
     template_name = "posts/post_list.html"         # template to render
     context_object_name = "posts"                  # context variable for template
     paginate_by = 10                               # pagination size
+    use_replica = True                             # GET reads may use the read replica (blog_project/routers.py)
 
+    def get_queryset(self):
+        """
+        Load authors, categories and tags up front so the page costs a fixed
+        number of queries regardless of paginate_by.
+        """
+        return Post.objects.with_listing_data()
+
+    def paginate_queryset(self, queryset, page_size):
+        """
+        Delegate to the cursor paginator when keyset pagination is enabled.
+        """
+        if self.use_cursor_pagination():
+            return self.paginate_by_cursor(queryset, page_size)
+        return super().paginate_queryset(queryset, page_size)
+
+    def get_surrogate_keys(self):
+        return [surrogates.LIST]
 
-class PostDetailView(DetailView):
+
+@method_decorator(
+    condition(etag_func=conditional.post_detail_etag, last_modified_func=conditional.post_detail_last_modified),
+    name="dispatch",
+)
+class PostDetailView(SurrogateKeysMixin, DetailView):
     """
     Displays a single Post identified by its slug.
+    The article body and category block are served from the fragment cache
+    (posts/cache.py) when present, so a hot post needs no database queries.
     """
     model = Post                                   # model to query
     template_name = "posts/post_detail.html"       # template to render
     context_object_name = "post"                   # name used in template context
     slug_field = "slug"                            # model field used for lookup
     slug_url_kwarg = "slug"                        # URL kwarg providing the slug
+    use_replica = True                             # GET reads may use the read replica (blog_project/routers.py)
+
+    def get(self, request, *args, **kwargs):
+        """
+        Serve from the fragment cache if possible; fall back to the normal
+        DetailView flow (which renders and stores the fragments) on a miss.
+        A miss reads from the primary: the fragments are cached until the post
+        changes, so they must not be built from a lagging replica.
+        """
+        cached = post_cache.load_detail(self.kwargs.get(self.slug_url_kwarg))
+        if cached is None:
+            with primary_reads():
+                return super().get(request, *args, **kwargs)
+        self.object, fragments = cached
+        return self.render_to_response(
+            {"view": self, "post": self.object, "object": self.object, "fragments": fragments}
+        )
+
+    def get_queryset(self):
+        """
+        Author and categories are needed to render the fragments; the raw body
+        is not (the article fragment uses the stored content_html).
+        """
+        return (
+            Post.objects.select_related("author")
+            .prefetch_related("categories")
+            .defer("content", "search_vector")
+        )
+
+    def get_surrogate_keys(self):
+        return [surrogates.post(self.object.pk)]
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["fragments"] = post_cache.store_detail(self.object)
+        return context
+
+
+class PostSearchView(ListView):
+    """
+    Ranked full-text search over posts: /search/?q=<terms>.
+    An empty query renders the form with no results.
+    """
+    model = Post
+    template_name = "posts/search.html"
+    context_object_name = "posts"
+    paginate_by = 10
+
+    def get_query(self):
+        return self.request.GET.get("q", "").strip()
+
+    def get_queryset(self):
+        query = self.get_query()
+        if not query:
+            return Post.objects.none()
+        return search.search_posts(query, Post.objects.with_listing_data())
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["query"] = self.get_query()
+        return context
 
 
 class PostCreateView(LoginRequiredMixin, UserPassesTestMixin, CreateView):
@@ -173,17 +276,164 @@ class PostDeleteView(LoginRequiredMixin, UserPassesTestMixin, DeleteView):
             # Authenticated but not the author - return 403
             return HttpResponseForbidden()
         
-class CategoryListView(ListView):
+class CategoryListView(SurrogateKeysMixin, ListView):
+    """
+    Lists categories with their post counts.
+    ?sort=popular orders by the denormalized post_count (no joins); the default
+    is alphabetical.
+    """
     model = Category
     template_name = 'posts/category_list.html'
     context_object_name = 'categories'
+    use_replica = True
+
+    def get_sort(self):
+        return "popular" if self.request.GET.get("sort") == "popular" else "name"
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.get_sort() == "popular":
+            queryset = queryset.order_by("-post_count", "name")
+        return queryset
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["sort"] = self.get_sort()
+        return context
+
+    def get_surrogate_keys(self):
+        return [surrogates.CATEGORIES]
 
-class CategoryDetailView(DetailView):
+@method_decorator(
+    condition(etag_func=conditional.category_etag, last_modified_func=conditional.category_last_modified),
+    name="dispatch",
+)
+class CategoryDetailView(SurrogateKeysMixin, KeysetPaginationMixin, DetailView):
     model = Category
     template_name = 'posts/category_detail.html'
     context_object_name = 'category'
+    paginate_by = 10
+    use_replica = True
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['posts'] = Post.objects.filter(categories=self.object)
-        return context
\ No newline at end of file
+        # Prefetch-aware queryset keeps the query count flat as the category grows
+        posts = Post.objects.with_listing_data().filter(categories=self.object)
+        paginator, page, object_list, is_paginated = self.paginate_posts(posts, self.paginate_by)
+        context.update({
+            'posts': object_list,
+            'paginator': paginator,
+            'page_obj': page,
+            'is_paginated': is_paginated,
+        })
+        return context
+
+    def get_surrogate_keys(self):
+        return [surrogates.category(self.object.slug)]
+
+
+@method_decorator(
+    condition(etag_func=conditional.tag_etag, last_modified_func=conditional.tag_last_modified),
+    name="dispatch",
+)
+class TagDetailView(SurrogateKeysMixin, KeysetPaginationMixin, DetailView):
+    """
+    Paginated list of the posts carrying one tag (the target of Tag.get_absolute_url()).
+    """
+    model = Tag
+    template_name = 'posts/tag_detail.html'
+    context_object_name = 'tag'
+    paginate_by = 10
+    use_replica = True
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        # Same prefetch-aware listing queryset as CategoryDetailView
+        posts = Post.objects.with_listing_data().filter(tags=self.object)
+        paginator, page, object_list, is_paginated = self.paginate_posts(posts, self.paginate_by)
+        context.update({
+            'posts': object_list,
+            'paginator': paginator,
+            'page_obj': page,
+            'is_paginated': is_paginated,
+        })
+        return context
+
+    def get_surrogate_keys(self):
+        return [surrogates.tag(self.object.slug)]
+
+
+@method_decorator(
+    condition(etag_func=conditional.author_etag, last_modified_func=conditional.author_last_modified),
+    name="dispatch",
+)
+class AuthorPostListView(SurrogateKeysMixin, KeysetPaginationMixin, ListView):
+    """
+    One author's posts, newest first: /author/<username>/.
+    Served by the (author, -created_at, -id) index on Post, so a page is an
+    index range scan whichever pagination mode is configured.
+    """
+    template_name = "posts/author_detail.html"
+    context_object_name = "posts"
+    paginate_by = 10
+    use_replica = True
+
+    def get_queryset(self):
+        self.author = get_object_or_404(get_user_model(), username=self.kwargs["username"])
+        return Post.objects.with_listing_data().filter(author=self.author)
+
+    def paginate_queryset(self, queryset, page_size):
+        if self.use_cursor_pagination():
+            return self.paginate_by_cursor(queryset, page_size)
+        return super().paginate_queryset(queryset, page_size)
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["author"] = self.author
+        return context
+
+    def get_surrogate_keys(self):
+        return [surrogates.author(self.author.pk)]
+
+
+@method_decorator(
+    condition(etag_func=conditional.month_etag, last_modified_func=conditional.month_last_modified),
+    name="dispatch",
+)
+class PostMonthArchiveView(SurrogateKeysMixin, KeysetPaginationMixin, ListView):
+    """
+    Posts created in one calendar month: /archive/<year>/<month>/.
+    The month's post count and its older/newer neighbours come from the
+    cached histogram (posts/archive.py), so besides the page of posts the
+    view runs no query on the posts table, not even COUNT(*).
+    """
+    template_name = "posts/archive_month.html"
+    context_object_name = "posts"
+    paginate_by = 10
+    use_replica = True
+
+    def get_queryset(self):
+        year, month = self.kwargs["year"], self.kwargs["month"]
+        self.month, self.older, self.newer = archive.locate(archive.get_histogram(), year, month)
+        if self.month is None:
+            raise Http404("No posts in this month.")
+        start, end = archive.month_bounds(year, month)
+        return Post.objects.with_listing_data().filter(created_at__gte=start, created_at__lt=end)
+
+    def get_paginator(self, queryset, per_page, **kwargs):
+        paginator = super().get_paginator(queryset, per_page, **kwargs)
+        paginator.count = self.month["count"]          # cached_property: skip COUNT(*)
+        return paginator
+
+    def paginate_queryset(self, queryset, page_size):
+        if self.use_cursor_pagination():
+            return self.paginate_by_cursor(queryset, page_size)
+        return super().paginate_queryset(queryset, page_size)
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context.update({"month": self.month, "older_month": self.older, "newer_month": self.newer})
+        return context
+
+    def get_surrogate_keys(self):
+        return [surrogates.month(self.month["year"], self.month["month"])]